@@ -0,0 +1,67 @@
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+import metrics.changepoint_classifier
+from cases.case import Case
+from cost_functions.cost_function import CostFunction, KernelBasedCostFunction, ApproximateKernelCostFunction
+from cost_functions.kernels import LaplaceKernel, GaussianKernel
+from runner.run_utils import read_case
+from solution.algorithm_input import AlgorithmInput
+from solution.suboptimal_partition_changepoints_in_state_divide_and_conquer_optimzation import DynamicProgrammingDivideAndConquer
+from utils.constants import Constants
+
+# Generated cases are only compared up to this size, since the exact cost needs O(n^2) memory.
+report_max_size: int = 3000
+# Ranks of the approximations to be compared.
+ranks: List[int] = [16, 64, 256]
+# Amount of random ranges used to measure the error of the approximated costs.
+sampled_ranges: int = 2000
+
+
+def solve_with(case: Case, cost_function: CostFunction, amount_changepoints: int) -> Tuple[List[int], float]:
+    """
+    Pre-computes the cost function and segments the case with the given amount of changepoints.
+    :param case: case to solve.
+    :param cost_function: cost function to be used.
+    :param amount_changepoints: amount of changepoints of the segmentation.
+    :return: the changepoints found and the pre-computation time.
+    """
+    algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, max_amount_changepoints=amount_changepoints)
+    start_time = time.perf_counter()
+    algorithm_input.initialize()
+    precompute_time = time.perf_counter() - start_time
+    return DynamicProgrammingDivideAndConquer(algorithm_input=algorithm_input).solve().changepoints, precompute_time
+
+
+def main() -> None:
+    rng = np.random.RandomState(Constants.seed)
+    print('case'.ljust(16), 'kernel'.ljust(16), 'method'.ljust(8), 'rank'.rjust(5), 'exact (s)'.rjust(10), 'approx (s)'.rjust(11),
+          'cost error'.rjust(11), 'matched'.rjust(8))
+    for case_number in range(Constants.cases_per_type):
+        for case_type in ['mean', 'variance', 'exponential', 'dependant']:
+            case = read_case(str(case_number).zfill(2) + '_' + case_type)
+            if case.size > report_max_size:
+                continue
+            with open(Constants.random_path + 'solutions/' + case.name + '.out', 'r') as real_changepoints_file:
+                amount_changepoints = len(real_changepoints_file.readline().split(','))
+            starts = rng.randint(0, case.size, sampled_ranges)
+            ends = np.minimum(starts + rng.randint(1, case.size, sampled_ranges), case.size)
+            for kernel in [LaplaceKernel(), GaussianKernel()]:
+                exact_cost_function = KernelBasedCostFunction(kernel=kernel)
+                exact_changepoints, exact_time = solve_with(case, exact_cost_function, amount_changepoints)
+                exact_costs = exact_cost_function.range_costs(starts, ends)
+                for method in ['fourier', 'nystrom']:
+                    for rank in ranks:
+                        cost_function = ApproximateKernelCostFunction(kernel=kernel, method=method, rank=rank)
+                        changepoints, approximate_time = solve_with(case, cost_function, amount_changepoints)
+                        cost_error = np.mean(np.abs(cost_function.range_costs(starts, ends) - exact_costs)) / np.mean(np.abs(exact_costs))
+                        _, matched_changepoints = metrics.changepoint_classifier.real_changepoints(changepoints, exact_changepoints)
+                        print(case.name.ljust(16), kernel.name.ljust(16), method.ljust(8), str(rank).rjust(5), f'{exact_time:.3f}'.rjust(10),
+                              f'{approximate_time:.3f}'.rjust(11), f'{cost_error:.2e}'.rjust(11),
+                              f'{len(matched_changepoints)}/{amount_changepoints}'.rjust(8))
+
+
+if __name__ == '__main__':
+    main()
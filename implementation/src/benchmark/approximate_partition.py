@@ -0,0 +1,53 @@
+import math
+from typing import List
+
+import numpy as np
+
+from cases.case import Case
+from cases.generator import gen_real_signal
+from cost_functions.cost_function import CostFunction, GaussianCostFunction, GaussianMeanCostFunction
+from runner.run_utils import read_case
+from solution.algorithm_input import AlgorithmInput
+from solution.optimal_partition_penalization import DynamicProgrammingPenalization
+from solution.optimal_partition_penalization_approximate import DynamicProgrammingPenalizationApproximate
+from utils.constants import Constants
+
+# Approximation factors to be compared.
+approximations: List[float] = [0.01, 0.05]
+# Prefix of the cardio heart rate signal to be segmented.
+real_size: int = 20000
+
+
+def compare(case: Case, cost_function: CostFunction) -> None:
+    """
+    Solves the case exactly and with every approximation factor, printing the speedup and the relative cost gap.
+    :param case: case to solve.
+    :param cost_function: cost function to be used.
+    :return: None.
+    """
+    penalization = 2.0 * math.log(case.size) * (float(np.var(case.signal)) if isinstance(cost_function, GaussianMeanCostFunction) else 1.0)
+    algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, penalization=penalization)
+    algorithm_input.initialize()
+    exact = DynamicProgrammingPenalization(algorithm_input=algorithm_input).solve()
+    for approximation in approximations:
+        approximate = DynamicProgrammingPenalizationApproximate(algorithm_input=algorithm_input, approximation=approximation).solve()
+        gap = (approximate.metrics.cost - exact.metrics.cost) / abs(exact.metrics.cost)
+        print(case.name.ljust(18), cost_function.name.ljust(16), f'{approximation:.2f}'.rjust(7), f'{exact.metrics.execution_time:.3f}'.rjust(10),
+              f'{approximate.metrics.execution_time:.3f}'.rjust(11), f'{exact.metrics.execution_time / approximate.metrics.execution_time:.1f}'.rjust(8),
+              f'{gap:.2e}'.rjust(10), f'{len(exact.changepoints)}/{len(approximate.changepoints)}'.rjust(12))
+
+
+def main() -> None:
+    print('case'.ljust(18), 'cost'.ljust(16), 'factor'.rjust(7), 'exact (s)'.rjust(10), 'approx (s)'.rjust(11), 'speedup'.rjust(8),
+          'gap'.rjust(10), 'changepoints'.rjust(12))
+    for case_number in range(Constants.cases_per_type):
+        for case_type in ['mean', 'variance', 'exponential', 'dependant']:
+            case = read_case(str(case_number).zfill(2) + '_' + case_type)
+            for cost_function in [GaussianCostFunction(), GaussianMeanCostFunction()]:
+                compare(case, cost_function)
+    values, metadata = gen_real_signal('cardio', 'heartRate')
+    compare(Case(size=real_size, name='cardio_heartRate', case_type='real', signal=values[:real_size], metadata=metadata[:real_size]), GaussianMeanCostFunction())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import math
+from typing import List
+
+import numpy as np
+
+from cases.case import Case
+from cases.generator import gen_real_signal
+from cost_functions.cost_function import CostFunction, GaussianMeanCostFunction, ExponentialLikelihoodCostFunction, KernelBasedCostFunction
+from runner.run_utils import read_case
+from solution.algorithm_input import AlgorithmInput
+from solution.chunked_segmentation import ChunkedSegmentation
+from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+from solution.solution import Solution
+from utils.constants import Constants
+
+# Sizes of the windows to be compared on the generated cases, each overlapping the next one by a fifth of it.
+window_sizes: List[int] = [1000, 2500]
+
+
+def solve_exact(algorithm_input: AlgorithmInput) -> Solution:
+    """
+    Solves the input with the optimal penalized solver.
+    :param algorithm_input: initialized input.
+    :return: the optimal solution.
+    """
+    return DynamicProgrammingPenalizationPruned(algorithm_input=algorithm_input).solve()
+
+
+def print_row(case: Case, cost_function: CostFunction, window_size: int, exact: Solution, chunked: Solution) -> None:
+    """
+    Prints the times, amounts of changepoints and relative cost gap of the chunked solution.
+    :param case: case solved.
+    :param cost_function: cost function used.
+    :param window_size: size of the windows of the chunked solver.
+    :param exact: optimal solution.
+    :param chunked: solution of the chunked solver.
+    :return: None.
+    """
+    gap = (chunked.metrics.cost - exact.metrics.cost) / abs(exact.metrics.cost)
+    print(case.name.ljust(18), cost_function.name.ljust(24), str(window_size).rjust(7), f'{exact.metrics.execution_time:.3f}'.rjust(10),
+          f'{chunked.metrics.execution_time:.3f}'.rjust(12), f'{len(exact.changepoints)}/{len(chunked.changepoints)}'.rjust(12), f'{gap:.2e}'.rjust(10))
+
+
+def main() -> None:
+    print('case'.ljust(18), 'cost'.ljust(24), 'window'.rjust(7), 'exact (s)'.rjust(10), 'chunked (s)'.rjust(12),
+          'changepoints'.rjust(12), 'gap'.rjust(10))
+    for case_number in range(Constants.cases_per_type):
+        for case_type in ['mean', 'variance', 'exponential', 'dependant']:
+            case = read_case(str(case_number).zfill(2) + '_' + case_type)
+            cost_functions = [GaussianMeanCostFunction(), KernelBasedCostFunction()]
+            if min(case.signal) > 0:
+                cost_functions.append(ExponentialLikelihoodCostFunction())
+            for cost_function in cost_functions:
+                penalization = 2.0 * math.log(case.size) * (float(np.var(case.signal)) if isinstance(cost_function, GaussianMeanCostFunction) else 1.0)
+                algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, penalization=penalization)
+                algorithm_input.initialize()
+                exact = solve_exact(algorithm_input)
+                for window_size in window_sizes:
+                    chunked = ChunkedSegmentation(algorithm_input=algorithm_input, window_size=window_size, overlap=window_size // 5).solve()
+                    print_row(case, cost_function, window_size, exact, chunked)
+    values, metadata = gen_real_signal('cardio', 'heartRate')
+    case = Case(size=len(values), name='cardio_heartRate', case_type='real', signal=values, metadata=metadata)
+    cost_function = GaussianMeanCostFunction()
+    algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, penalization=2.0 * math.log(case.size) * float(np.var(values)))
+    algorithm_input.initialize()
+    print_row(case, cost_function, Constants.chunk_window_size, solve_exact(algorithm_input), ChunkedSegmentation(algorithm_input=algorithm_input).solve())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import math
+from typing import List
+
+import numpy as np
+
+from cases.case import Case
+from cases.generator import gen_real_signal
+from cost_functions.cost_function import CostFunction, GaussianCostFunction, GaussianMeanCostFunction
+from runner.run_utils import read_case
+from solution.algorithm_input import AlgorithmInput
+from solution.coarse_to_fine_segmentation import CoarseToFineSegmentation
+from solution.optimal_partition_penalization import DynamicProgrammingPenalization
+from solution.solution import Solution
+from utils.constants import Constants
+
+# Block sizes to be compared.
+block_sizes: List[int] = [8, 32]
+# Signals longer than this are only solved by blocks, since the exact approach is quadratic.
+exact_max_size: int = 20000
+
+
+def compare(case: Case, cost_function: CostFunction) -> None:
+    """
+    Solves the case exactly, if it is short enough, and with every block size, printing the times, the relative
+    cost gap and the amount of changepoints moved by the refinement.
+    :param case: case to solve.
+    :param cost_function: cost function to be used.
+    :return: None.
+    """
+    penalization = 2.0 * math.log(case.size) * (float(np.var(case.signal)) if isinstance(cost_function, GaussianMeanCostFunction) else 1.0)
+    algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, penalization=penalization)
+    algorithm_input.initialize()
+    exact = DynamicProgrammingPenalization(algorithm_input=algorithm_input).solve() if case.size <= exact_max_size else None
+    for block_size in block_sizes:
+        solver = CoarseToFineSegmentation(algorithm_input=algorithm_input, block_size=block_size)
+        solution: Solution = solver.solve()
+        exact_time, gap, exact_changepoints = ('-', '-', '-') if exact is None else \
+            (f'{exact.metrics.execution_time:.3f}', f'{(solution.metrics.cost - exact.metrics.cost) / abs(exact.metrics.cost):.2e}', len(exact.changepoints))
+        print(case.name.ljust(18), cost_function.name.ljust(16), str(block_size).rjust(6), exact_time.rjust(10), f'{solution.metrics.execution_time:.3f}'.rjust(10),
+              gap.rjust(10), f'{exact_changepoints}/{len(solution.changepoints)}'.rjust(12), str(solver.moved_changepoints).rjust(6))
+
+
+def main() -> None:
+    print('case'.ljust(18), 'cost'.ljust(16), 'block'.rjust(6), 'exact (s)'.rjust(10), 'coarse (s)'.rjust(10), 'gap'.rjust(10),
+          'changepoints'.rjust(12), 'moved'.rjust(6))
+    for case_number in range(Constants.cases_per_type):
+        for case_type in ['mean', 'variance', 'exponential', 'dependant']:
+            case = read_case(str(case_number).zfill(2) + '_' + case_type)
+            for cost_function in [GaussianCostFunction(), GaussianMeanCostFunction()]:
+                compare(case, cost_function)
+    values, metadata = gen_real_signal('cardio', 'heartRate')
+    for size in [exact_max_size, len(values)]:
+        compare(Case(size=size, name='cardio_heartRate', case_type='real', signal=values[:size], metadata=metadata[:size]), GaussianMeanCostFunction())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from cases.generator import gen_real_signal
+from cost_functions.cost_function import KernelBasedCostFunction
+from cost_functions.kernels import Kernel, LaplaceKernel, GaussianKernel
+
+# Sizes of the signals used in the benchmark.
+sizes: List[int] = [1000, 2000, 5000, 10000, 20000]
+# The list based precompute needs about 32 bytes per matrix entry and n^2 python calls, so it is only run up to this size.
+legacy_max_size: int = 5000
+
+
+def legacy_precompute(kernel: Kernel, signal: List[float]) -> Tuple[List[float], List[List[float]]]:
+    """
+    Kernel pre-computation as it was implemented before being vectorized, with a nested
+    comprehension for the similarities and a python loop for the 2D prefix sum.
+    :param kernel: kernel used to measure the similarities.
+    :param signal: problem input signal.
+    :return: the 1D prefix sum of the diagonal and the 2D prefix sum of the kernel matrix.
+    """
+    prefix_sum_1d = [0.0]
+    for x in signal:
+        prefix_sum_1d.append(prefix_sum_1d[-1] + kernel.similarity(x, x))
+    prefix_sum_2d = [[0.0 for _ in range(len(signal) + 1)]] + \
+                    [[0.0] + [kernel.similarity(x, y) for y in signal] for x in signal]
+    for i in range(len(signal)):
+        for j in range(len(signal)):
+            prefix_sum_2d[i + 1][j + 1] += prefix_sum_2d[i][j + 1] + \
+                                           prefix_sum_2d[i + 1][j] - \
+                                           prefix_sum_2d[i][j]
+    return prefix_sum_1d, prefix_sum_2d
+
+
+def time_tiled_precompute(kernel: Kernel, signal: List[float]) -> Tuple[float, float, float]:
+    """
+    Measures the tiled pre-computation of the kernel cost function.
+    :param kernel: kernel used to measure the similarities.
+    :param signal: problem input signal.
+    :return: execution time in seconds, resident size of the result and peak of temporary memory, both in MB.
+    """
+    cost_function = KernelBasedCostFunction(kernel=kernel)
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    cost_function.precompute(signal)
+    end_time = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resident_size = cost_function.resident_size()
+    return end_time - start_time, resident_size / 2 ** 20, (peak - resident_size) / 2 ** 20
+
+
+def time_legacy_precompute(kernel: Kernel, signal: List[float]) -> float:
+    start_time = time.perf_counter()
+    legacy_precompute(kernel, signal)
+    return time.perf_counter() - start_time
+
+
+def main() -> None:
+    complete_signal, _ = gen_real_signal('cardio', 'heartRate')
+    print('kernel'.ljust(20), 'size'.rjust(8), 'legacy (s)'.rjust(12), 'tiled (s)'.rjust(12), 'speedup'.rjust(10),
+          'matrix (MB)'.rjust(12), 'temporary (MB)'.rjust(15))
+    for kernel in [LaplaceKernel(), GaussianKernel()]:
+        for size in sizes:
+            signal = complete_signal[:size]
+            tiled_time, resident_size, temporary_size = time_tiled_precompute(kernel, signal)
+            legacy_time = time_legacy_precompute(kernel, signal) if size <= legacy_max_size else None
+            print(kernel.name.ljust(20), str(size).rjust(8),
+                  (f'{legacy_time:.3f}' if legacy_time is not None else '-').rjust(12),
+                  f'{tiled_time:.3f}'.rjust(12),
+                  (f'{legacy_time / tiled_time:.1f}x' if legacy_time is not None else '-').rjust(10),
+                  f'{resident_size:.1f}'.rjust(12), f'{temporary_size:.1f}'.rjust(15))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import math
+import time
+from typing import List
+
+import numpy as np
+
+from cases.case import Case
+from cases.generator import gen_real_signal
+from cost_functions.cost_function import GaussianCostFunction, GaussianMeanCostFunction, ExponentialCostFunction, ExponentialLikelihoodCostFunction
+from solution.algorithm_input import AlgorithmInput
+from solution.online_detector import OnlineDetector
+from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+
+# Prefix of the signal to be streamed, since the offline approach is quadratic when few candidates are pruned.
+stream_size: int = 20000
+# Factors of the penalizations to be compared, which are multiplied by log(n) and by the variance of the signal for the mean cost.
+penalization_factors: List[float] = [1.0, 10.0]
+
+
+def main() -> None:
+    values, metadata = gen_real_signal('cardio', 'heartRate')
+    values, metadata = values[:stream_size], metadata[:stream_size]
+    case = Case(size=len(values), name='cardio_heartRate', case_type='real', signal=values, metadata=metadata)
+    print('cost'.ljust(24), 'penalization'.rjust(13), 'samples/s'.rjust(10), 'offline (s)'.rjust(12), 'confirmed'.rjust(10),
+          'max delay'.rjust(10), 'matched'.rjust(8))
+    for cost_type in [GaussianCostFunction, GaussianMeanCostFunction, ExponentialCostFunction, ExponentialLikelihoodCostFunction]:
+        for factor in penalization_factors:
+            penalization = factor * math.log(case.size) * (float(np.var(values)) if cost_type is GaussianMeanCostFunction else 1.0)
+            algorithm_input = AlgorithmInput(case=case, cost_function=cost_type(), penalization=penalization)
+            algorithm_input.initialize()
+            start_time = time.perf_counter()
+            offline_changepoints = DynamicProgrammingPenalizationPruned(algorithm_input=algorithm_input).solve().changepoints
+            offline_time = time.perf_counter() - start_time
+            detector = OnlineDetector(cost_function=cost_type(), penalization=penalization,
+                                      pruning_constant=algorithm_input.cost_function.pruning_constant())
+            delays = [0]
+            start_time = time.perf_counter()
+            for value in values:
+                changepoint = detector.update(value)
+                if changepoint is not None:
+                    delays.append(detector.samples - changepoint)
+            online_time = time.perf_counter() - start_time
+            matched = sorted(offline_changepoints) == detector.segmentation()
+            print(cost_type().name.ljust(24), f'{penalization:.2f}'.rjust(13), f'{case.size / online_time:.0f}'.rjust(10),
+                  f'{offline_time:.3f}'.rjust(12), str(len(detector.changepoints)).rjust(10), str(max(delays)).rjust(10), str(matched).rjust(8))
+
+
+if __name__ == '__main__':
+    main()
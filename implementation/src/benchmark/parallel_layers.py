@@ -0,0 +1,35 @@
+import os
+from typing import List
+
+from cases.case import Case
+from cases.generator import gen_real_signal
+from cost_functions.cost_function import GaussianCostFunction, ApproximateKernelCostFunction
+from solution.algorithm_input import AlgorithmInput
+from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+
+# Prefixes of the cardio heart rate signal to be segmented.
+sizes: List[int] = [10000, 20000]
+# Amount of changepoints of the segmentations, one layer each.
+amount_changepoints: int = 4
+
+
+def main() -> None:
+    values, metadata = gen_real_signal('cardio', 'heartRate')
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    print('cost'.ljust(28), 'size'.rjust(7), 'workers'.rjust(8), 'time (s)'.rjust(10), 'speedup'.rjust(8), 'same'.rjust(6))
+    for size in sizes:
+        case = Case(size=size, name='cardio_heartRate', case_type='real', signal=values[:size], metadata=metadata[:size])
+        for cost_function in [GaussianCostFunction(), ApproximateKernelCostFunction()]:
+            algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, penalization=1.0, max_amount_changepoints=amount_changepoints)
+            algorithm_input.initialize()
+            serial_solution = None
+            for workers in worker_counts:
+                solution = DynamicProgrammingChangepointsInState(algorithm_input=algorithm_input, workers=workers).solve()
+                serial_solution = serial_solution or solution
+                print(cost_function.name.ljust(28), str(size).rjust(7), str(workers).rjust(8), f'{solution.metrics.execution_time:.2f}'.rjust(10),
+                      f'{serial_solution.metrics.execution_time / solution.metrics.execution_time:.2f}'.rjust(8),
+                      str(solution.changepoints == serial_solution.changepoints).rjust(6))
+
+
+if __name__ == '__main__':
+    main()
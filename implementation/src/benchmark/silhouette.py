@@ -0,0 +1,38 @@
+import os
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from cost_functions.cost_function import GaussianMeanCostFunction
+from process.penalization_selector import SilhouettePenalizationSelector, obtain_solution_properties
+from runner.run_utils import read_case
+from utils.constants import Constants
+
+# Amounts of points scored for each range, the first one None to score all of them.
+sampled_points: List[Optional[int]] = [None, 200, 50]
+# Processes scoring the segmentations in the last column, with every point scored.
+workers: int = os.cpu_count()
+
+
+def main() -> None:
+    print('case'.ljust(16), 'segmentations'.rjust(14), *[('all' if points is None else str(points)).rjust(22) for points in sampled_points],
+          f'all, {workers} workers'.rjust(22))
+    for case_number in range(Constants.cases_per_type):
+        for case_type in ['mean', 'variance', 'exponential', 'dependant']:
+            case = read_case(str(case_number).zfill(2) + '_' + case_type)
+            objective_values, changepoints_values, _, _ = obtain_solution_properties(case, GaussianMeanCostFunction(), False)
+            changepoints_values = changepoints_values[:len(objective_values)]
+            columns, exact_silhouettes = [], None
+            for points, selector_workers in [(points, 1) for points in sampled_points] + [(None, workers)]:
+                selector = SilhouettePenalizationSelector(workers=selector_workers).with_aggregations('median', 'median').with_sampling(points)
+                start_time = time.perf_counter()
+                silhouettes = np.array([silhouette for silhouette, _ in selector.aggregated_silhouettes(case, changepoints_values)])
+                elapsed_time = time.perf_counter() - start_time
+                exact_silhouettes = silhouettes if exact_silhouettes is None else exact_silhouettes
+                columns.append(f'{elapsed_time:.3f}s ({np.max(np.abs(silhouettes - exact_silhouettes), initial=0.0):.1e})')
+            print(case.name.ljust(16), str(len(changepoints_values)).rjust(14), *[column.rjust(22) for column in columns])
+
+
+if __name__ == '__main__':
+    main()
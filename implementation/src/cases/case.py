@@ -26,12 +26,13 @@ class ValueMetadata:
 class Case:
     """
     This represents an input where existent changepoints
-    are not known and are yet to be estimated.
+    are not known and are yet to be estimated. The signal is either a list of
+    values or an (n, d) array when changepoints are shared among d channels.
     """
     size: int = 0
     name: str = ''
     case_type: str = ''
-    signal: List[float] = field(default_factory=list, compare=False, hash=False, repr=False)
+    signal: Union[List[float], np.ndarray] = field(default_factory=list, compare=False, hash=False, repr=False)
     metadata: List[ValueMetadata] = field(default_factory=list, compare=False, hash=False, repr=False)
 
 
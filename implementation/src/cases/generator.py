@@ -114,6 +114,21 @@ def gen_real_signal(file_name: str = 'cardio', data_attribute: str = 'heartRate'
            [date + ' ' + time for date, time in zip(dates, times)]
 
 
+def gen_real_multichannel_signal(file_name: str = 'cardio', data_attributes: Tuple[str, ...] = ('heartRate',)) -> Tuple[np.ndarray, List[str]]:
+    """
+    It generates a real signal with several channels, one for each of the given attributes, so that
+    all of them can be segmented together.
+    :param file_name: File name where the table with values are stored.
+    :param data_attributes: Columns with the specific values that we want.
+    :return: An (n, d) array with the values retrieved in cronological order and its associated metadata.
+    """
+    csv_file = pd.read_csv(''.join([Constants.project_root_path, 'resources/data/', file_name, '.csv']))
+    dates = [str(date_str) for date_str in csv_file['date']]
+    times = [str(time_str) for time_str in csv_file['time']] if 'time' in csv_file else ['00:00' for _ in dates]
+    return csv_file[list(data_attributes)].to_numpy(dtype=float), \
+           [date + ' ' + time for date, time in zip(dates, times)]
+
+
 def write_csv(path: str, values: List[float], metadata_values: List[str] = None) -> None:
     """
     Auxiliary function used to write a list of values in a specific path.
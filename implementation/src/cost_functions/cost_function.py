@@ -1,8 +1,13 @@
+import os
+import tempfile
+import weakref
 from dataclasses import dataclass, field
-from typing import List
+from typing import ClassVar, Dict, List, Tuple, Union
+
+import numpy as np
 
 from cost_functions.kernels import Kernel, LaplaceKernel
-from utils.aux import accumulate, range_sum
+from utils.aux import accumulate, range_sum, as_channels, log_deviation_roots, remove_file
 from utils.constants import Constants
 
 @dataclass
@@ -12,6 +17,7 @@ class CostFunction:
     given range in the signal.
     """
     name: str = 'general_cost_function'
+    functional_pruning: ClassVar[bool] = False
 
     def range_cost(self, start: int, end: int) -> float:
         """
@@ -21,78 +27,404 @@ class CostFunction:
         :return: real value with the associated cost to the range.
         """
 
+    def range_costs(self, starts: Union[int, np.ndarray], ends: Union[int, np.ndarray]) -> np.ndarray:
+        """
+        Costs associated to every range [starts[i], ends[i]), either bound can be a single
+        index, for example range_costs(starts, end) gives the cost of all the ranges finishing at end.
+        :param starts: begin of the ranges (inclusive).
+        :param ends: end of the ranges (exclusive).
+        :return: array with the associated cost to each range.
+        """
+        return np.vectorize(self.range_cost, otypes=[float])(starts, ends)
+
+    def pruning_constant(self) -> float:
+        """
+        Constant K such that cost(a, b) + cost(b, c) + K <= cost(a, c) for any a < b < c, which allows
+        discarding candidates that can never be optimal again (PELT). The default is safe for any cost,
+        although it prunes nothing.
+        :return: real value with the pruning constant.
+        """
+        return -Constants.infinity
+
+    def allows_functional_pruning(self) -> bool:
+        """
+        Whether the costs of the pre-computed signal are the minimum of a sum of losses for every sample,
+        so that candidates can be discarded with parameter_bounds. By default it is given by functional_pruning.
+        :return: True if the solvers can use functional pruning.
+        """
+        return self.functional_pruning
+
+    def parameter_bounds(self, starts: np.ndarray, end: int, slacks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Only for costs with functional_pruning, which are the minimum over a parameter (one for each channel) of
+        a sum of losses for every sample in the range. It bounds the parameters for which the loss of [starts[i], end)
+        is at most slacks[i] above its cost, so that candidates can be discarded once those sets become empty.
+        :param starts: begin of the ranges (inclusive).
+        :param end: end of the ranges (exclusive).
+        :param slacks: array with the non negative slack of each range.
+        :return: a pair of (k, d) arrays with the lower and upper bounds of the parameters of each range.
+        """
+
+    def is_monge(self, length: int) -> bool:
+        """
+        Whether the costs of the pre-computed signal satisfy the quadrangle (Monge) inequality
+        cost(a, c) + cost(b, d) <= cost(a, d) + cost(b, c) for any a < b < c < d, which makes the best last
+        changepoint non decreasing with the end of the range. None of the costs satisfies it for every signal, so
+        it is checked on every adjacent quadruple, which implies it for all of them, in O(n^2) time.
+        :param length: length of the pre-computed signal.
+        :return: True if the inequality holds, up to rounding errors.
+        """
+        for end in range(3, length + 1):
+            starts = np.arange(end - 2)
+            inner = self.range_costs(starts, end - 1) + self.range_costs(starts + 1, end)
+            outer = self.range_costs(starts, end) + self.range_costs(starts + 1, end - 1)
+            if np.any(inner > outer + Constants.epsilon * np.maximum(np.abs(outer), 1.0)):
+                return False
+        return True
+
+    def sample_statistics(self, values: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Only for costs computed from the sums over the range of some statistics of
+        each sample, which allows calculating them incrementally on a stream.
+        :param values: (n, d) array with the samples.
+        :return: a tuple with an (n, d) array for each statistic, in the order taken by statistics_costs.
+        """
+
+    def statistics_costs(self, lengths: np.ndarray, *sums: np.ndarray) -> np.ndarray:
+        """
+        Costs of ranges given their lengths and the sums of the statistics of their samples.
+        :param lengths: array with the length of each range.
+        :param sums: for each statistic, an array with its sum over each range and channel in the last axis.
+        :return: array with the associated cost to each range.
+        """
+
     def precompute(self, signal: List[float]) -> None:
         """
         Performs any pre-computations needed to answer
         range cost queries efficiently.
-        :param signal: problem input signal.
+        :param signal: problem input signal, either a list of values or an (n, d)
+        array with d channels, in which case the cost of a range is the sum of its cost in every channel.
         :return: None.
         """
 
+    def resident_size(self) -> int:
+        """
+        Amount of memory held by the pre-computations, arrays
+        backed by a file on disk are not accounted.
+        :return: size in bytes of the pre-computed arrays.
+        """
+        return sum(value.nbytes for value in self.precomputed_arrays().values() if not isinstance(value, np.memmap))
+
+    def precomputed_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Arrays obtained in the pre-computation, which are all that
+        is needed to answer range cost queries.
+        :return: a dictionary from the name of each attribute to its array.
+        """
+        return {name: value for name, value in vars(self).items() if isinstance(value, np.ndarray)}
+
+    def load_precomputed_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Restores the arrays of a previous pre-computation of the same
+        signal, instead of performing it again.
+        :param arrays: a dictionary from the name of each attribute to its array.
+        :return: None.
+        """
+        for name, value in arrays.items():
+            setattr(self, name, value)
+
 
 @dataclass
 class GaussianCostFunction(CostFunction):
     """ Gaussian cost function. """
     name: str = 'gaussian'
-    prefix_sum: List[float] = field(default_factory=list, compare=False, hash=False, repr=False)
-    prefix_sum_squares: List[float] = field(default_factory=list, compare=False, hash=False, repr=False)
+    prefix_sum: np.ndarray = field(default_factory=lambda: np.zeros((1, 1)), compare=False, hash=False, repr=False)
+    prefix_sum_squares: np.ndarray = field(default_factory=lambda: np.zeros((1, 1)), compare=False, hash=False, repr=False)
+    # Range of the values of each channel, unbounded until pre-computed.
+    value_range: np.ndarray = field(default_factory=lambda: np.full(1, np.inf), compare=False, hash=False, repr=False)
 
     def precompute(self, signal: List[float]) -> None:
-        self.prefix_sum = accumulate(signal)
-        self.prefix_sum_squares = accumulate(signal, lambda x: x ** 2)
+        values = as_channels(signal)
+        prefix_sums = accumulate(np.hstack([values, values ** 2]))
+        self.prefix_sum, self.prefix_sum_squares = prefix_sums[:, :values.shape[1]], prefix_sums[:, values.shape[1]:]
+        self.value_range = np.ptp(values, axis=0) if len(values) > 0 else np.zeros(values.shape[1])
+
+    def pruning_constant(self) -> float:
+        # The variance of [a, c) is at least the weighted mean of the variances of [a, b) and [b, c), so
+        # splitting lowers the cost by at most the largest variance, bounded by range^2 / 4 (Popoviciu).
+        return -float((self.value_range ** 2).sum()) / 4.0
 
     def range_cost(self, start: int, end: int) -> float:
-        if start == end:
-            return Constants.infinity
-        inv_length = 1.0 / float(end - start)
-        linear_sum_term = (inv_length ** 2) * (range_sum(self.prefix_sum, start, end) ** 2)
-        square_sum_term = inv_length * range_sum(self.prefix_sum_squares, start, end)
-        return square_sum_term - linear_sum_term
+        return float(self.range_costs(start, end))
+
+    def range_costs(self, starts: Union[int, np.ndarray], ends: Union[int, np.ndarray]) -> np.ndarray:
+        return self.statistics_costs(np.asarray(ends - starts, dtype=float),
+                                     range_sum(self.prefix_sum, starts, ends), range_sum(self.prefix_sum_squares, starts, ends))
+
+    def sample_statistics(self, values: np.ndarray) -> Tuple[np.ndarray, ...]:
+        return values, values ** 2
+
+    def statistics_costs(self, lengths: np.ndarray, *sums: np.ndarray) -> np.ndarray:
+        range_sums, range_sums_squares = sums
+        inv_length = 1.0 / np.maximum(lengths, 1.0)[..., None]
+        linear_sum_term = (inv_length ** 2) * (range_sums ** 2)
+        square_sum_term = inv_length * range_sums_squares
+        return np.where(lengths == 0, Constants.infinity, (square_sum_term - linear_sum_term).sum(axis=-1))
+
+
+@dataclass
+class GaussianMeanCostFunction(GaussianCostFunction):
+    """ Gaussian cost function for changes in mean, the squared error of the range
+    around its mean. Unlike the Gaussian cost it is not normalized by the length of the
+    range, so it adds up over the samples, which allows pruning candidates exactly. """
+    name: str = 'gaussian_mean'
+    functional_pruning: ClassVar[bool] = True
+
+    def statistics_costs(self, lengths: np.ndarray, *sums: np.ndarray) -> np.ndarray:
+        range_sums, range_sums_squares = sums
+        linear_sum_term = (range_sums ** 2) / np.maximum(lengths, 1.0)[..., None]
+        return np.where(lengths == 0, Constants.infinity, (range_sums_squares - linear_sum_term).sum(axis=-1))
+
+    def pruning_constant(self) -> float:
+        return 0.0
+
+    def parameter_bounds(self, starts: np.ndarray, end: int, slacks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # The loss around the mean of the range grows as length * (mu - mean)^2.
+        lengths = (end - starts)[:, None]
+        means = range_sum(self.prefix_sum, starts, end) / lengths
+        radius = np.sqrt(slacks[:, None] / lengths)
+        return means - radius, means + radius
 
 
 @dataclass
 class ExponentialCostFunction(CostFunction):
     """ Exponential distribution cost function. """
     name: str = 'exponential'
-    prefix_sum: List[float] = field(default_factory=list, compare=False, hash=False, repr=False)
+    prefix_sum: np.ndarray = field(default_factory=lambda: np.zeros((1, 1)), compare=False, hash=False, repr=False)
+    minimum_value: np.ndarray = field(default_factory=lambda: np.zeros(1), compare=False, hash=False, repr=False)
 
     def precompute(self, signal: List[float]) -> None:
-        self.prefix_sum = accumulate(signal)
+        values = as_channels(signal)
+        self.prefix_sum = accumulate(values)
+        self.minimum_value = values.min(axis=0) if len(values) > 0 else np.zeros(values.shape[1])
+
+    def pruning_constant(self) -> float:
+        # The cost of a range is the inverse of its mean, the one of [a, c) is at least the smallest among
+        # the ones of [a, b) and [b, c), so splitting lowers the cost by at most 1 / min(signal).
+        if np.any(self.minimum_value <= 0.0):
+            return -Constants.infinity
+        return -float((1.0 / self.minimum_value).sum())
 
     def range_cost(self, start: int, end: int) -> float:
-        range_value = max(range_sum(self.prefix_sum, start, end), Constants.epsilon)
-        return float(end - start) / range_value
+        return float(self.range_costs(start, end))
+
+    def range_costs(self, starts: Union[int, np.ndarray], ends: Union[int, np.ndarray]) -> np.ndarray:
+        return self.statistics_costs(np.asarray(ends - starts, dtype=float), range_sum(self.prefix_sum, starts, ends))
+
+    def sample_statistics(self, values: np.ndarray) -> Tuple[np.ndarray, ...]:
+        return values,
+
+    def statistics_costs(self, lengths: np.ndarray, *sums: np.ndarray) -> np.ndarray:
+        range_values = np.maximum(sums[0], Constants.epsilon)
+        return (lengths[..., None] / range_values).sum(axis=-1)
+
+
+@dataclass
+class ExponentialLikelihoodCostFunction(ExponentialCostFunction):
+    """ Exponential distribution cost function given by the negative log-likelihood of the range at
+    its maximum likelihood rate, length * (log(mean) + 1). Unlike the exponential cost it adds up over the
+    samples, which allows pruning candidates exactly. """
+    name: str = 'exponential_likelihood'
+    functional_pruning: ClassVar[bool] = True
+
+    def allows_functional_pruning(self) -> bool:
+        # The sums of the ranges are clamped to epsilon, so the cost only adds up over positive samples.
+        return not np.any(self.minimum_value <= 0.0)
+
+    def pruning_constant(self) -> float:
+        if not self.allows_functional_pruning():
+            return -Constants.infinity
+        return 0.0
+
+    def statistics_costs(self, lengths: np.ndarray, *sums: np.ndarray) -> np.ndarray:
+        safe_lengths = np.maximum(lengths, 1.0)[..., None]
+        range_values = np.maximum(sums[0], Constants.epsilon)
+        return np.where(lengths == 0, Constants.infinity, (safe_lengths * (np.log(range_values / safe_lengths) + 1.0)).sum(axis=-1))
+
+    def parameter_bounds(self, starts: np.ndarray, end: int, slacks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # The loss at rate u * best_rate exceeds the cost by length * (u - 1 - log(u)).
+        lengths = (end - starts)[:, None]
+        best_rates = lengths / np.maximum(range_sum(self.prefix_sum, starts, end), Constants.epsilon)
+        lower_roots, upper_roots = log_deviation_roots(slacks[:, None] / lengths)
+        return best_rates * lower_roots, best_rates * upper_roots
 
 
 @dataclass
 class KernelBasedCostFunction(CostFunction):
-    """Kernel based cost function. """
+    """Kernel based cost function.
+
+    The 2D prefix sum of the kernel matrix takes (n+1)^2 values, so it is stored as a
+    contiguous array of the given dtype ('float32' halves the memory at the cost of
+    precision on long signals), optionally memory mapped to a file on disk for signals
+    whose matrix does not fit in memory.
+
+    The matrix is built tile by tile, so the temporary memory needed is bounded
+    by the square of the tile size regardless of the length of the signal.
+
+    For signals with several channels the similarities of all the channels are added up
+    in a single matrix, which is the same as adding up the cost of every channel."""
     kernel: Kernel = LaplaceKernel()
     name: str = kernel.name
-    prefix_sum_1d: List[float] = field(default_factory=list, compare=False, hash=False, repr=False)
-    prefix_sum_2d: List[List[float]] = field(default_factory=list, compare=False, hash=False, repr=False)
+    dtype: str = 'float64'
+    tile_size: int = Constants.kernel_tile_size
+    memory_mapped: bool = False
+    memmap_file: str = field(default='', compare=False, hash=False, repr=False)
+    prefix_sum_1d: np.ndarray = field(default_factory=lambda: np.zeros(1), compare=False, hash=False, repr=False)
+    prefix_sum_2d: np.ndarray = field(default_factory=lambda: np.zeros((1, 1)), compare=False, hash=False, repr=False)
 
     def set_kernel(self, kernel: Kernel) -> None:
         self.kernel = kernel
         self.name = kernel.name
 
-    def sum_submatrix(self, start: int, end: int):
-        return self.prefix_sum_2d[end][end] - \
-               self.prefix_sum_2d[start][end] - \
-               self.prefix_sum_2d[end][start] + \
-               self.prefix_sum_2d[start][start]
+    def pruning_constant(self) -> float:
+        # The cost is the scatter of the range in the feature space of the kernel, which never increases when splitting.
+        return 0.0
 
-    def precompute(self, signal: List[float]) -> None:
-        self.prefix_sum_1d = accumulate([self.kernel.similarity(x, x) for x in signal])
-        self.prefix_sum_2d = [[0.0 for _ in range(len(signal) + 1)]] + \
-                             [[0.0] + [self.kernel.similarity(x, y) for y in signal] for x in signal]
+    def sum_submatrix(self, start: Union[int, np.ndarray], end: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+        return self.prefix_sum_2d[end, end] - \
+               self.prefix_sum_2d[start, end] - \
+               self.prefix_sum_2d[end, start] + \
+               self.prefix_sum_2d[start, start]
 
-        for i in range(len(signal)):
-            for j in range(len(signal)):
-                self.prefix_sum_2d[i + 1][j + 1] += self.prefix_sum_2d[i][j + 1] + \
-                                                    self.prefix_sum_2d[i + 1][j] - \
-                                                    self.prefix_sum_2d[i][j]
+    def allocate_prefix_sum_2d(self, size: int) -> np.ndarray:
+        """
+        Allocates a zeroed square matrix for the 2D prefix sum, either
+        in memory or in a new file if the cost function is memory mapped.
+        The file is removed once the cost function is released, or at exit.
+        :param size: amount of rows and columns of the matrix.
+        :return: the allocated matrix.
+        """
+        if not self.memory_mapped:
+            return np.zeros((size, size), dtype=self.dtype)
+        os.makedirs(Constants.memmap_path, exist_ok=True)
+        file_descriptor, self.memmap_file = tempfile.mkstemp(prefix=self.name + '_', suffix='.dat', dir=Constants.memmap_path)
+        os.close(file_descriptor)
+        weakref.finalize(self, remove_file, self.memmap_file)
+        return np.memmap(self.memmap_file, dtype=self.dtype, mode='w+', shape=(size, size))
+
+    def channel_similarities(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Similarities of every pair of samples added up across channels.
+        :param xs: (rows, d) array with the first samples.
+        :param ys: (columns, d) array with the second samples.
+        :return: matrix of shape (rows, columns) with the similarities.
+        """
+        return sum(self.kernel.similarities(xs[:, channel], ys[:, channel]) for channel in range(xs.shape[1]))
+
+    def precompute(self, signal: List[float]) -> None:
+        values = as_channels(signal)
+        diagonal = np.zeros(len(values))
+        self.prefix_sum_2d = self.allocate_prefix_sum_2d(len(values) + 1)
+        for row_start in range(0, len(values), self.tile_size):
+            row_end = min(row_start + self.tile_size, len(values))
+            for column_start in range(0, len(values), self.tile_size):
+                column_end = min(column_start + self.tile_size, len(values))
+                tile = self.channel_similarities(values[row_start:row_end], values[column_start:column_end])
+                if row_start == column_start:
+                    diagonal[row_start:row_end] = np.diagonal(tile)
+                self.prefix_sum_2d[row_start + 1:row_end + 1, column_start + 1:column_end + 1] = \
+                    tile.cumsum(axis=0).cumsum(axis=1) + \
+                    self.prefix_sum_2d[row_start, column_start + 1:column_end + 1][None, :] + \
+                    self.prefix_sum_2d[row_start + 1:row_end + 1, column_start][:, None] - \
+                    self.prefix_sum_2d[row_start, column_start]
+        self.prefix_sum_1d = accumulate(diagonal)
+        if isinstance(self.prefix_sum_2d, np.memmap):
+            self.prefix_sum_2d.flush()
 
     def range_cost(self, start: int, end: int) -> float:
         return Constants.infinity if start == end else \
             (self.prefix_sum_1d[end] - self.prefix_sum_1d[start]) - (1.0 / float(end - start) * self.sum_submatrix(start, end))
+
+    def range_costs(self, starts: Union[int, np.ndarray], ends: Union[int, np.ndarray]) -> np.ndarray:
+        lengths = np.asarray(ends - starts, dtype=float)
+        costs = (self.prefix_sum_1d[ends] - self.prefix_sum_1d[starts]) - (1.0 / np.maximum(lengths, 1.0) * self.sum_submatrix(starts, ends))
+        return np.where(lengths == 0, Constants.infinity, costs)
+
+
+@dataclass
+class ApproximateKernelCostFunction(CostFunction):
+    """Approximation of the kernel based cost function.
+
+    Each value is mapped to a feature vector of the given rank whose inner products approximate
+    the kernel, either with random Fourier features sampled from the spectral density of the kernel
+    or with a Nystrom basis built from landmark values of the signal (also used for kernels with no
+    known spectral density). The cost of a range is then
+    the scatter of its features around their mean, answered from the prefix sums of the features,
+    so that both memory and pre-computation are O(n * rank) instead of O(n^2). Signals with several
+    channels get the features of every channel side by side, adding up the cost of the channels."""
+    kernel: Kernel = LaplaceKernel()
+    name: str = 'approximate_' + kernel.name
+    method: str = 'nystrom'
+    rank: int = Constants.kernel_approximation_rank
+    seed: int = Constants.seed
+    prefix_sum_norms: np.ndarray = field(default_factory=lambda: np.zeros(1), compare=False, hash=False, repr=False)
+    prefix_sum_features: np.ndarray = field(default_factory=lambda: np.zeros((1, 0)), compare=False, hash=False, repr=False)
+
+    def set_kernel(self, kernel: Kernel) -> None:
+        self.kernel = kernel
+        self.name = 'approximate_' + kernel.name
+
+    def pruning_constant(self) -> float:
+        return 0.0
+
+    def fourier_features(self, values: np.ndarray, frequencies: np.ndarray) -> np.ndarray:
+        """
+        Random Fourier features, pairs of cosines and sines of the sampled frequencies.
+        :param values: values to be mapped.
+        :param frequencies: frequencies sampled from the spectral density of the kernel.
+        :return: matrix with a feature vector of size 2 * len(frequencies) for each value.
+        """
+        phases = values[:, None] * frequencies[None, :]
+        return np.hstack([np.cos(phases), np.sin(phases)]) / np.sqrt(len(frequencies))
+
+    def nystrom_basis(self, values: np.ndarray, rng: np.random.RandomState) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Chooses landmark values among the signal and the projection that whitens their kernel matrix.
+        :param values: problem input signal.
+        :param rng: random number generator used to choose the landmarks.
+        :return: a pair with the landmarks and the projection matrix.
+        """
+        distinct_values = np.unique(values)
+        landmarks = np.sort(rng.choice(distinct_values, min(self.rank, len(distinct_values)), replace=False))
+        eigenvalues, eigenvectors = np.linalg.eigh(self.kernel.similarities(landmarks, landmarks))
+        kept = eigenvalues > Constants.epsilon * max(eigenvalues.max(), Constants.epsilon)
+        return landmarks, eigenvectors[:, kept] / np.sqrt(eigenvalues[kept])
+
+    def channel_features(self, values: np.ndarray, rng: np.random.RandomState) -> np.ndarray:
+        """
+        Maps the values of a single channel to their feature vectors.
+        :param values: values of the channel.
+        :param rng: random number generator used to build the feature map.
+        :return: matrix with a feature vector for each value.
+        """
+        frequencies = self.kernel.spectral_frequencies(self.rank // 2, rng) if self.method == 'fourier' else None
+        if frequencies is not None:
+            return self.fourier_features(values, frequencies)
+        landmarks, projection = self.nystrom_basis(values, rng)
+        return self.kernel.similarities(values, landmarks) @ projection
+
+    def precompute(self, signal: List[float]) -> None:
+        values = as_channels(signal)
+        rng = np.random.RandomState(self.seed)
+        features = np.hstack([self.channel_features(values[:, channel], rng) for channel in range(values.shape[1])])
+        self.prefix_sum_norms = accumulate((features ** 2).sum(axis=1))
+        self.prefix_sum_features = np.vstack([np.zeros((1, features.shape[1])), np.cumsum(features, axis=0)])
+
+    def range_cost(self, start: int, end: int) -> float:
+        return float(self.range_costs(start, end))
+
+    def range_costs(self, starts: Union[int, np.ndarray], ends: Union[int, np.ndarray]) -> np.ndarray:
+        lengths = np.asarray(ends - starts, dtype=float)
+        features_sum = self.prefix_sum_features[ends] - self.prefix_sum_features[starts]
+        costs = range_sum(self.prefix_sum_norms, starts, ends) - (features_sum ** 2).sum(axis=-1) / np.maximum(lengths, 1.0)
+        return np.where(lengths == 0, Constants.infinity, costs)
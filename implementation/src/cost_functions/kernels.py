@@ -1,6 +1,8 @@
 import math
 from dataclasses import dataclass
 
+import numpy as np
+
 from utils.constants import Constants
 
 
@@ -23,6 +25,25 @@ class Kernel:
         :return: real value that tries to capture how similar two values are.
         """
 
+    def similarities(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Similarity of every pair of values among the two given
+        arrays, computed as a single block.
+        :param xs: first values, one for each row of the block.
+        :param ys: second values, one for each column of the block.
+        :return: matrix of shape (len(xs), len(ys)) with the similarities.
+        """
+        return np.vectorize(self.similarity, otypes=[float])(np.asarray(xs)[:, None], np.asarray(ys)[None, :])
+
+    def spectral_frequencies(self, amount: int, rng: np.random.RandomState) -> np.ndarray:
+        """
+        Samples frequencies from the spectral density of the kernel, so that
+        the kernel is the expected value of cos(w * (x - y)) (Bochner's theorem).
+        :param amount: amount of frequencies to be sampled.
+        :param rng: random number generator used to sample.
+        :return: array with the sampled frequencies, or None if the spectral density is not known.
+        """
+
 @dataclass
 class GaussianKernel(Kernel):
     """ Gaussian Kernel. """
@@ -31,6 +52,12 @@ class GaussianKernel(Kernel):
     def similarity(self, x: float, y: float) -> float:
         return math.exp(-(abs(x - y) ** 2) / (2 * (self.bandwith ** 2)))
 
+    def similarities(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        return np.exp(-(np.abs(np.asarray(xs)[:, None] - np.asarray(ys)[None, :]) ** 2) / (2 * (self.bandwith ** 2)))
+
+    def spectral_frequencies(self, amount: int, rng: np.random.RandomState) -> np.ndarray:
+        return rng.normal(0.0, 1.0 / self.bandwith, amount)
+
 @dataclass
 class LaplaceKernel(Kernel):
     """ Laplace Kernel. """
@@ -38,3 +65,9 @@ class LaplaceKernel(Kernel):
 
     def similarity(self, x: float, y: float) -> float:
         return math.exp(-abs(x - y) / self.bandwith)
+
+    def similarities(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        return np.exp(-np.abs(np.asarray(xs)[:, None] - np.asarray(ys)[None, :]) / self.bandwith)
+
+    def spectral_frequencies(self, amount: int, rng: np.random.RandomState) -> np.ndarray:
+        return rng.standard_cauchy(amount) / self.bandwith
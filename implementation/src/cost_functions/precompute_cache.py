@@ -0,0 +1,108 @@
+import hashlib
+import os
+import shutil
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from cost_functions.cost_function import CostFunction
+from utils.aux import as_channels
+from utils.constants import Constants
+
+
+@dataclass
+class PrecomputeCache:
+    """
+    On disk cache of the pre-computations of the cost functions, addressed by the content of the
+    signal and the parameters of the cost function. Each entry is a folder with one .npy file for
+    each pre-computed array, which are memory mapped back when loaded. Once the total size exceeds
+    the limit, the least recently used entries are evicted.
+    """
+    path: str = Constants.precompute_cache_path
+    size_limit: int = Constants.precompute_cache_size_limit
+
+    def key(self, cost_function: CostFunction, signal: List[float]) -> str:
+        """
+        Content address of the pre-computation of a cost function over a signal.
+        :param cost_function: cost function to be pre-computed, its representation holds its parameters.
+        :param signal: problem input signal.
+        :return: hexadecimal digest identifying the pre-computation.
+        """
+        values = np.ascontiguousarray(as_channels(signal))
+        digest = hashlib.sha256(repr(cost_function).encode())
+        digest.update(str(values.shape).encode())
+        digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    def entries(self) -> List[str]:
+        """
+        Folders of the entries currently stored, from the least to the most recently used.
+        :return: The list with the path of every entry.
+        """
+        if not os.path.isdir(self.path):
+            return []
+        entries = [os.path.join(self.path, name) for name in os.listdir(self.path) if not name.endswith('.tmp')]
+        return sorted(entries, key=lambda entry: os.stat(entry).st_mtime)
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Memory maps the arrays stored for the key, marking the entry as recently used.
+        :param key: address of the pre-computation.
+        :return: a dictionary from attribute name to array, or None if the key is not stored.
+        """
+        entry = os.path.join(self.path, key)
+        if not os.path.isdir(entry):
+            return None
+        os.utime(entry)
+        return {file_name[:-len('.npy')]: np.load(os.path.join(entry, file_name), mmap_mode='r')
+                for file_name in os.listdir(entry) if file_name.endswith('.npy')}
+
+    def store(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Stores the arrays of a pre-computation, written in a temporary folder that is then
+        renamed so that concurrent readers never see a partial entry.
+        :param key: address of the pre-computation.
+        :param arrays: a dictionary from attribute name to array.
+        :return: None.
+        """
+        if sum(array.nbytes for array in arrays.values()) > self.size_limit:
+            return
+        entry, temporary_entry = os.path.join(self.path, key), os.path.join(self.path, key + '.' + str(os.getpid()) + '.tmp')
+        os.makedirs(temporary_entry, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(temporary_entry, name + '.npy'), array)
+        if os.path.isdir(entry):
+            shutil.rmtree(temporary_entry)
+        else:
+            os.rename(temporary_entry, entry)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits in its size limit.
+        :return: None.
+        """
+        entries = self.entries()
+        sizes = [sum(os.path.getsize(os.path.join(entry, file_name)) for file_name in os.listdir(entry)) for entry in entries]
+        total_size = sum(sizes)
+        for entry, size in zip(entries, sizes):
+            if total_size <= self.size_limit:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+    def precompute(self, cost_function: CostFunction, signal: List[float]) -> None:
+        """
+        Pre-computes the cost function over the signal, reusing a stored pre-computation when there is one.
+        :param cost_function: cost function to be pre-computed.
+        :param signal: problem input signal.
+        :return: None.
+        """
+        key = self.key(cost_function, signal)
+        arrays = self.load(key)
+        if arrays is not None:
+            cost_function.load_precomputed_arrays(arrays)
+        else:
+            cost_function.precompute(signal)
+            self.store(key, cost_function.precomputed_arrays())
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import List
+
+import numpy as np
 
 from utils.constants import Constants
 
@@ -9,7 +10,15 @@ class Metrics:
     cost: float
     solver_used: str
     execution_time: float
-    best_prefix: List[List[float]]
+    # Table of best costs by amount of changepoints, shared with the solver rather than copied.
+    best_prefix: np.ndarray
     correct_changepoints: int = Constants.no_data
     incorrect_changepoints: int = Constants.no_data
     not_found_changepoints: int = Constants.no_data
+    cost_function_memory: int = Constants.no_data
+    evaluated_candidates: int = Constants.no_data
+    pruned_candidates: int = Constants.no_data
+    # Relative excess of the cost over the optimal one, for approximate solvers.
+    approximation_gap: float = Constants.no_data
+    # Amount of changepoints moved by the refinement of the coarse to fine solver.
+    moved_changepoints: int = Constants.no_data
@@ -1,13 +1,20 @@
 import math
 from dataclasses import dataclass
-from typing import Tuple, List, Callable
+from functools import partial
+from multiprocessing import Pool, current_process
+from typing import Tuple, List, Callable, Type, Optional, Dict
+
+import numpy as np
 
 from cases.case import Case
 from cost_functions.cost_function import KernelBasedCostFunction, GaussianCostFunction, CostFunction
-from cost_functions.kernels import LaplaceKernel
+from cost_functions.kernels import LaplaceKernel, Kernel
 from solution.algorithm_input import AlgorithmInput
-from solution.binary_segmentation import BinarySegmentation
+from solution.crops import crops
 from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+from solution.parallel_layers import Layout, attach_array, share_array
+from solution.result_registry import ResultRegistry
 from solution.solution import Solution
 from solution.solver import Solver
 from solution.suboptimal_partition_changepoints_in_state_divide_and_conquer_optimzation import DynamicProgrammingDivideAndConquer
@@ -15,40 +22,110 @@ from utils.constants import Constants
 from visualization.visualization_script import visualize_elbow, visualize_silhouette
 
 
-def obtain_solution_properties(case: Case, cost_function: CostFunction = KernelBasedCostFunction(), account_penalization: bool = True) -> Tuple[
+def obtain_solution_properties(case: Case, cost_function: CostFunction = KernelBasedCostFunction(), account_penalization: bool = True,
+                               solver_type: Type[DynamicProgrammingChangepointsInState] = DynamicProgrammingDivideAndConquer,
+                               result_registry: Optional[ResultRegistry] = None) -> Tuple[
     List[float], List[List[int]], Solution, AlgorithmInput]:
     """
     It obtains the solution for different amount of changepoints.
     :param case: case to solve.
     :param cost_function: cost function to be used in fast solver.
     :param account_penalization: boolean deciding whether penalization for each changepoint should count in the objective
+    :param solver_type: solver filling the table for every amount of changepoints, the divide and conquer one is fast although
+    suboptimal, while the functional pruning one is exact for the costs that support it.
+    :param result_registry: registry in which the table is shared with the solvers of the run, None to not share it.
     :return: The list of objective values, and changepoints obtained for each specified amount and extra values for simplicity of code.
     """
     changepoints_bound: int = min(Constants.changepoints_bound, math.floor(math.sqrt(case.size)))
-    algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, max_amount_changepoints=changepoints_bound)
+    algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, max_amount_changepoints=changepoints_bound, result_registry=result_registry)
     algorithm_input.initialize()
-    greedy_solver_dynamic_programming: DynamicProgrammingChangepointsInState = DynamicProgrammingDivideAndConquer(algorithm_input=algorithm_input)
+    greedy_solver_dynamic_programming: DynamicProgrammingChangepointsInState = solver_type(algorithm_input=algorithm_input)
     solution_dynamic_programming: Solution = greedy_solver_dynamic_programming.solve()
     amount_changepoints = len(solution_dynamic_programming.changepoints)
     penalization = algorithm_input.penalization if not account_penalization else 0.0
-    objective_values = [solution_dynamic_programming.metrics.best_prefix[k][case.size] - k * penalization for k in range(amount_changepoints)]
+    objective_values = [solution_dynamic_programming.metrics.best_prefix[k, -1] - k * penalization for k in range(amount_changepoints)]
     # print(objective_values)
-    changepoints_values = [greedy_solver_dynamic_programming.retrieve_changepoints(k) for k in range(amount_changepoints)]
+    changepoints_values = greedy_solver_dynamic_programming.retrieve_all_changepoints()[:amount_changepoints]
     return objective_values, changepoints_values, solution_dynamic_programming, algorithm_input
 
 
-def obtain_penalization_from_changepoints(case: Case, algorithm_input: AlgorithmInput, guessed_changepoints: int) -> float:
-    lower_penalization, upper_penalization = 0.0, float(case.size) * algorithm_input.cost_function.range_cost(0, case.size)
-    greedy_solver_binary_segmentation: Solver = BinarySegmentation(algorithm_input=algorithm_input)
-    while upper_penalization - lower_penalization > Constants.epsilon:
-        penalization = (lower_penalization + upper_penalization) / 2.0
-        algorithm_input.penalization = penalization
-        solution_binary_segmentation: Solution = greedy_solver_binary_segmentation.solve()
-        if len(solution_binary_segmentation.changepoints) > guessed_changepoints:
-            lower_penalization = penalization
-        else:
-            upper_penalization = penalization
-    return (lower_penalization + upper_penalization) / 2.0
+def obtain_penalization_from_changepoints(case: Case, algorithm_input: AlgorithmInput, guessed_changepoints: int,
+                                          solver_type: Type[Solver] = DynamicProgrammingPenalizationPruned) -> float:
+    """
+    It finds a penalization for which the optimal segmentation has the guessed amount of changepoints, or the
+    closest amount below it if none has it, by exploring with CROPS only the penalizations that can lead to it.
+    :param case: input case.
+    :param algorithm_input: input of the case, whose penalization is restored afterwards.
+    :param guessed_changepoints: amount of changepoints wanted.
+    :param solver_type: penalized solver used to explore the penalizations.
+    :return: the penalization in the middle of the range in which the chosen segmentation is optimal.
+    """
+    # The cost of the whole signal can be negative, like the exponential likelihood one of small means, so the
+    # range is bounded from its absolute value and from the largest decrease given by a single changepoint.
+    cost_function = algorithm_input.cost_function
+    whole_cost = cost_function.range_cost(0, case.size)
+    splits = np.arange(1, case.size)
+    split_gain = whole_cost - float(np.min(cost_function.range_costs(0, splits) + cost_function.range_costs(splits, case.size))) if case.size > 1 else 0.0
+    maximum_penalization = float(case.size) * max(abs(whole_cost), split_gain, Constants.epsilon)
+    assert maximum_penalization > 0.0, f'invalid range of penalizations [0, {maximum_penalization}] for the {cost_function.name} cost'
+    segmentations = crops(solver_type(algorithm_input=algorithm_input), 0.0, maximum_penalization, guessed_changepoints)
+    chosen = next((segmentation for segmentation in segmentations if len(segmentation.changepoints) <= guessed_changepoints), segmentations[-1])
+    return (chosen.minimum_penalization + chosen.maximum_penalization) / 2.0
+
+
+def order_statistic(values: np.ndarray, percentile: int) -> np.ndarray:
+    """
+    It finds the value at the given percentile of the sorted values along the last axis, in linear time.
+    :param values: array with the values to aggregate in the last axis.
+    :param percentile: integer between 0 and 99, the value taken is the one at index percentile * len // 100 once sorted.
+    :return: array with the order statistic of each row.
+    """
+    index = percentile * values.shape[-1] // 100
+    return np.partition(values, index, axis=-1)[..., index]
+
+
+def mean_square(values: np.ndarray) -> np.ndarray:
+    return np.mean(values ** 2, axis=-1)
+
+
+# Aggregations of the values along the last axis by name, kept at module level so that the selectors can be sent to other processes.
+aggregations: Dict[str, Callable[[np.ndarray], np.ndarray]] = {'mean': partial(np.mean, axis=-1),
+                                                              'median': partial(order_statistic, percentile=50),
+                                                              'max': partial(np.max, axis=-1),
+                                                              'min': partial(np.min, axis=-1),
+                                                              'squared': mean_square,
+                                                              'p01': partial(order_statistic, percentile=1),
+                                                              'p05': partial(order_statistic, percentile=5),
+                                                              'p10': partial(order_statistic, percentile=10),
+                                                              'p15': partial(order_statistic, percentile=15),
+                                                              'p25': partial(order_statistic, percentile=25),
+                                                              'p35': partial(order_statistic, percentile=35),
+                                                              'p75': partial(order_statistic, percentile=75),
+                                                              'p95': partial(order_statistic, percentile=95)}
+
+# State of each worker process scoring segmentations, set once by attach_scorer when the pool starts.
+scorer_selector: Optional['SilhouettePenalizationSelector'] = None
+scorer_signal: np.ndarray = np.zeros(0)
+
+
+def attach_scorer(selector: 'SilhouettePenalizationSelector', signal_layout: Layout) -> None:
+    """
+    Initializer of the worker processes, it attaches the signal shared by the selector.
+    :param selector: selector scoring the segmentations.
+    :param signal_layout: layout of the block holding the values of the signal.
+    :return: None.
+    """
+    global scorer_selector, scorer_signal
+    scorer_selector, scorer_signal = selector, attach_array(signal_layout)
+
+
+def score_segmentation(bounds: List[int]) -> float:
+    """
+    It aggregates the silhouettes of a segmentation of the shared signal.
+    :param bounds: sorted limits of the ranges, from 0 to the length of the signal.
+    :return: the aggregated silhouette.
+    """
+    return scorer_selector.aggregated_silhouette(scorer_signal, bounds)
 
 
 def apply_elbow(changepoints_to_analyze: List[int], objective_values: List[float], threshold: float):
@@ -73,6 +150,11 @@ def apply_elbow(changepoints_to_analyze: List[int], objective_values: List[float
 class PenalizationSelector:
     visualize: bool = False
     threshold: float = 1.01
+    solver_type: Type[DynamicProgrammingChangepointsInState] = DynamicProgrammingDivideAndConquer
+    penalized_solver_type: Type[Solver] = DynamicProgrammingPenalizationPruned
+    result_registry: Optional[ResultRegistry] = None
+    # Processes scoring the candidate amounts of changepoints, 1 to score them in the calling one.
+    workers: int = 1
 
     def select_penalization(self, case: Case, cost_function: CostFunction) -> Tuple[float, int]:
         """
@@ -97,7 +179,7 @@ class ElbowPenalizationSelector(PenalizationSelector):
     def select_penalization(self, case: Case, cost_function: CostFunction) -> Tuple[float, int]:
         """
         It runs dynamic programming suboptimal algorithm to find the solution for each amount of changepoint,
-        and the uses binary search to find a suitable penalization for a binary segmentation algorithm to achieve
+        and then explores the penalizations with CROPS to find a suitable one for the penalized solver to achieve
         such desired amount of changepoitns previously found with the elbow method.
         :param case: input case.
         :param cost_function: cost function to be used.
@@ -105,12 +187,12 @@ class ElbowPenalizationSelector(PenalizationSelector):
         """
 
         objective_values, changepoints_values, solution_dynamic_programming, algorithm_input = obtain_solution_properties(case=case,
-            cost_function=cost_function, account_penalization=True)
+            cost_function=cost_function, account_penalization=True, solver_type=self.solver_type, result_registry=self.result_registry)
         amount_changepoints = len(objective_values)
         guessed_changepoints = apply_elbow(list(range(amount_changepoints)), objective_values, self.threshold)
         if self.visualize:
             visualize_elbow(case, solution_dynamic_programming, guessed_changepoints)
-        return obtain_penalization_from_changepoints(case, algorithm_input, guessed_changepoints), guessed_changepoints
+        return obtain_penalization_from_changepoints(case, algorithm_input, guessed_changepoints, self.penalized_solver_type), guessed_changepoints
 
 
 class SilhouettePenalizationSelector(PenalizationSelector):
@@ -122,35 +204,86 @@ class SilhouettePenalizationSelector(PenalizationSelector):
     Once it has the solutions obtained for each amount of changepoints, it
     selects one that seems suitable in terms of the 'neighbouring silhouette method': https://en.wikipedia.org/wiki/Silhouette_(clustering)
     """
-    aggregation_inside_range: Callable[[list[float]], float] = lambda self, values: sorted(values)[len(values) // 2]
-    aggregation_signal: Callable[[list[float]], float] = lambda self, values: sorted(values)[len(values) // 2]
+    aggregation_inside_range: Callable[[np.ndarray], np.ndarray] = lambda self, values: order_statistic(values, 50)
+    aggregation_signal: Callable[[np.ndarray], np.ndarray] = lambda self, values: order_statistic(values, 50)
+    # Amount of points scored for each range, sampled with a fixed seed, None to score all of them.
+    sampled_points: Optional[int] = None
+
+    def aggregated_similarities(self, kernel: Kernel, values: np.ndarray, range_values: np.ndarray) -> np.ndarray:
+        """
+        It aggregates the similarities of each value to the values of a range, computed by blocks
+        of rows with at most kernel_tile_size^2 similarities.
+        :param kernel: kernel measuring the similarities.
+        :param values: values to be compared.
+        :param range_values: values of the range.
+        :return: array with the aggregated similarity of each value.
+        """
+        rows = max(1, Constants.kernel_tile_size ** 2 // max(len(range_values), 1))
+        return np.concatenate([self.aggregation_inside_range(kernel.similarities(values[row:row + rows], range_values))
+                               for row in range(0, len(values), rows)])
+
+    def range_silhouettes(self, kernel: Kernel, signal: np.ndarray, bounds: List[int], range_index: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        It calculates the silhouette of the points of a range, comparing their similarity to the range with the
+        one to the most similar of the neighbouring ranges.
+        :param kernel: kernel measuring the similarities.
+        :param signal: values of the signal.
+        :param bounds: sorted limits of the ranges, from 0 to the length of the signal.
+        :param range_index: index of the range, which goes from bounds[range_index] to bounds[range_index + 1].
+        :param rng: random number generator used to sample the points.
+        :return: array with the silhouette of each point scored.
+        """
+        points = np.arange(bounds[range_index], bounds[range_index + 1])
+        if self.sampled_points is not None and len(points) > self.sampled_points:
+            points = np.sort(rng.choice(points, self.sampled_points, replace=False))
+        inner_similarity = self.aggregated_similarities(kernel, signal[points], signal[bounds[range_index]:bounds[range_index + 1]])
+        neighbouring_similarity = np.zeros(len(points))
+        for neighbour in [range_index - 1, range_index + 1]:
+            if 0 <= neighbour < len(bounds) - 1:
+                neighbour_similarity = self.aggregated_similarities(kernel, signal[points], signal[bounds[neighbour]:bounds[neighbour + 1]])
+                neighbouring_similarity = np.maximum(neighbouring_similarity, neighbour_similarity)
+        return (inner_similarity - neighbouring_similarity) / np.maximum(neighbouring_similarity, inner_similarity)
+
+    def aggregated_silhouette(self, signal: np.ndarray, bounds: List[int]) -> float:
+        """
+        It aggregates the silhouettes of the points of the signal for a segmentation.
+        :param signal: values of the signal.
+        :param bounds: sorted limits of the ranges, from 0 to the length of the signal.
+        :return: the aggregated silhouette.
+        """
+        kernel, rng = LaplaceKernel(), np.random.default_rng(Constants.seed)
+        silhouette = np.concatenate([self.range_silhouettes(kernel, signal, bounds, range_index, rng) for range_index in range(len(bounds) - 1)])
+        return float(self.aggregation_signal(silhouette))
+
+    def aggregated_silhouettes(self, case: Case, changepoints_values: List[List[int]]) -> List[Tuple[float, int]]:
+        """
+        It aggregates the silhouettes of the points of the signal for each segmentation but the one without changepoints.
+        With more than one worker, the segmentations are scored across a pool of processes that attach to the signal in
+        a shared memory block, and the results are collected in the order of the segmentations.
+        :param case: input case.
+        :param changepoints_values: changepoints of the segmentation for each amount of changepoints.
+        :return: a list with pairs of the aggregated silhouette and the amount of changepoints.
+        """
+        signal = np.asarray(case.signal, dtype=float)
+        bounds_values = [[0] + sorted(changepoints_values[k]) + [case.size] for k in range(1, len(changepoints_values))]
+        if self.workers <= 1 or current_process().daemon or len(bounds_values) <= 1:
+            silhouettes = [self.aggregated_silhouette(signal, bounds) for bounds in bounds_values]
+        else:
+            block, shared_signal = share_array(signal)
+            signal_layout = (block.name, shared_signal.shape, shared_signal.dtype.str)
+            del shared_signal
+            try:
+                with Pool(min(self.workers, len(bounds_values)), initializer=attach_scorer, initargs=(self, signal_layout)) as scorer_pool:
+                    silhouettes = scorer_pool.map(score_segmentation, bounds_values, chunksize=1)
+            finally:
+                block.close()
+                block.unlink()
+        return [(silhouette, k) for k, silhouette in enumerate(silhouettes, start=1)]
 
     def select_penalization(self, case: Case, cost_function: CostFunction) -> Tuple[float, int]:
-        objective_values, changepoints_values, solution_dynamic_programming, algorithm_input = obtain_solution_properties(case, cost_function, False)
+        objective_values, changepoints_values, solution_dynamic_programming, algorithm_input = obtain_solution_properties(case, cost_function, False, self.solver_type, self.result_registry)
         amount_changepoints = len(objective_values)
-        kernel = LaplaceKernel()
-        aggregated_silhouette = []
-        for k in range(1, amount_changepoints):
-            silhouette = []
-            from_indexes = [0] + list(reversed(changepoints_values[k]))
-            to_indexes = list(reversed(changepoints_values[k])) + [case.size]
-            for range_index in range(len(from_indexes)):
-                from_index, to_index = from_indexes[range_index], to_indexes[range_index]
-                for value in case.signal[from_index:to_index]:
-                    inner_similarity = self.aggregation_inside_range(
-                        [kernel.similarity(value, other_value) for other_value in case.signal[from_index:to_index]])
-                    prev_similarity, next_similarity = 0.0, 0.0
-                    if range_index > 0:
-                        prev_from, prev_to = from_indexes[range_index - 1], to_indexes[range_index - 1]
-                        prev_similarity = self.aggregation_inside_range(
-                            [kernel.similarity(value, other_value) for other_value in case.signal[prev_from:prev_to]])
-                    if range_index < len(from_indexes) - 1:
-                        next_from, next_to = from_indexes[range_index + 1], to_indexes[range_index + 1]
-                        next_similarity = self.aggregation_inside_range(
-                            [kernel.similarity(value, other_value) for other_value in case.signal[next_from:next_to]])
-                    neighbouring_similarity = max(prev_similarity, next_similarity)
-                    silhouette.append((inner_similarity - neighbouring_similarity) / max(neighbouring_similarity, inner_similarity))
-            aggregated_silhouette.append((self.aggregation_signal(silhouette), k))
+        aggregated_silhouette = self.aggregated_silhouettes(case, changepoints_values[:amount_changepoints])
         silhouette_candidates = [(silh, objective_values[k], k) for silh, k in aggregated_silhouette]
         max_silhouette = max([silh for silh, _, _ in silhouette_candidates])
         min_objective_value = min([obj for _, obj, _ in silhouette_candidates])
@@ -160,22 +293,13 @@ class SilhouettePenalizationSelector(PenalizationSelector):
                       for silh, obj, k in silhouette_candidates])[1]
         if self.visualize:
             visualize_silhouette(case, solution_dynamic_programming, [value[0] for value in aggregated_silhouette], guessed_changepoints)
-        return obtain_penalization_from_changepoints(case, algorithm_input, guessed_changepoints), guessed_changepoints
+        return obtain_penalization_from_changepoints(case, algorithm_input, guessed_changepoints, self.penalized_solver_type), guessed_changepoints
 
     def with_aggregations(self, name_inside_range: str, name_signal: str) -> PenalizationSelector:
-        aggregations = {'mean': lambda values: float(sum(values)) / float(len(values)),
-                        'median': lambda values: sorted(values)[len(values) // 2],
-                        'max': lambda values: float(max(values)),
-                        'min': lambda values: float(min(values)),
-                        'squared': lambda values: sum([float(x * x) for x in values]) / float(len(values)),
-                        'p01': lambda values: sorted(values)[1 * len(values) // 100],
-                        'p05': lambda values: sorted(values)[5 * len(values) // 100],
-                        'p10': lambda values: sorted(values)[10 * len(values) // 100],
-                        'p15': lambda values: sorted(values)[15 * len(values) // 100],
-                        'p25': lambda values: sorted(values)[25 * len(values) // 100],
-                        'p35': lambda values: sorted(values)[35 * len(values) // 100],
-                        'p75': lambda values: sorted(values)[75 * len(values) // 100],
-                        'p95': lambda values: sorted(values)[95 * len(values) // 100]}
         self.aggregation_inside_range = aggregations[name_inside_range]
         self.aggregation_signal = aggregations[name_signal]
         return self
+
+    def with_sampling(self, sampled_points: Optional[int]) -> PenalizationSelector:
+        self.sampled_points = sampled_points
+        return self
@@ -0,0 +1,244 @@
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from multiprocessing.pool import Pool as ProcessPool
+from typing import List, Optional, Tuple
+
+from cost_functions.cost_function import CostFunction, GaussianMeanCostFunction, KernelBasedCostFunction
+from process.penalization_selector import PenalizationSelector, SilhouettePenalizationSelector
+from runner.run_utils import read_case, classify_changepoints, write_metrics
+from solution.algorithm_input import AlgorithmInput
+from solution.binary_segmentation import BinarySegmentation
+from solution.chunked_segmentation import ChunkedSegmentation
+from solution.coarse_to_fine_segmentation import CoarseToFineSegmentation
+from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+from solution.optimal_partition_changepoints_in_state_functional_pruning import DynamicProgrammingChangepointsInStateFunctionalPruning
+from solution.suboptimal_partition_changepoints_in_state_vectorized_divide_and_conquer import DynamicProgrammingVectorizedDivideAndConquer
+from solution.optimal_partition_changepoints_in_state_pruned import DynamicProgrammingChangepointsInStatePruned
+from solution.optimal_partition_penalization import DynamicProgrammingPenalization
+from solution.optimal_partition_penalization_approximate import DynamicProgrammingPenalizationApproximate
+from solution.optimal_partition_penalization_functional_pruning import DynamicProgrammingPenalizationFunctionalPruning
+from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+from solution.result_registry import ResultRegistry
+from solution.seeded_binary_segmentation import SeededBinarySegmentation
+from solution.solver import Solver
+from solution.suboptimal_partition_changepoints_in_state_divide_and_conquer_optimzation import DynamicProgrammingDivideAndConquer
+from utils.constants import Constants
+
+# State of each worker process, set once by attach_batch_worker when the pool starts.
+worker_selector: Optional[PenalizationSelector] = None
+worker_result_registry: Optional[ResultRegistry] = None
+
+
+@dataclass
+class Job:
+    """ A unit of work of the batch, either the selection of the penalization of a case for a cost function,
+    when it has no solver, or the solution of the case with a solver and the selected penalization. """
+    case_id: str
+    case_type: str
+    case_size: int
+    cost_function: CostFunction
+    path: str
+    solver: Optional[Solver] = None
+    penalization: float = 0.0
+    max_amount_changepoints: int = 0
+
+    def output_prefix(self) -> str:
+        """
+        Prefix of the files written by the job, in the folder of its cost function and case type.
+        :return: the path of the files without their extension.
+        """
+        return self.path + self.case_id + ('' if self.solver is None else '_' + self.solver.name)
+
+    def expected_work(self) -> float:
+        """
+        Amount of work expected for the job, the selection running the divide and conquer solver up to sqrt(n) changepoints.
+        :return: the expected amount of range cost evaluations.
+        """
+        if self.solver is None:
+            return math.sqrt(self.case_size) * float(self.case_size) ** 2
+        return self.solver.expected_work(self.case_size, self.max_amount_changepoints)
+
+
+def write_atomically(file_path: str, content: str) -> None:
+    """
+    It writes a file through a temporary one that is then renamed, so that an interrupted job never leaves it partial.
+    :param file_path: path of the file.
+    :param content: content of the file.
+    :return: None.
+    """
+    temporary_path = file_path + '.' + str(os.getpid()) + '.tmp'
+    with open(temporary_path, 'w') as temporary_file:
+        temporary_file.write(content)
+    os.replace(temporary_path, file_path)
+
+
+def attach_batch_worker(penalization_selector: PenalizationSelector, result_registry: ResultRegistry) -> None:
+    """
+    Initializer of the worker processes, it keeps the selector and the registry shared by the jobs.
+    :param penalization_selector: selector of the penalization of each case.
+    :param result_registry: registry of the tables of the dynamic programming, on disk so that the jobs share it.
+    :return: None.
+    """
+    global worker_selector, worker_result_registry
+    worker_selector, worker_result_registry = penalization_selector, result_registry
+    worker_selector.result_registry = result_registry
+
+
+def run_job(job: Job) -> Tuple[Job, float, str]:
+    """
+    It runs a job in a worker, writing its results, which are only complete once the last file is renamed in place.
+    :param job: job to be run.
+    :return: a tuple with the job, its duration and a description of its result.
+    """
+    start_time = time.perf_counter()
+    try:
+        case = read_case(job.case_id, job.case_type)
+        if job.solver is None:
+            job.penalization, job.max_amount_changepoints = worker_selector.select_penalization(case, job.cost_function)
+            write_atomically(job.output_prefix() + '.selection', f'{job.penalization},{job.max_amount_changepoints}\n')
+            return job, time.perf_counter() - start_time, f'penalization {job.penalization:.4g}, {job.max_amount_changepoints} changepoints'
+        algorithm_input = AlgorithmInput(case=case, cost_function=job.cost_function, penalization=job.penalization,
+                                         max_amount_changepoints=job.max_amount_changepoints, result_registry=worker_result_registry)
+        algorithm_input.initialize()
+        job.solver.set_input(algorithm_input)
+        solution = job.solver.solve()
+        classify_changepoints(case, solution)
+        solution.metrics.cost_function_memory = algorithm_input.cost_function.resident_size()
+        with open(job.output_prefix() + '.metrics', 'w') as metrics_file:
+            write_metrics(algorithm_input, job.solver, metrics_file, len(solution.changepoints), solution.metrics)
+        write_atomically(job.output_prefix() + '.out', ','.join(list(map(str, sorted(solution.changepoints)))) + '\n')
+        return job, time.perf_counter() - start_time, f'{len(solution.changepoints)} changepoints'
+    except Exception as exception:
+        return job, time.perf_counter() - start_time, 'failed: ' + repr(exception)
+
+
+@dataclass
+class BatchScheduler:
+    """ Runs every solver over every case with every cost function, as independent jobs on a single pool of
+    processes kept along the whole batch. First the penalization of each case and cost function is selected, and
+    then each solver solves the case with it, the jobs of each stage being started from the longest expected one,
+    following the time complexity of its solver, so that the short ones fill the gaps at the end.
+
+    Each job writes its results under path/<cost function>/<case type>/, the selection to <case>.selection and the
+    solutions to <case>_<solver>.out and .metrics, the files that mark a job as done being renamed in place once
+    written. So an interrupted batch is resumed by running it again, which skips the jobs already done, and the
+    tables of the dynamic programming are shared among the jobs through an on disk result registry, which is only
+    cleared once every job is done. At the end, the metrics of the solvers of each case are gathered in <case>.metrics."""
+    solvers: List[Solver]
+    cost_functions: List[CostFunction]
+    case_ids: List[Tuple[str, str]]
+    penalization_selector: PenalizationSelector = field(default_factory=SilhouettePenalizationSelector)
+    path: str = Constants.batch_output_path
+    workers: Optional[int] = None
+    result_registry: ResultRegistry = field(default_factory=lambda: ResultRegistry(path=Constants.result_registry_path + 'batch/'))
+
+    def job_path(self, cost_function: CostFunction, case_type: str) -> str:
+        return self.path + cost_function.name + '/' + case_type + '/'
+
+    def selection_jobs(self) -> List[Job]:
+        """
+        Jobs selecting the penalization of every case for every cost function.
+        :return: the list of jobs, each with the penalization already selected if it was done by a previous run.
+        """
+        jobs = []
+        for case_id, case_type in self.case_ids:
+            case_size = read_case(case_id, case_type).size
+            for cost_function in self.cost_functions:
+                path = self.job_path(cost_function, case_type)
+                os.makedirs(path, exist_ok=True)
+                job = Job(case_id, case_type, case_size, cost_function, path)
+                if os.path.isfile(job.output_prefix() + '.selection'):
+                    with open(job.output_prefix() + '.selection') as selection_file:
+                        penalization, max_amount_changepoints = selection_file.readline().split(',')
+                    job.penalization, job.max_amount_changepoints = float(penalization), int(max_amount_changepoints)
+                jobs.append(job)
+        return jobs
+
+    def run_stage(self, pool: ProcessPool, jobs: List[Job], stage: str) -> List[Job]:
+        """
+        It runs the jobs not done yet, from the longest expected one, reporting each one as it finishes.
+        :param pool: pool of processes.
+        :param jobs: jobs of the stage.
+        :param stage: name of the stage, to be reported.
+        :return: the list of jobs done, with the ones of previous runs.
+        """
+        pending = sorted([job for job in jobs if not self.is_done(job)], key=lambda job: job.expected_work(), reverse=True)
+        done = [job for job in jobs if self.is_done(job)]
+        print(f'{stage}: {len(pending)} jobs to run, {len(done)} already done')
+        for finished, (job, elapsed_time, result) in enumerate(pool.imap_unordered(run_job, pending, chunksize=1), start=1):
+            print(f'{finished}/{len(pending)}'.rjust(11), job.case_id.ljust(16), job.cost_function.name.ljust(24),
+                  ('selection' if job.solver is None else job.solver.name).ljust(60), f'{elapsed_time:.3f}s'.rjust(11), result, flush=True)
+            if not result.startswith('failed'):
+                done.append(job)
+        return done
+
+    def is_done(self, job: Job) -> bool:
+        return os.path.isfile(job.output_prefix() + ('.selection' if job.solver is None else '.out'))
+
+    def gather_metrics(self, job: Job) -> None:
+        """
+        It gathers the metrics of every solver of a case and cost function in a single file, like the ones of run_solution.
+        :param job: selection job of the case and cost function.
+        :return: None.
+        """
+        lines = [','.join(list(Constants.metrics_columns)) + '\n']
+        for solver in self.solvers:
+            solver_metrics = job.output_prefix() + '_' + solver.name + '.metrics'
+            if os.path.isfile(solver_metrics):
+                with open(solver_metrics) as metrics_file:
+                    lines.append(metrics_file.readline())
+        write_atomically(job.output_prefix() + '.metrics', ''.join(lines))
+
+    def run(self) -> None:
+        """
+        It runs every job of the batch that is not done yet.
+        :return: None.
+        """
+        selection_jobs = self.selection_jobs()
+        with Pool(self.workers, initializer=attach_batch_worker, initargs=(self.penalization_selector, self.result_registry)) as pool:
+            selected = self.run_stage(pool, selection_jobs, 'selection')
+            solution_jobs = [Job(job.case_id, job.case_type, job.case_size, job.cost_function, job.path, solver, job.penalization, job.max_amount_changepoints)
+                             for job in selected for solver in self.solvers]
+            solved = self.run_stage(pool, solution_jobs, 'solution')
+        for job in selected:
+            self.gather_metrics(job)
+        if len(selected) == len(selection_jobs) and len(solved) == len(solution_jobs):
+            self.result_registry.clear()
+
+
+def all_case_ids() -> List[Tuple[str, str]]:
+    """
+    Identifiers of the generated and real cases.
+    :return: a list with pairs of the identifier and the type of each case.
+    """
+    generated = [(str(case_number).zfill(2) + '_' + case_type, 'random') for case_number in range(Constants.cases_per_type)
+                 for case_type in ['mean', 'variance', 'exponential', 'dependant']]
+    real = [(file_name[:-len('.in')], 'real') for file_name in sorted(os.listdir(Constants.real_path)) if file_name.endswith('.in')]
+    return generated + real
+
+
+def main() -> None:
+    template_input = AlgorithmInput(precompute_cache=None)
+    solvers = [BinarySegmentation(algorithm_input=template_input),
+               SeededBinarySegmentation(algorithm_input=template_input),
+               DynamicProgrammingPenalization(algorithm_input=template_input),
+               DynamicProgrammingPenalizationPruned(algorithm_input=template_input),
+               DynamicProgrammingPenalizationFunctionalPruning(algorithm_input=template_input),
+               DynamicProgrammingPenalizationApproximate(algorithm_input=template_input),
+               DynamicProgrammingChangepointsInState(algorithm_input=template_input),
+               DynamicProgrammingChangepointsInStatePruned(algorithm_input=template_input),
+               DynamicProgrammingChangepointsInStateFunctionalPruning(algorithm_input=template_input),
+               DynamicProgrammingDivideAndConquer(algorithm_input=template_input),
+               DynamicProgrammingVectorizedDivideAndConquer(algorithm_input=template_input),
+               ChunkedSegmentation(algorithm_input=template_input),
+               CoarseToFineSegmentation(algorithm_input=template_input)]
+    cost_functions = [GaussianMeanCostFunction(), KernelBasedCostFunction('laplace_kernel')]
+    penalization_selector = SilhouettePenalizationSelector().with_aggregations('median', 'median')
+    BatchScheduler(solvers, cost_functions, all_case_ids(), penalization_selector).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,42 +1,64 @@
+import os
+
 import metrics.changepoint_classifier
 from cases.case import Case
-from cost_functions.cost_function import KernelBasedCostFunction, GaussianCostFunction, ExponentialCostFunction, CostFunction
+from cost_functions.cost_function import KernelBasedCostFunction, GaussianCostFunction, ExponentialCostFunction, CostFunction, \
+    ApproximateKernelCostFunction, GaussianMeanCostFunction, ExponentialLikelihoodCostFunction
 from cost_functions.kernels import LaplaceKernel, GaussianKernel
 from process.penalization_selector import PenalizationSelector, SilhouettePenalizationSelector
 from runner.run_utils import read_case, run_solution, read_output
 from solution.algorithm_input import AlgorithmInput
 from solution.binary_segmentation import BinarySegmentation
+from solution.chunked_segmentation import ChunkedSegmentation
+from solution.coarse_to_fine_segmentation import CoarseToFineSegmentation
 from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+from solution.optimal_partition_changepoints_in_state_functional_pruning import DynamicProgrammingChangepointsInStateFunctionalPruning
+from solution.suboptimal_partition_changepoints_in_state_vectorized_divide_and_conquer import DynamicProgrammingVectorizedDivideAndConquer
 from solution.optimal_partition_changepoints_in_state_pruned import DynamicProgrammingChangepointsInStatePruned
 from solution.optimal_partition_penalization import DynamicProgrammingPenalization
+from solution.optimal_partition_penalization_approximate import DynamicProgrammingPenalizationApproximate
+from solution.optimal_partition_penalization_functional_pruning import DynamicProgrammingPenalizationFunctionalPruning
 from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+from solution.seeded_binary_segmentation import SeededBinarySegmentation
 from solution.solution import Solution
 from solution.suboptimal_partition_changepoints_in_state_divide_and_conquer_optimzation import DynamicProgrammingDivideAndConquer
 from utils.constants import Constants
 from visualization.visualization_script import visualize_solution
 
 
-def run_case(visualize_case: bool = False) -> None:
+def run_case(visualize_case: bool = False, measure_gap: bool = False) -> None:
     """
     Runs a single case.
+    :param visualize_case: whether to plot the solution of every solver.
+    :param measure_gap: whether the approximate solver also solves exactly to report its approximation gap, which takes longer.
     :return: None.
     """
     case: Case = read_case('00_mean', 'random')
     # cost_function: CostFunction = GaussianCostFunction()
+    # cost_function: CostFunction = GaussianMeanCostFunction()
     cost_function: CostFunction = KernelBasedCostFunction('laplace_kernel')
     # cost_function: CostFunction = KernelBasedCostFunction('gaussian_kernel')
     # cost_function: CostFunction = ExponentialCostFunction()
+    # cost_function: CostFunction = ExponentialLikelihoodCostFunction()
+    # cost_function: CostFunction = ApproximateKernelCostFunction(kernel=LaplaceKernel())
 
     algorithm_input = AlgorithmInput(case=case, cost_function=cost_function).initialize()
 
     solver_list = [BinarySegmentation(algorithm_input=algorithm_input),
+                   SeededBinarySegmentation(algorithm_input=algorithm_input),
                    DynamicProgrammingPenalization(algorithm_input=algorithm_input),
                    DynamicProgrammingPenalizationPruned(algorithm_input=algorithm_input),
+                   DynamicProgrammingPenalizationFunctionalPruning(algorithm_input=algorithm_input),
+                   DynamicProgrammingPenalizationApproximate(algorithm_input=algorithm_input, measure_gap=measure_gap),
                    DynamicProgrammingChangepointsInState(algorithm_input=algorithm_input),
                    DynamicProgrammingChangepointsInStatePruned(algorithm_input=algorithm_input),
-                   DynamicProgrammingDivideAndConquer(algorithm_input=algorithm_input)]
+                   DynamicProgrammingChangepointsInStateFunctionalPruning(algorithm_input=algorithm_input),
+                   DynamicProgrammingDivideAndConquer(algorithm_input=algorithm_input),
+                   DynamicProgrammingVectorizedDivideAndConquer(algorithm_input=algorithm_input),
+                   ChunkedSegmentation(algorithm_input=algorithm_input),
+                   CoarseToFineSegmentation(algorithm_input=algorithm_input)]
 
-    penalization_selector: PenalizationSelector = SilhouettePenalizationSelector(visualize=visualize_case).with_aggregations('median', 'median')
+    penalization_selector: PenalizationSelector = SilhouettePenalizationSelector(visualize=visualize_case, workers=os.cpu_count()).with_aggregations('median', 'median')
 
     run_solution(solver_list, [cost_function], case, penalization_selector)
     for solver in solver_list:
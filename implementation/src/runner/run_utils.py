@@ -1,6 +1,6 @@
 import os
 from datetime import datetime
-from typing import List, TextIO, Tuple
+from typing import List, TextIO
 
 import pandas
 
@@ -8,9 +8,10 @@ import metrics.changepoint_classifier
 from cases.case import Case, ValueMetadata
 from cost_functions.cost_function import CostFunction
 from metrics.metrics import Metrics
-from multiprocessing import Pool
 from process.penalization_selector import ElbowPenalizationSelector, SilhouettePenalizationSelector, PenalizationSelector
+from runner.solver_pool import SolverPool
 from solution.algorithm_input import AlgorithmInput
+from solution.result_registry import ResultRegistry
 from solution.solution import Solution
 from solution.solver import Solver
 from utils.constants import Constants
@@ -27,7 +28,12 @@ def write_metrics(algorithm_input: AlgorithmInput, solver: Solver, metrics_file:
         round(solution_metrics.execution_time, 9),
         solution_metrics.correct_changepoints,
         solution_metrics.incorrect_changepoints,
-        solution_metrics.not_found_changepoints
+        solution_metrics.not_found_changepoints,
+        solution_metrics.cost_function_memory,
+        solution_metrics.evaluated_candidates,
+        solution_metrics.pruned_candidates,
+        solution_metrics.approximation_gap,
+        solution_metrics.moved_changepoints
     ]
     metrics_file.write(','.join(map(str, metrics_list)) + '\n')
 
@@ -58,30 +64,42 @@ def read_output(case_id: str, case_type: str = 'random', solver_used='binary_seg
     return Solution(changepoints, Metrics(cost, solver_used, execution_time, []))
 
 
-def solve(solver: Solver) -> Tuple[Solver, Solution]:
-    return solver, solver.solve()
+def classify_changepoints(case: Case, solution: Solution) -> None:
+    """
+    It fills the metrics of the changepoints found that are close to a real one, for the generated cases whose real changepoints are known.
+    :param case: case solved.
+    :param solution: solution of the case.
+    :return: None.
+    """
+    if case.case_type == 'random':
+        with open(Constants.random_path + 'solutions/' + case.name + '.out', 'r') as real_changepoitns_file:
+            real_changepoints = list(map(int, real_changepoitns_file.readline().replace('\n', '').split(',')))
+            real_not_found_ch, found_right_ch = metrics.changepoint_classifier.real_changepoints(real_changepoints, solution.changepoints)
+            solution.metrics.correct_changepoints = len(found_right_ch)
+            solution.metrics.incorrect_changepoints = len(solution.changepoints) - len(found_right_ch)
+            solution.metrics.not_found_changepoints = len(real_not_found_ch)
 
 
 def run_solution(solvers: List[Solver], cost_functions: List[CostFunction], case: Case, penalization_selector: PenalizationSelector) -> None:
+    # The tables of the dynamic programming filled while selecting the penalization are reused by the solvers of the run.
+    result_registry = ResultRegistry(path=Constants.result_registry_path + str(os.getpid()) + '/')
+    penalization_selector.result_registry = result_registry
     for cost_function in cost_functions:
         penalization, max_amount_changepoints = penalization_selector.select_penalization(case, cost_function)
-        algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, penalization=penalization, max_amount_changepoints=max_amount_changepoints)
+        algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, penalization=penalization, max_amount_changepoints=max_amount_changepoints,
+                                         result_registry=result_registry)
         for solver in solvers:
             solver.set_input(algorithm_input)
         path = Constants.output_path + algorithm_input.case.case_type + '/'
         os.makedirs(path, exist_ok=True)
         with open(path + algorithm_input.case.name + '.metrics', 'w') as metrics_file:
             metrics_file.write(','.join(list(Constants.metrics_columns)) + '\n')
-            with Pool() as solver_pool:
-                solutions = solver_pool.imap_unordered(solve, [solver for solver in solvers])
-                for solver, solution in solutions:
-                    if case.case_type == 'random':
-                        with open(Constants.random_path + 'solutions/' + case.name + '.out', 'r') as real_changepoitns_file:
-                            real_changepoints = list(map(int, real_changepoitns_file.readline().replace('\n', '').split(',')))
-                            real_not_found_ch, found_right_ch = metrics.changepoint_classifier.real_changepoints(real_changepoints, solution.changepoints)
-                            solution.metrics.correct_changepoints = len(found_right_ch)
-                            solution.metrics.incorrect_changepoints = len(solution.changepoints) - len(found_right_ch)
-                            solution.metrics.not_found_changepoints = len(real_not_found_ch)
+            with SolverPool(solvers, algorithm_input) as solver_pool:
+                for solver, solution in solver_pool.solutions():
+                    classify_changepoints(case, solution)
+                    solution.metrics.cost_function_memory = algorithm_input.cost_function.resident_size()
                     write_metrics(algorithm_input, solver, metrics_file, len(solution.changepoints), solution.metrics)
                     with open(path + algorithm_input.case.name + '_' + solver.name + '.out', 'w') as output_file:
                         output_file.write(','.join(list(map(str, sorted(solution.changepoints)))) + '\n')
+    result_registry.clear()
+    penalization_selector.result_registry = None
@@ -0,0 +1,149 @@
+import dataclasses
+import mmap
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from multiprocessing.pool import Pool as ProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from solution.algorithm_input import AlgorithmInput
+from solution.parallel_layers import Layout, attach_array, share_array
+from solution.solution import Solution
+from solution.solver import Solver
+from utils.constants import Constants
+
+# Path, offset, shape and dtype of an array memory mapped from a file.
+MappedLayout = Tuple[str, int, Tuple[int, ...], str]
+
+# State of each worker process, set once by attach_solvers when the pool starts.
+worker_solvers: List[Solver] = []
+worker_tables_path: str = ''
+
+
+def mapped_layout(array: np.ndarray) -> Optional[MappedLayout]:
+    """
+    Layout of an array memory mapped from a whole file region, like the ones of the pre-computation cache.
+    :param array: array to be shared.
+    :return: the layout of the mapping, or None if the array is in memory or a view of a mapping.
+    """
+    if not isinstance(array, np.memmap) or not isinstance(array.base, mmap.mmap) or not array.flags.c_contiguous:
+        return None
+    if array.filename is None or not os.path.isfile(array.filename):
+        return None
+    return array.filename, array.offset, array.shape, array.dtype.str
+
+
+def attach_mapped_array(layout: MappedLayout) -> np.ndarray:
+    """
+    It memory maps again, read only, an array mapped from a file by another process.
+    :param layout: path, offset, shape and dtype of the mapping.
+    :return: the memory mapped array.
+    """
+    file_path, offset, shape, dtype = layout
+    return np.memmap(file_path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+def attach_solvers(solvers: List[Solver], algorithm_input: AlgorithmInput, cost_layouts: Dict[str, Layout], cost_mappings: Dict[str, MappedLayout],
+                   signal_layout: Layout, tables_path: str) -> None:
+    """
+    Initializer of the worker processes, it attaches the signal and the pre-computed arrays of the cost function
+    and gives the input built from them to every solver.
+    :param solvers: solvers of the run, holding no input.
+    :param algorithm_input: input whose case holds no signal and whose cost function holds no pre-computation.
+    :param cost_layouts: layout of the block of each pre-computed array held in memory, by attribute name.
+    :param cost_mappings: layout of the mapping of each pre-computed array memory mapped from a file, by attribute name.
+    :param signal_layout: layout of the block holding the values of the signal.
+    :param tables_path: folder in which the tables of the solutions are written.
+    :return: None.
+    """
+    global worker_tables_path
+    arrays = {name: attach_array(layout) for name, layout in cost_layouts.items()}
+    arrays.update({name: attach_mapped_array(layout) for name, layout in cost_mappings.items()})
+    algorithm_input.cost_function.load_precomputed_arrays(arrays)
+    algorithm_input.case = dataclasses.replace(algorithm_input.case, signal=attach_array(signal_layout))
+    for solver in solvers:
+        solver.set_input(algorithm_input)
+    worker_solvers.extend(solvers)
+    worker_tables_path = tables_path
+
+
+def solve_shared(index: int) -> Tuple[int, Solution, Optional[str]]:
+    """
+    It solves the input with one of the solvers, writing the table of the solution to a file instead of returning it.
+    :param index: position of the solver in the list of the run.
+    :return: a tuple with the index, the solution without its table and the file holding it, if there is one.
+    """
+    solution = worker_solvers[index].solve()
+    if not isinstance(solution.metrics.best_prefix, np.ndarray) or solution.metrics.best_prefix.size == 0:
+        return index, solution, None
+    table_file = os.path.join(worker_tables_path, str(index) + '.npy')
+    np.save(table_file, solution.metrics.best_prefix)
+    solution.metrics.best_prefix = np.zeros((0, 0))
+    return index, solution, table_file
+
+
+@dataclass
+class SolverPool:
+    """ Pool of processes solving the same input with several solvers. Instead of pickling every solver along its
+    input, the signal and the pre-computed arrays of the cost function held in memory are copied once to shared
+    memory blocks which the workers attach to when the pool starts, while the arrays already memory mapped from a
+    file, like the ones of the pre-computation cache, are mapped again by the workers from the same file. So only
+    the index of each solver is sent to them, and the tables of the solutions come back through files that are
+    memory mapped when read. The memory of the workers and the data transferred to them thus do not grow with the
+    amount of solvers. It is meant to be used as a context manager, which releases the blocks and the files."""
+    solvers: List[Solver]
+    algorithm_input: AlgorithmInput
+    workers: Optional[int] = None
+    blocks: List[SharedMemory] = field(default_factory=list, compare=False, hash=False, repr=False)
+    tables_path: str = field(default='', compare=False, hash=False, repr=False)
+    pool: Optional[ProcessPool] = field(default=None, compare=False, hash=False, repr=False)
+
+    def share(self, array: np.ndarray) -> Layout:
+        """
+        It copies an array to a shared memory block released along the pool.
+        :param array: array to be shared.
+        :return: the layout of the block.
+        """
+        block, shared = share_array(array)
+        self.blocks.append(block)
+        return block.name, shared.shape, shared.dtype.str
+
+    def __enter__(self) -> 'SolverPool':
+        cost_function = self.algorithm_input.cost_function
+        arrays = cost_function.precomputed_arrays()
+        cost_mappings = {name: mapped_layout(array) for name, array in arrays.items() if mapped_layout(array) is not None}
+        cost_layouts = {name: self.share(np.asarray(array)) for name, array in arrays.items() if name not in cost_mappings}
+        signal_layout = self.share(np.asarray(self.algorithm_input.case.signal, dtype=float))
+        os.makedirs(Constants.memmap_path, exist_ok=True)
+        self.tables_path = tempfile.mkdtemp(prefix='tables_', dir=Constants.memmap_path)
+        empty_input = dataclasses.replace(self.algorithm_input, case=dataclasses.replace(self.algorithm_input.case, signal=[]),
+                                          cost_function=dataclasses.replace(cost_function, **{name: np.zeros(0) for name in arrays}),
+                                          precompute_cache=None)
+        empty_solvers = [dataclasses.replace(solver, algorithm_input=AlgorithmInput(precompute_cache=None)) for solver in self.solvers]
+        self.pool = Pool(self.workers, initializer=attach_solvers, initargs=(empty_solvers, empty_input, cost_layouts, cost_mappings, signal_layout, self.tables_path))
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+        shutil.rmtree(self.tables_path, ignore_errors=True)
+
+    def solutions(self) -> Iterator[Tuple[Solver, Solution]]:
+        """
+        It solves the input with every solver, in the order in which they finish.
+        :return: an iterator of pairs with each solver and its solution, whose table is memory mapped.
+        """
+        for index, solution, table_file in self.pool.imap_unordered(solve_shared, range(len(self.solvers))):
+            if table_file is not None:
+                solution.metrics.best_prefix = np.load(table_file, mmap_mode='r')
+            yield self.solvers[index], solution
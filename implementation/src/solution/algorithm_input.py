@@ -1,7 +1,10 @@
 from dataclasses import dataclass, field
+from typing import Optional
 
 from cases.case import Case
 from cost_functions.cost_function import CostFunction, GaussianCostFunction
+from cost_functions.precompute_cache import PrecomputeCache
+from solution.result_registry import ResultRegistry
 
 @dataclass
 class AlgorithmInput:
@@ -9,6 +12,13 @@ class AlgorithmInput:
     cost_function: CostFunction = field(default_factory=GaussianCostFunction, compare=False, hash=False, repr=False)
     penalization: float = 1.0
     max_amount_changepoints: int = 50
+    # Cache used to skip pre-computations of signals already seen, None to always pre-compute.
+    precompute_cache: Optional[PrecomputeCache] = field(default_factory=PrecomputeCache, compare=False, hash=False, repr=False)
+    # Registry of the tables of the dynamic programming shared along a run, None to always fill them.
+    result_registry: Optional[ResultRegistry] = field(default=None, compare=False, hash=False, repr=False)
 
     def initialize(self):
-        self.cost_function.precompute(self.case.signal)
+        if self.precompute_cache is None:
+            self.cost_function.precompute(self.case.signal)
+        else:
+            self.precompute_cache.precompute(self.cost_function, self.case.signal)
@@ -1,6 +1,10 @@
+import heapq
+import math
 import time
 from dataclasses import dataclass
-from typing import Tuple, List
+from typing import Dict, Tuple, List, Optional
+
+import numpy as np
 
 from metrics.metrics import Metrics
 from solution.solution import Solution
@@ -11,29 +15,73 @@ from solution.solver import Solver
 class BinarySegmentation(Solver):
     """ Implementation of greedy binary segmentation Algorithm,
     expected O(n log(n)) runtime, although it has an O(n^2) worst
-    case time complexity."""
+    case time complexity.
+
+    It is iterative, the ranges that can still be split are kept in a heap ordered by the decrease of
+    the cost attained by their best split, so splits are taken best first until none of them lowers the
+    penalized cost, or until max_changepoints splits have been taken if it is given."""
     name: str = 'binary_segmentation'
+    max_changepoints: Optional[int] = None
+
+    def expected_work(self, size: int, max_amount_changepoints: int) -> float:
+        return size * math.log2(max(size, 2))
 
-    def split_cost(self, start: int, split_position: int, end: int) -> float:
-        return self.cost(start, split_position) + \
-               self.cost(split_position, end) + \
+    def split_costs(self, start: int, split_positions: np.ndarray, end: int) -> np.ndarray:
+        return self.costs(start, split_positions) + \
+               self.costs(split_positions, end) + \
                self.algorithm_input.penalization
 
-    def solve_range(self, start: int, end: int, total_cost: float, changepoints: List[int]) -> Tuple[List[int], float]:
+    def push_range(self, heap: List[Tuple[float, int, int, int]], start: int, end: int) -> None:
+        """
+        It scans all the split positions of the range at once, and pushes the best one to
+        the heap if it lowers the cost of the range.
+        :param heap: heap of (-gain, start, end, split position) of the ranges that can be split.
+        :param start: begin of the range (inclusive).
+        :param end: end of the range (exclusive).
+        :return: None.
+        """
         if start + 2 < end:
-            candidate_cost, candidate = min([(self.split_cost(start, position, end), position)
-                                             for position in range(start + 1, end - 1)])
-            if candidate_cost < self.cost(start, end):
-                changepoints_left, total_cost_left = self.solve_range(start, candidate, total_cost, changepoints)
-                changepoints_right, total_cost_right = self.solve_range(candidate, end, total_cost, changepoints)
-                changepoints.append(candidate)
-                total_cost += total_cost_left + total_cost_right + self.algorithm_input.penalization
+            positions = np.arange(start + 1, end - 1)
+            split_costs = self.split_costs(start, positions, end)
+            best = int(np.argmin(split_costs))
+            candidate_cost, candidate = split_costs[best], int(positions[best])
+            range_cost = self.cost(start, end)
+            if candidate_cost < range_cost:
+                heapq.heappush(heap, (float(candidate_cost - range_cost), start, end, candidate))
+
+    def collect_ranges(self, splits: Dict[Tuple[int, int], int], length: int) -> Tuple[List[int], float]:
+        """
+        It walks the tree of splits in post-order, giving the changepoints and total cost
+        in the same order as a recursive binary segmentation.
+        :param splits: split position of each range that has been split.
+        :param length: length of the signal.
+        :return: the list of changepoints and the total cost.
+        """
+        changepoints, totals = [], []
+        pending = [(0, length, False)]
+        while pending:
+            start, end, children_done = pending.pop()
+            candidate = splits.get((start, end))
+            if candidate is None:
+                totals.append(self.cost(start, end) if start + 2 < end else 0.0)
+            elif not children_done:
+                pending.extend([(start, end, True), (candidate, end, False), (start, candidate, False)])
             else:
-                total_cost += self.cost(start, end)
-        return changepoints, total_cost
+                total_cost_right, total_cost_left = totals.pop(), totals.pop()
+                changepoints.append(candidate)
+                totals.append(total_cost_left + total_cost_right + self.algorithm_input.penalization)
+        return changepoints, totals[0]
 
     def solve(self) -> Solution:
         start_time = time.perf_counter()
-        changepoints, cost = self.solve_range(0, len(self.algorithm_input.case.signal), 0.0, [])
+        length = len(self.algorithm_input.case.signal)
+        heap, splits = [], {}
+        self.push_range(heap, 0, length)
+        while heap and (self.max_changepoints is None or len(splits) < self.max_changepoints):
+            _, start, end, candidate = heapq.heappop(heap)
+            splits[(start, end)] = candidate
+            self.push_range(heap, start, candidate)
+            self.push_range(heap, candidate, end)
+        changepoints, cost = self.collect_ranges(splits, length)
         end_time = time.perf_counter()
         return Solution(changepoints, Metrics(cost, self.name, end_time - start_time, []))
@@ -0,0 +1,137 @@
+import dataclasses
+import time
+from dataclasses import dataclass
+from typing import List, Tuple, Type
+
+import numpy as np
+
+from cases.case import Case
+from cost_functions.cost_function import CostFunction
+from metrics.metrics import Metrics
+from solution.algorithm_input import AlgorithmInput
+from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+from solution.solution import Solution
+from solution.solver import Solver
+from utils.aux import as_channels
+from utils.constants import Constants
+
+# A window to be solved: the solver and cost function to use, the values of the window, its begin in the
+# whole signal, the penalization and the maximum amount of changepoints.
+Window = Tuple[Type[Solver], CostFunction, np.ndarray, int, float, int]
+
+
+def solve_window(window: Window) -> List[int]:
+    """
+    It pre-computes the cost function over the values of a window and solves it on its own.
+    :param window: the window to be solved.
+    :return: the sorted list of changepoints found, as positions of the whole signal.
+    """
+    solver_type, cost_function, values, begin, penalization, max_amount_changepoints = window
+    if len(values) < 2:
+        return []
+    case = Case(size=len(values), name='window_' + str(begin), signal=values)
+    algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, penalization=penalization,
+                                     max_amount_changepoints=max_amount_changepoints, precompute_cache=None)
+    algorithm_input.initialize()
+    return sorted(begin + changepoint for changepoint in solver_type(algorithm_input=algorithm_input).solve().changepoints)
+
+
+@dataclass
+class ChunkedSegmentation(Solver):
+    """ Segmentation of long signals by windows of window_size values that overlap by the given amount, each of them
+    solved on its own with the given penalized solver, so it takes the time of the solver on a window times the
+    amount of windows, which grows linearly with the length of the signal. The windows are solved serially, since
+    the runner and the batch scheduler already run each solver in a worker of their pools of processes, which
+    can not start pools of their own.
+
+    Changepoints close to the end of a window are unreliable since the solver does not see what follows, so at each
+    seam the last changepoint of the previous window before the overlap and the first changepoint of the next window
+    after it, looked for up to seam_radius values away, bound a local problem that is solved again, and the
+    changepoints of the seam are taken from it. When no changepoint is found that close, the bound is placed
+    seam_radius values away from the overlap. Each window keeps its changepoints between the seams around it.
+    The cost is computed over the whole signal, so the cost function of the input must be pre-computed on it."""
+    name: str = 'chunked_segmentation'
+    solver_type: Type[Solver] = DynamicProgrammingPenalizationPruned
+    window_size: int = Constants.chunk_window_size
+    overlap: int = Constants.chunk_overlap
+
+    def expected_work(self, size: int, max_amount_changepoints: int) -> float:
+        return float(size) * min(self.window_size, size)
+
+    def window(self, values: np.ndarray, begin: int, end: int) -> Window:
+        """
+        It builds the window of the given range, with a copy of the cost function that holds no pre-computation.
+        :param values: (n, d) array with the values of the whole signal.
+        :param begin: begin of the window (inclusive).
+        :param end: end of the window (exclusive).
+        :return: the window to be solved.
+        """
+        cost_function = self.algorithm_input.cost_function
+        empty_cost_function = dataclasses.replace(cost_function, **{name: np.zeros(0) for name in cost_function.precomputed_arrays()})
+        return self.solver_type, empty_cost_function, values[begin:end], begin, self.algorithm_input.penalization, \
+            self.algorithm_input.max_amount_changepoints
+
+    def window_bounds(self, length: int) -> List[Tuple[int, int]]:
+        """
+        It splits the signal in windows that overlap with the next one by overlap values.
+        :param length: length of the signal.
+        :return: a list with the begin (inclusive) and end (exclusive) of each window.
+        """
+        step = max(self.window_size - self.overlap, 1)
+        bounds = [(0, min(self.window_size, length))]
+        while bounds[-1][1] < length:
+            begin = bounds[-1][0] + step
+            bounds.append((begin, min(begin + self.window_size, length)))
+        return bounds
+
+    def seam_bounds(self, values: np.ndarray, previous_changepoints: List[int], next_changepoints: List[int],
+                    overlap_begin: int, overlap_end: int) -> Tuple[int, int]:
+        """
+        It bounds the local problem of the seam between two windows, the overlap and up to seam_radius values around it.
+        :param values: (n, d) array with the values of the whole signal.
+        :param previous_changepoints: sorted changepoints of the previous window.
+        :param next_changepoints: sorted changepoints of the next window.
+        :param overlap_begin: begin of the overlap of the windows (inclusive), where the next window begins.
+        :param overlap_end: end of the overlap of the windows (exclusive), where the previous window ends.
+        :return: the begin (inclusive) and end (exclusive) of the seam.
+        """
+        radius = self.seam_radius()
+        kept = [changepoint for changepoint in previous_changepoints if overlap_begin - radius <= changepoint < overlap_begin]
+        following = [changepoint for changepoint in next_changepoints if overlap_end <= changepoint <= overlap_end + radius]
+        return kept[-1] if kept else max(overlap_begin - radius, 0), following[0] if following else min(overlap_end + radius, len(values))
+
+    def seam_radius(self) -> int:
+        """
+        Distance from the overlap within which the seam looks for a changepoint to begin or end at, as long as
+        the seams do not reach each other, so that they can be solved independently.
+        :return: the radius of the seams.
+        """
+        return max((self.window_size - 2 * self.overlap) // 2, 0)
+
+    def solve_windows(self, windows: List[Window]) -> List[List[int]]:
+        """
+        It solves the windows one after the other.
+        :param windows: windows to be solved.
+        :return: the changepoints of each window, in the same order.
+        """
+        return [solve_window(window) for window in windows]
+
+    def solve(self) -> Solution:
+        start_time = time.perf_counter()
+        values = as_channels(self.algorithm_input.case.signal)
+        bounds = self.window_bounds(len(values))
+        windows_changepoints = self.solve_windows([self.window(values, begin, end) for begin, end in bounds])
+        seams = [self.seam_bounds(values, previous_changepoints, next_changepoints, overlap_begin, overlap_end)
+                 for (_, overlap_end), (overlap_begin, _), previous_changepoints, next_changepoints
+                 in zip(bounds, bounds[1:], windows_changepoints, windows_changepoints[1:])]
+        seams_changepoints = self.solve_windows([self.window(values, begin, end) for begin, end in seams])
+        seam_limits = [(0, 0)] + seams + [(len(values), len(values))]
+        changepoints = []
+        for window_changepoints, (_, core_begin), (core_end, _), seam_changepoints in \
+                zip(windows_changepoints, seam_limits, seam_limits[1:], seams_changepoints + [[]]):
+            changepoints += [changepoint for changepoint in window_changepoints if core_begin <= changepoint <= core_end] + seam_changepoints
+        changepoints = sorted(set(changepoints))
+        limits = np.array([0] + changepoints + [len(values)])
+        cost = float(self.costs(limits[:-1], limits[1:]).sum()) + self.algorithm_input.penalization * len(changepoints)
+        end_time = time.perf_counter()
+        return Solution(changepoints, Metrics(cost, self.name, end_time - start_time, []))
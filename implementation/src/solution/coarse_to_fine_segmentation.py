@@ -0,0 +1,74 @@
+import time
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from metrics.metrics import Metrics
+from solution.solution import Solution
+from solution.solver import Solver
+
+
+@dataclass
+class CoarseToFineSegmentation(Solver):
+    """ Multi-resolution version of the optimal partitioning approach, it has an O((n/b)^2 + Kb) time complexity,
+    where b is the block size and K the amount of changepoints found.
+
+    The signal is split in blocks of block_size values and the optimal partitioning is solved over the block
+    boundaries only, the cost of a range of blocks being answered by the pre-computed cost function over the values
+    they cover, so that the statistics of the blocks are never built explicitly. Then each changepoint, from
+    the first to the last, is moved to the best position within block_size values of it given the refined
+    changepoint before it and the coarse one after it. The amount of changepoints moved is reported in the metrics."""
+
+    name: str = 'coarse_to_fine_segmentation'
+    block_size: int = 16
+    moved_changepoints: int = 0
+
+    def expected_work(self, size: int, max_amount_changepoints: int) -> float:
+        return (size / self.block_size) ** 2 + max_amount_changepoints * self.block_size
+
+    def coarse_changepoints(self, length: int) -> List[int]:
+        """
+        It solves the optimal partitioning with changepoints only at the boundaries of the blocks.
+        :param length: length of the signal.
+        :return: the sorted list of coarse changepoints.
+        """
+        bounds = np.append(np.arange(0, length, self.block_size), length)
+        best_prefix, attained_best = np.zeros(len(bounds)), np.full(len(bounds), -1)
+        penalizations = np.full(len(bounds), self.algorithm_input.penalization)
+        penalizations[0] = 0.0
+        for end in range(1, len(bounds)):
+            candidates_cost = best_prefix[:end] + self.costs(bounds[:end], bounds[end]) + penalizations[:end]
+            attained_best[end] = np.argmin(candidates_cost)
+            best_prefix[end] = candidates_cost[attained_best[end]]
+        changepoints, actual = [], len(bounds) - 1
+        while attained_best[actual] > 0:
+            actual = attained_best[actual]
+            changepoints.append(int(bounds[actual]))
+        return sorted(changepoints)
+
+    def refine(self, changepoints: List[int], length: int) -> List[int]:
+        """
+        It moves each changepoint to the best position around it, between the refined previous one and the next one.
+        :param changepoints: sorted list of coarse changepoints.
+        :param length: length of the signal.
+        :return: the sorted list of refined changepoints.
+        """
+        refined, self.moved_changepoints = [], 0
+        for index, changepoint in enumerate(changepoints):
+            previous = refined[-1] if refined else 0
+            following = changepoints[index + 1] if index + 1 < len(changepoints) else length
+            positions = np.arange(max(changepoint - self.block_size, previous + 1), min(changepoint + self.block_size, following - 1) + 1)
+            best = int(positions[np.argmin(self.costs(previous, positions) + self.costs(positions, following))])
+            self.moved_changepoints += best != changepoint
+            refined.append(best)
+        return refined
+
+    def solve(self) -> Solution:
+        start_time = time.perf_counter()
+        length = len(self.algorithm_input.case.signal)
+        changepoints = self.refine(self.coarse_changepoints(length), length)
+        limits = np.array([0] + changepoints + [length])
+        cost = float(self.costs(limits[:-1], limits[1:]).sum()) + self.algorithm_input.penalization * len(changepoints)
+        end_time = time.perf_counter()
+        return Solution(changepoints, Metrics(cost, self.name, end_time - start_time, [], moved_changepoints=self.moved_changepoints))
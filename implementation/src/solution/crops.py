@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from solution.solution import Solution
+from solution.solver import Solver
+
+
+@dataclass
+class PenalizedSegmentation:
+    """ A segmentation that is optimal for every penalization
+    in [minimum_penalization, maximum_penalization]. """
+    changepoints: List[int]
+    # Cost of the segmentation without accounting the penalization of its changepoints.
+    cost: float
+    minimum_penalization: float
+    maximum_penalization: float
+
+
+def solve_with_penalization(solver: Solver, penalization: float) -> PenalizedSegmentation:
+    """
+    It solves the input of the solver with the given penalization.
+    :param solver: solver minimizing the cost plus the penalization of each changepoint.
+    :param penalization: penalization for each changepoint.
+    :return: the segmentation obtained, only known to be optimal for the given penalization.
+    """
+    solver.algorithm_input.penalization = penalization
+    solution: Solution = solver.solve()
+    return PenalizedSegmentation(sorted(solution.changepoints), solution.metrics.cost - penalization * len(solution.changepoints), penalization, penalization)
+
+
+def record_segmentation(segmentations: Dict[int, PenalizedSegmentation], segmentation: PenalizedSegmentation) -> PenalizedSegmentation:
+    """
+    It keeps a single segmentation for each amount of changepoints, the range of penalizations
+    for which it is known to be optimal being extended with the one of the new segmentation.
+    :param segmentations: segmentations found so far by amount of changepoints.
+    :param segmentation: a new segmentation.
+    :return: the segmentation kept for its amount of changepoints.
+    """
+    known = segmentations.setdefault(len(segmentation.changepoints), segmentation)
+    known.minimum_penalization = min(known.minimum_penalization, segmentation.minimum_penalization)
+    known.maximum_penalization = max(known.maximum_penalization, segmentation.maximum_penalization)
+    return known
+
+
+def crops(solver: Solver, minimum_penalization: float, maximum_penalization: float,
+          target_changepoints: Optional[int] = None) -> List[PenalizedSegmentation]:
+    """
+    Changepoints for a range of penalties (CROPS): it finds every optimal segmentation for the penalizations
+    in [minimum_penalization, maximum_penalization] with a number of runs proportional to the amount of them.
+    The optimal cost is the lower envelope of the lines cost + penalization * m of those segmentations, so given the
+    ones for penalizations a < b, their lines cross at a penalization that either is a breakpoint of the envelope or
+    gives a new segmentation in between. If a target amount of changepoints is given, only the ranges of penalizations
+    whose segmentations can have that amount are explored.
+    :param solver: solver minimizing the cost plus the penalization of each changepoint, optimally for the results to be exact.
+    :param minimum_penalization: lowest penalization of the range.
+    :param maximum_penalization: highest penalization of the range.
+    :param target_changepoints: amount of changepoints to look for, None to find every segmentation.
+    :return: the segmentations found, from the one with most changepoints to the one with fewest.
+    """
+    original_penalization = solver.algorithm_input.penalization
+    segmentations: Dict[int, PenalizedSegmentation] = {}
+    pending: List[Tuple[PenalizedSegmentation, PenalizedSegmentation]] = [
+        (record_segmentation(segmentations, solve_with_penalization(solver, minimum_penalization)),
+         record_segmentation(segmentations, solve_with_penalization(solver, maximum_penalization)))]
+    while pending:
+        many, few = pending.pop()
+        amount_many, amount_few = len(many.changepoints), len(few.changepoints)
+        if amount_many <= amount_few or (target_changepoints is not None and not amount_few <= target_changepoints <= amount_many):
+            continue
+        crossing = (few.cost - many.cost) / (amount_many - amount_few)
+        if amount_many > amount_few + 1 and many.maximum_penalization < crossing < few.minimum_penalization:
+            middle = record_segmentation(segmentations, solve_with_penalization(solver, crossing))
+            if len(middle.changepoints) not in (amount_many, amount_few):
+                pending.extend([(many, middle), (middle, few)])
+                continue
+        many.maximum_penalization = max(many.maximum_penalization, min(crossing, few.minimum_penalization))
+        few.minimum_penalization = min(few.minimum_penalization, max(crossing, many.maximum_penalization))
+    solver.algorithm_input.penalization = original_penalization
+    return [segmentations[amount] for amount in sorted(segmentations, reverse=True)]
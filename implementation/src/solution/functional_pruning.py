@@ -0,0 +1,22 @@
+import numpy as np
+
+from cost_functions.cost_function import CostFunction
+
+
+def shrink_parameter_bounds(cost_function: CostFunction, candidates: np.ndarray, end: int, slacks: np.ndarray,
+                            lower_bounds: np.ndarray, upper_bounds: np.ndarray) -> np.ndarray:
+    """
+    It intersects the parameter bounds of every candidate with the set of parameters for which it is not
+    beaten by a new candidate, the one whose total cost exceeds the one of the candidate by slacks over [candidate, end).
+    :param cost_function: cost function with functional_pruning.
+    :param candidates: array with the candidates, the begin of their last range.
+    :param end: end of the last range of every candidate (exclusive).
+    :param slacks: array with the total cost of the new candidate minus the one of each candidate.
+    :param lower_bounds: (k, d) array with the lower parameter bounds of each candidate, updated in place.
+    :param upper_bounds: (k, d) array with the upper parameter bounds of each candidate, updated in place.
+    :return: boolean array telling which candidates can still be optimal.
+    """
+    lower_range, upper_range = cost_function.parameter_bounds(candidates, end, np.maximum(slacks, 0.0))
+    np.maximum(lower_bounds, lower_range, out=lower_bounds)
+    np.minimum(upper_bounds, upper_range, out=upper_bounds)
+    return (slacks >= 0.0) & np.all(lower_bounds <= upper_bounds, axis=1)
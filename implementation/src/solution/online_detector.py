@@ -0,0 +1,144 @@
+import heapq
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from cost_functions.cost_function import CostFunction, GaussianMeanCostFunction
+from utils.constants import Constants
+
+
+@dataclass
+class OnlineDetector:
+    """ Streaming version of the pruned exact linear time (PELT) approach for the costs computed from sums
+    of statistics of the samples, like the Gaussian and exponential ones, which processes one sample at a time.
+
+    The prefix sums of the statistics, best_prefix and attained_best are kept in ring buffers of the given capacity,
+    indexed by the position modulo the capacity, together with the array of candidates that survive the pruning.
+    A changepoint is confirmed once the tracebacks of every candidate go through it, since then it is part of the
+    optimal segmentation of the signal whatever comes next, and the positions before it are no longer needed.
+    Fed a whole case, the confirmed changepoints followed by the pending ones are the result of the offline approach
+    with the same pruning constant. If no changepoint is confirmed for capacity samples, the candidates of the oldest
+    half of the buffer are discarded, which bounds the memory and work per sample although results may then differ.
+
+    Without a finite pruning constant nothing would be pruned, so no changepoint would be confirmed until the buffer
+    is full, and the detector refuses to start. By default the constant is the one of the cost function, which is 0
+    for the change in mean cost. The ones of the other costs depend on the values of the signal, so they are only
+    available once the cost function is pre-computed over values spanning the ones of the stream, or they can be
+    given directly, for example 0 for the exponential likelihood cost over a stream of positive values."""
+
+    cost_function: CostFunction = field(default_factory=GaussianMeanCostFunction)
+    penalization: float = 1.0
+    # Pruning constant of the cost function for the values the stream can take, None to take the one of the cost function.
+    pruning_constant: Optional[float] = None
+    capacity: int = Constants.online_capacity
+    changepoints: List[int] = field(default_factory=list)
+    samples: int = 0
+    # Oldest position whose values are kept in the buffers.
+    base: int = 0
+    prefix_statistics: Tuple[np.ndarray, ...] = field(default_factory=tuple, compare=False, hash=False, repr=False)
+    best_prefix: np.ndarray = field(default_factory=lambda: np.zeros(0), compare=False, hash=False, repr=False)
+    attained_best: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=int), compare=False, hash=False, repr=False)
+    candidates: np.ndarray = field(default_factory=lambda: np.zeros(1, dtype=int), compare=False, hash=False, repr=False)
+
+    def __post_init__(self):
+        if self.pruning_constant is None:
+            self.pruning_constant = self.cost_function.pruning_constant()
+        if not -Constants.infinity < self.pruning_constant < np.inf:
+            raise ValueError(f'The {self.cost_function.name} cost gives no finite pruning constant, so the detector would never confirm a changepoint '
+                             f'before holding {self.capacity} samples. Pre-compute the cost over values spanning the ones of the stream, or give the constant.')
+        self.best_prefix = np.zeros(self.capacity)
+        self.attained_best = np.full(self.capacity, -1)
+
+    def discard_before(self, position: int) -> None:
+        """
+        It discards the candidates before the given position, which becomes the oldest one kept.
+        :param position: new oldest position.
+        :return: None.
+        """
+        self.candidates = self.candidates[self.candidates >= position]
+        self.base = position
+
+    def root(self) -> int:
+        """
+        Position where the tracebacks of every candidate meet for sure, the last confirmed changepoint.
+        :return: the last confirmed changepoint, or the oldest position kept if it is later.
+        """
+        return max(self.changepoints[-1] if self.changepoints else 0, self.base)
+
+    def confirm(self) -> List[int]:
+        """
+        It walks back the tracebacks of the candidates, the latest position first, until they meet, and confirms
+        the changepoints from where they meet back to the last confirmed one. Nothing is walked while the
+        oldest candidate is the last confirmed changepoint, since every traceback can still end there.
+        :return: the new confirmed changepoints, the latest first.
+        """
+        root, end = self.root(), self.samples
+        latest_parent = int(self.attained_best[end % self.capacity])
+        if min(int(self.candidates[0]), latest_parent) <= root:
+            return []
+        pending = {int(candidate) for candidate in self.candidates[:-1]} | {latest_parent}
+        heap = [-position for position in pending]
+        heapq.heapify(heap)
+        while len(pending) > 1:
+            position = -heapq.heappop(heap)
+            pending.remove(position)
+            parent = max(int(self.attained_best[position % self.capacity]), root)
+            if parent not in pending:
+                pending.add(parent)
+                heapq.heappush(heap, -parent)
+        confirmed, position = [], pending.pop()
+        while position > root:
+            confirmed.append(position)
+            position = int(self.attained_best[position % self.capacity])
+        return confirmed
+
+    def update(self, value: Union[float, np.ndarray]) -> Optional[int]:
+        """
+        It processes a new sample of the stream.
+        :param value: the new sample, a value or an array with the value of each channel.
+        :return: the latest changepoint confirmed by this sample, if any, all of them being appended to changepoints.
+        """
+        values = np.asarray(value, dtype=float).reshape(1, -1)
+        statistics = self.cost_function.sample_statistics(values)
+        if not self.prefix_statistics:
+            self.prefix_statistics = tuple(np.zeros((self.capacity, values.shape[1])) for _ in statistics)
+        end = self.samples + 1
+        if end - self.base >= self.capacity:
+            self.discard_before(end - self.capacity // 2)
+        slot, slots = end % self.capacity, self.candidates % self.capacity
+        for prefix_statistic, statistic in zip(self.prefix_statistics, statistics):
+            prefix_statistic[slot] = prefix_statistic[self.samples % self.capacity] + statistic[0]
+        range_sums = [prefix_statistic[slot] - prefix_statistic[slots] for prefix_statistic in self.prefix_statistics]
+        candidates_cost = self.cost_function.statistics_costs(np.asarray(end - self.candidates, dtype=float), *range_sums)
+        candidates_total_cost = self.best_prefix[slots] + candidates_cost + np.where(self.candidates == 0, 0.0, self.penalization)
+        best = np.argmin(candidates_total_cost)
+        self.best_prefix[slot], self.attained_best[slot] = candidates_total_cost[best], self.candidates[best]
+        surviving = self.candidates[candidates_total_cost + self.pruning_constant <= self.best_prefix[slot] + self.penalization]
+        self.candidates, self.samples = np.append(surviving, end), end
+        confirmed = self.confirm()
+        if not confirmed:
+            return None
+        self.changepoints.extend(reversed(confirmed))
+        self.base = max(self.base, confirmed[0])
+        return confirmed[0]
+
+    def pending_changepoints(self) -> List[int]:
+        """
+        Changepoints of the optimal segmentation of the samples seen so far that are not confirmed yet,
+        they may change with the next samples.
+        :return: the sorted list of pending changepoints.
+        """
+        pending, root = [], self.root()
+        position = int(self.attained_best[self.samples % self.capacity]) if self.samples > 0 else 0
+        while position > root:
+            pending.append(position)
+            position = int(self.attained_best[position % self.capacity])
+        return list(reversed(pending))
+
+    def segmentation(self) -> List[int]:
+        """
+        Changepoints of the optimal segmentation of the samples seen so far.
+        :return: the sorted list of confirmed and pending changepoints.
+        """
+        return self.changepoints + self.pending_changepoints()
@@ -1,8 +1,13 @@
+import math
 import time
 from dataclasses import dataclass, field
-from typing import List
+from multiprocessing import current_process
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 from metrics.metrics import Metrics
+from solution.parallel_layers import ParallelLayers
 from solution.solution import Solution
 from solution.solver import Solver
 from utils.constants import Constants
@@ -15,12 +20,40 @@ class DynamicProgrammingChangepointsInState(Solver):
     In the worst case in which D = O(n), we have O(n^3) complexity.
 
     Notice that we add the penalization to the cost function so that the results among the different algorithms
-    are comparable, since adding a constant to the objective function does not change the decisions."""
+    are comparable, since adding a constant to the objective function does not change the decisions.
+
+    Both tables are contiguous (D+1)x(n+1) arrays, best_prefix[k, end] holding the best cost of [0, end)
+    with k changepoints and attained_best[k, end] the last changepoint used to attain it.
+
+    Each row is filled by layer_row from the previous one, which the subclasses override with their own layer
+    algorithm. With low_memory only the rows of every ceil(sqrt(D)) layers are kept as checkpoints, and best_prefix
+    is just the column of the whole signal. The changepoints are retrieved by recomputing with layer_row the rows
+    between two checkpoints, from the last block to the first, and following their attained_best, so the results
+    are the ones of the layer algorithm of the solver. It takes about as long as solving again but needs
+    O(n sqrt(D)) memory instead of O(nD).
+
+    With more than one worker, the endpoints of each layer are split across a pool of processes that
+    share the pre-computed arrays of the cost function and the rows (see ParallelLayers), unless the
+    solver is already running in a worker of a pool. Only the exact rows of this class are split, so the
+    subclasses with their own layer algorithm do not set parallel_rows and reject more than one worker.
+
+    With a result registry in the input, the rows already filled for the signal and the cost function by any of
+    the exact solvers, whose tables are the same, or by the same suboptimal solver are restored from it, only the remaining ones are filled and the tables are stored back
+    when they grow, so that the penalization selector and the solvers of a run fill each table once."""
 
     name: str = 'optimal_partition_changepoints_in_state'
-    best_prefix: List[List[float]] = field(default_factory=list, compare=False, hash=False, repr=False)
-    attained_best: List[List[int]] = field(default_factory=list, compare=False, hash=False, repr=False)
+    # Whether layer_row splits the endpoints of each layer across the workers of ParallelLayers.
+    parallel_rows: ClassVar[bool] = True
+    best_prefix: np.ndarray = field(default_factory=lambda: np.zeros((0, 0)), compare=False, hash=False, repr=False)
+    attained_best: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.int32), compare=False, hash=False, repr=False)
     length: int = 0
+    low_memory: bool = False
+    checkpoints: Dict[int, np.ndarray] = field(default_factory=dict, compare=False, hash=False, repr=False)
+    workers: int = 1
+    parallel_layers: Optional[ParallelLayers] = field(default=None, compare=False, hash=False, repr=False)
+
+    def expected_work(self, size: int, max_amount_changepoints: int) -> float:
+        return max(max_amount_changepoints, 1) * float(size) ** 2
 
     def retrieve_changepoints(self, changepoints_used: int) -> List[int]:
         """
@@ -29,28 +62,180 @@ class DynamicProgrammingChangepointsInState(Solver):
         :param changepoints_used: amount of changepoints in the signal for optimal solution.
         :return: The list with all the optimal changepoints calculated for the amount specified.
         """
+        if self.low_memory:
+            return self.traceback([changepoints_used])[0]
         changepoints = []
         actual = self.length - 1
         for changepoint in range(changepoints_used, 0, -1):
-            changepoints.append(self.attained_best[changepoint][actual])
-            actual = self.attained_best[changepoint][actual]
+            actual = int(self.attained_best[changepoint, actual])
+            changepoints.append(actual)
+        return changepoints
+
+    def retrieve_all_changepoints(self) -> List[List[int]]:
+        """
+        It calculates the changepoints for every amount of changepoints, in a single backward sweep with low_memory.
+        :return: a list with the optimal changepoints for each amount, from 0 to the maximum.
+        """
+        amounts = range(self.algorithm_input.max_amount_changepoints + 1)
+        return self.traceback(amounts) if self.low_memory else [self.retrieve_changepoints(k) for k in amounts]
+
+    def layer_row(self, changepoints_used: int, previous_best_prefix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        It calculates the row of the tables for one more changepoint than the previous one, both to fill the tables
+        and to recompute the rows with low_memory. The subclasses override it with their own layer algorithm.
+        :param changepoints_used: amount of changepoints of the row.
+        :param previous_best_prefix: row of best_prefix of the previous amount of changepoints.
+        :return: a pair with the rows of best_prefix and attained_best.
+        """
+        if self.parallel_layers is not None:
+            return self.parallel_layers.layer_row(previous_best_prefix)
+        best_prefix, attained_best = np.full(self.length, Constants.infinity), np.full(self.length, -2, dtype=np.int32)
+        starts = np.arange(self.length)
+        for end in range(1, self.length):
+            candidates_cost = previous_best_prefix[:end] + self.costs(starts[:end], end) + self.algorithm_input.penalization
+            attained_best[end] = np.argmin(candidates_cost)
+            best_prefix[end] = candidates_cost[attained_best[end]]
+        return best_prefix, attained_best
+
+    def checkpoint_interval(self) -> int:
+        """
+        Amount of layers between two checkpoints with low_memory.
+        :return: the square root of the maximum amount of changepoints, rounded up.
+        """
+        return max(1, math.ceil(math.sqrt(self.algorithm_input.max_amount_changepoints)))
+
+    def traceback(self, amounts: Iterable[int]) -> List[List[int]]:
+        """
+        It calculates the changepoints for the given amounts of changepoints from the checkpoints, recomputing
+        the rows of a block of layers at a time, from the last block to the first, and moving every retrieval
+        that is in one of its layers back by one changepoint following the recomputed attained_best.
+        :param amounts: amounts of changepoints to retrieve.
+        :return: a list with the optimal changepoints for each amount, in the same order.
+        """
+        amounts = list(amounts)
+        changepoints, actual = [[] for _ in amounts], [self.length - 1 for _ in amounts]
+        block_end = min(max(amounts, default=0), self.algorithm_input.max_amount_changepoints)
+        for block_start in sorted((layer for layer in self.checkpoints if layer < block_end), reverse=True):
+            row, attained_rows = self.checkpoints[block_start], {}
+            for changepoints_used in range(block_start + 1, block_end + 1):
+                row, attained_rows[changepoints_used] = self.layer_row(changepoints_used, row)
+            for changepoints_used in range(block_end, block_start, -1):
+                for index, amount in enumerate(amounts):
+                    if amount >= changepoints_used:
+                        actual[index] = int(attained_rows[changepoints_used][actual[index]])
+                        changepoints[index].append(actual[index])
+            block_end = block_start
         return changepoints
 
+    def solve_low_memory(self) -> Solution:
+        start_time = time.perf_counter()
+        self.length = self.algorithm_input.case.size + 1
+        amount_changepoints, interval = self.algorithm_input.max_amount_changepoints, self.checkpoint_interval()
+        row = self.costs(0, np.arange(self.length))
+        self.checkpoints, objective = {0: row}, [row[-1]]
+        for changepoints_used in range(1, amount_changepoints + 1):
+            row = self.layer_row(changepoints_used, row)[0]
+            if changepoints_used % interval == 0 and changepoints_used < amount_changepoints:
+                self.checkpoints[changepoints_used] = row
+            objective.append(row[-1])
+        self.best_prefix = np.array(objective)[:, None]
+        end_time = time.perf_counter()
+        return Solution(self.retrieve_changepoints(amount_changepoints),
+                        Metrics(float(self.best_prefix[amount_changepoints, -1]), self.name, end_time - start_time, self.best_prefix))
+
     def initialize(self) -> None:
         self.length = self.algorithm_input.case.size + 1  # from [0, 0) to [0,n), note that the last position is at index n-1.
-        self.best_prefix = [[Constants.infinity for end in range(self.length)] for changepoint in range(self.algorithm_input.max_amount_changepoints + 1)]
-        self.attained_best = [[-2 for end in range(self.length + 1)] for changepoint in range(self.algorithm_input.max_amount_changepoints + 1)]
-        self.best_prefix[0] = [self.cost(0, end) for end in range(self.length)]
-        self.attained_best[0] = [-1 for end in range(self.length)]
+        self.best_prefix = np.full((self.algorithm_input.max_amount_changepoints + 1, self.length), Constants.infinity)
+        self.attained_best = np.full((self.algorithm_input.max_amount_changepoints + 1, self.length), -2, dtype=np.int32)
+        self.best_prefix[0] = self.costs(0, np.arange(self.length))
+        self.attained_best[0] = -1
 
-    def solve(self) -> Solution:
+    def solve_layer(self, changepoints_used: int) -> None:
+        """
+        It fills the row of the tables for the given amount of changepoints from the previous one.
+        :param changepoints_used: amount of changepoints of the row to fill.
+        :return: None.
+        """
+        self.best_prefix[changepoints_used], self.attained_best[changepoints_used] = self.layer_row(changepoints_used, self.best_prefix[changepoints_used - 1])
+
+    def registry_name(self) -> str:
+        """
+        Name under which the tables of the solver are addressed in the result registry, shared by the exact
+        solvers since the pruned ones only skip candidates that never attain the best cost.
+        :return: the name of the tables.
+        """
+        return 'exact'
+
+    def registry_key(self) -> str:
+        """
+        Address of the tables of the solver in the result registry.
+        :return: hexadecimal digest identifying the tables.
+        """
+        return self.algorithm_input.result_registry.key(self.algorithm_input.cost_function, self.algorithm_input.case.signal, self.registry_name())
+
+    def layer_counters(self) -> Dict[str, np.ndarray]:
+        """
+        Counters of the work done by the solver in each layer, stored in the result registry along the tables so
+        that they are restored with the rows. By default there are none.
+        :return: a dictionary from the name of each counter to its array, with one value for each row of the tables.
+        """
+        return {}
+
+    def restore_layers(self) -> int:
+        """
+        It copies the first rows of the tables from the result registry, if the same solver already filled them
+        for the signal and the cost function, along the counters of those layers, which are Constants.no_data if
+        they were filled by another solver. The rows of k changepoints are shifted by k times the difference of the
+        penalizations, which does not change the decisions since every candidate of a layer is shifted alike.
+        :return: the amount of changepoints of the last row restored, 0 if none was.
+        """
+        result_registry = self.algorithm_input.result_registry
+        if result_registry is None:
+            return 0
+        tables = result_registry.load(self.registry_key())
+        if tables is None:
+            return 0
+        best_prefix, attained_best, penalization, counters = tables
+        layers = min(len(best_prefix), self.algorithm_input.max_amount_changepoints + 1)
+        self.best_prefix[:layers] = best_prefix[:layers] + (np.arange(layers) * (self.algorithm_input.penalization - penalization))[:, None]
+        self.attained_best[:layers] = attained_best[:layers]
+        for name, counter in self.layer_counters().items():
+            counter[1:layers] = counters[name][1:layers] if name in counters else Constants.no_data
+        return layers - 1
+
+    def record_layers(self, restored_layers: int) -> None:
+        """
+        It stores the tables in the result registry if it holds fewer rows than the ones filled.
+        :param restored_layers: amount of changepoints of the last row restored from the registry.
+        :return: None.
+        """
+        result_registry = self.algorithm_input.result_registry
+        if result_registry is not None and restored_layers < self.algorithm_input.max_amount_changepoints:
+            result_registry.store(self.registry_key(), self.best_prefix, self.attained_best, self.algorithm_input.penalization, self.layer_counters())
+
+    def solve_layers(self) -> Solution:
+        if self.low_memory:
+            return self.solve_low_memory()
         start_time = time.perf_counter()
         self.initialize()
         amount_changepoints = self.algorithm_input.max_amount_changepoints
-        for changepoints_used in range(1, amount_changepoints + 1):
-            for end in range(1, self.length):
-                self.best_prefix[changepoints_used][end], self.attained_best[changepoints_used][end] = min(
-                    [(self.best_prefix[changepoints_used - 1][i] + self.cost(i, end) + self.algorithm_input.penalization, i) for i in range(end)])
+        restored_layers = self.restore_layers()
+        for changepoints_used in range(restored_layers + 1, amount_changepoints + 1):
+            self.solve_layer(changepoints_used)
+        self.record_layers(restored_layers)
         end_time = time.perf_counter()
         return Solution(self.retrieve_changepoints(amount_changepoints),
-                        Metrics(self.best_prefix[amount_changepoints][self.length - 1], self.name, end_time - start_time, self.best_prefix))
+                        Metrics(float(self.best_prefix[amount_changepoints, self.length - 1]), self.name, end_time - start_time, self.best_prefix))
+
+    def solve(self) -> Solution:
+        if self.workers > 1 and not self.parallel_rows:
+            raise ValueError(f'The {self.name} solver fills each layer serially with its own algorithm, so it can not be run with {self.workers} workers.')
+        if self.workers <= 1 or current_process().daemon:
+            return self.solve_layers()
+        start_time = time.perf_counter()
+        with ParallelLayers(self.algorithm_input.cost_function, self.algorithm_input.penalization,
+                            self.algorithm_input.case.size + 1, self.workers) as self.parallel_layers:
+            solution = self.solve_layers()
+        self.parallel_layers = None
+        solution.metrics.execution_time = time.perf_counter() - start_time
+        return solution
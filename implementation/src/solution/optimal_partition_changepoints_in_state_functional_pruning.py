@@ -0,0 +1,81 @@
+from dataclasses import dataclass, field
+from typing import ClassVar, Dict, Tuple
+
+import numpy as np
+
+from solution.functional_pruning import shrink_parameter_bounds
+from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+from solution.solution import Solution
+from utils.constants import Constants
+
+
+@dataclass
+class DynamicProgrammingChangepointsInStateFunctionalPruning(DynamicProgrammingChangepointsInState):
+    """ Implementation of the pruned dynamic programming algorithm (pDPA) for the costs with
+    functional_pruning, it has an O(Dn^2) worst case time complexity, although each layer is
+    expected to take close to linear time, and it fills the whole tables like the pure approach.
+
+    In the layer of k changepoints, each candidate t is seen as a function of the parameter of its last
+    range, q_t(mu) = F_{k-1}(t) + penalization + loss([t, end), mu), and it is kept along the set of parameters
+    for which it has not been beaten by any later candidate of the same layer. When a candidate s is added,
+    q_t <= F_{k-1}(s) + penalization holds in a bounded set around the best parameter of [t, s), so the set is
+    tracked as the bounding box of the intersection of those sets and t is discarded once it becomes empty.
+    Since the per-end overhead of pruning dominates once few candidates remain, the sets are only intersected
+    when the amount of candidates doubles since the last pruning, which keeps them a superset of the exact ones.
+    The candidates pruned are strictly worse than another one for every later end, so the results are the same
+    as the ones of the pure approach. Other cost functions, or signals for which the cost does not allow
+    functional pruning, are solved without pruning."""
+
+    name: str = 'optimal_partition_changepoints_in_state_functional_pruning'
+    parallel_rows: ClassVar[bool] = False
+    evaluated_candidates: int = 0
+    pruned_candidates: int = 0
+    # Amount of candidates evaluated and pruned in each layer, restored from the result registry along the rows,
+    # Constants.no_data for the rows restored from the tables of another exact solver.
+    layer_evaluated_candidates: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64), compare=False, hash=False, repr=False)
+    layer_pruned_candidates: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64), compare=False, hash=False, repr=False)
+
+    def layer_counters(self) -> Dict[str, np.ndarray]:
+        return {'evaluated_candidates': self.layer_evaluated_candidates, 'pruned_candidates': self.layer_pruned_candidates}
+
+    def layer_row(self, changepoints_used: int, previous_best_prefix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        cost_function = self.algorithm_input.cost_function
+        if not cost_function.allows_functional_pruning():
+            return super(DynamicProgrammingChangepointsInStateFunctionalPruning, self).layer_row(changepoints_used, previous_best_prefix)
+        channels = cost_function.prefix_sum.shape[1]
+        penalization = self.algorithm_input.penalization
+        best_prefix, attained_best = np.full(self.length, Constants.infinity), np.full(self.length, -2, dtype=np.int32)
+        evaluated_candidates, pruned_candidates = 0, 0
+        candidates, alive, pruning_size = np.zeros(self.length, dtype=np.int64), 1, 2
+        lower_bounds, upper_bounds = np.full((self.length, channels), -np.inf), np.full((self.length, channels), np.inf)
+        for end in range(1, self.length):
+            alive_candidates = candidates[:alive]
+            candidates_cost = previous_best_prefix[alive_candidates] + self.costs(alive_candidates, end) + penalization
+            best = np.argmin(candidates_cost)
+            best_prefix[end], attained_best[end] = candidates_cost[best], alive_candidates[best]
+            evaluated_candidates += alive
+            if alive >= pruning_size:
+                slacks = previous_best_prefix[end] + penalization - candidates_cost
+                surviving = shrink_parameter_bounds(cost_function, alive_candidates, end, slacks, lower_bounds[:alive], upper_bounds[:alive])
+                kept = int(surviving.sum())
+                pruned_candidates += alive - kept
+                candidates[:kept], lower_bounds[:kept], upper_bounds[:kept] = \
+                    alive_candidates[surviving], lower_bounds[:alive][surviving], upper_bounds[:alive][surviving]
+                alive, pruning_size = kept, 2 * (kept + 1)
+            candidates[alive], lower_bounds[alive], upper_bounds[alive] = end, -np.inf, np.inf
+            alive += 1
+        # Assigned rather than added up, since the rows recomputed with low_memory repeat the same work.
+        self.layer_evaluated_candidates[changepoints_used], self.layer_pruned_candidates[changepoints_used] = evaluated_candidates, pruned_candidates
+        return best_prefix, attained_best
+
+    def solve(self) -> Solution:
+        self.layer_evaluated_candidates = np.zeros(self.algorithm_input.max_amount_changepoints + 1, dtype=np.int64)
+        self.layer_pruned_candidates = np.zeros(self.algorithm_input.max_amount_changepoints + 1, dtype=np.int64)
+        solution = super(DynamicProgrammingChangepointsInStateFunctionalPruning, self).solve()
+        if np.any(self.layer_evaluated_candidates < 0):
+            self.evaluated_candidates, self.pruned_candidates = Constants.no_data, Constants.no_data
+        else:
+            self.evaluated_candidates, self.pruned_candidates = int(self.layer_evaluated_candidates.sum()), int(self.layer_pruned_candidates.sum())
+        if self.algorithm_input.cost_function.allows_functional_pruning():
+            solution.metrics.evaluated_candidates, solution.metrics.pruned_candidates = self.evaluated_candidates, self.pruned_candidates
+        return solution
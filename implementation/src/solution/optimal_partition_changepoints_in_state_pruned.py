@@ -1,10 +1,10 @@
-import math
-import time
 from dataclasses import dataclass
+from typing import ClassVar, Tuple
+
+import numpy as np
 
-from metrics.metrics import Metrics
-from solution.solution import Solution
 from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+from utils.constants import Constants
 
 
 @dataclass
@@ -12,28 +12,26 @@ class DynamicProgrammingChangepointsInStatePruned(DynamicProgrammingChangepoints
     """ Implementation of Dynamic programming approach, it has
     an O(Dn^2) worst case time complexity, where D is a bound to the amount of changepoints.
     In the worst case in which K = O(n), we have O(n^3) complexity. Although it checks fewer
-    candidates than the pure approach."""
+    candidates than the pure approach.
 
-    name: str = 'optimal_partition_changepoints_in_state_pruned'
-    k_term: float = 0.0
+    In the layer of k changepoints, a candidate t is discarded at end s once F_{k-1}(t) + C(t, s) + K > F_{k-1}(s),
+    where K is the pruning constant of the cost function, since from then on s is always a strictly better last
+    changepoint of the layer, so the results are the same as the ones of the pure approach. The rule does not
+    depend on the penalization. The constants of the gaussian and exponential costs are only valid bounds for the
+    largest cost of a range, so almost nothing is pruned with them, while the additive costs (gaussian_mean,
+    exponential_likelihood on positive signals and the kernel ones) have a constant of 0."""
 
-    def initialize(self) -> None:
-        super(DynamicProgrammingChangepointsInStatePruned, self).initialize()
-        if 'gaussian' in self.algorithm_input.cost_function.name:
-            self.k_term = - math.log(self.length)
+    name: str = 'optimal_partition_changepoints_in_state_pruned'
+    parallel_rows: ClassVar[bool] = False
 
-    def solve(self) -> Solution:
-        start_time = time.perf_counter()
-        self.initialize()
-        amount_changepoints = self.algorithm_input.max_amount_changepoints
-        for changepoints_used in range(1, amount_changepoints + 1):
-            candidates = {0}
-            for end in range(1, self.length):
-                self.best_prefix[changepoints_used][end], self.attained_best[changepoints_used][end] = min(
-                    [(self.best_prefix[changepoints_used - 1][i] + self.cost(i, end) + self.algorithm_input.penalization, i) for i in candidates])
-                candidates = {i for i in candidates if
-                              self.best_prefix[changepoints_used - 1][i] + self.cost(i, end) + self.k_term <= self.best_prefix[changepoints_used][end]}
-                candidates.add(end)
-        end_time = time.perf_counter()
-        return Solution(self.retrieve_changepoints(amount_changepoints),
-                        Metrics(self.best_prefix[amount_changepoints][self.length - 1], self.name, end_time - start_time, self.best_prefix))
+    def layer_row(self, changepoints_used: int, previous_best_prefix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        k_term = self.algorithm_input.cost_function.pruning_constant()
+        best_prefix, attained_best = np.full(self.length, Constants.infinity), np.full(self.length, -2, dtype=np.int32)
+        candidates = np.array([0])
+        for end in range(1, self.length):
+            candidates_cost = previous_best_prefix[candidates] + self.costs(candidates, end)
+            candidates_total_cost = candidates_cost + self.algorithm_input.penalization
+            best = np.argmin(candidates_total_cost)
+            best_prefix[end], attained_best[end] = candidates_total_cost[best], candidates[best]
+            candidates = np.append(candidates[candidates_cost + k_term <= previous_best_prefix[end]], end)
+        return best_prefix, attained_best
@@ -2,6 +2,8 @@ import time
 from dataclasses import dataclass, field
 from typing import List
 
+import numpy as np
+
 from metrics.metrics import Metrics
 from solution.solution import Solution
 from solution.solver import Solver
@@ -13,8 +15,8 @@ class DynamicProgrammingPenalization(Solver):
     an O(n^2) worst case time complexity."""
 
     name: str = 'optimal_partition_penalization'
-    best_prefix: List[float] = field(default_factory=list, compare=False, hash=False, repr=False)
-    attained_best: List[int] = field(default_factory=list, compare=False, hash=False, repr=False)
+    best_prefix: np.ndarray = field(default_factory=lambda: np.zeros(0), compare=False, hash=False, repr=False)
+    attained_best: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=int), compare=False, hash=False, repr=False)
     length: int = 0
 
     def retrieve_changepoints(self) -> List[int]:
@@ -26,20 +28,32 @@ class DynamicProgrammingPenalization(Solver):
         changepoints = []
         actual = self.length - 1
         while self.attained_best[actual] != 0:
-            changepoints.append(self.attained_best[actual])
+            changepoints.append(int(self.attained_best[actual]))
             actual = self.attained_best[actual]
         return changepoints
 
+    def changepoint_penalizations(self) -> np.ndarray:
+        """
+        Penalization paid when using each position as the last changepoint, the
+        first position does not open a new range so it is not penalized.
+        :return: An array with the penalization for each candidate position.
+        """
+        penalizations = np.full(self.length, self.algorithm_input.penalization)
+        penalizations[0] = 0.0
+        return penalizations
+
     def initialize(self) -> None:
         self.length = self.algorithm_input.case.size + 1  # from [0, 0) to [0,n), note that the last position is at index n-1.
-        self.best_prefix = [0 for _ in range(self.length)]
-        self.attained_best = [-1 for _ in range(self.length)]
+        self.best_prefix = np.zeros(self.length)
+        self.attained_best = np.full(self.length, -1)
 
     def solve(self) -> Solution:
         start_time = time.perf_counter()
         self.initialize()
+        starts, penalizations = np.arange(self.length), self.changepoint_penalizations()
         for end in range(1, self.length):
-            self.best_prefix[end], self.attained_best[end] = min(
-                [(self.best_prefix[i] + self.cost(i, end) + (self.algorithm_input.penalization if i > 0 else 0.0), i) for i in range(end)])
+            candidates_cost = self.best_prefix[:end] + self.costs(starts[:end], end) + penalizations[:end]
+            self.attained_best[end] = np.argmin(candidates_cost)
+            self.best_prefix[end] = candidates_cost[self.attained_best[end]]
         end_time = time.perf_counter()
-        return Solution(self.retrieve_changepoints(), Metrics(self.best_prefix[self.length - 1], self.name, end_time - start_time, []))
+        return Solution(self.retrieve_changepoints(), Metrics(float(self.best_prefix[self.length - 1]), self.name, end_time - start_time, []))
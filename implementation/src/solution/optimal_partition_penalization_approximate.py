@@ -0,0 +1,64 @@
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from metrics.metrics import Metrics
+from solution.optimal_partition_penalization import DynamicProgrammingPenalization
+from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+from solution.solution import Solution
+from utils.constants import Constants
+
+
+@dataclass
+class DynamicProgrammingPenalizationApproximate(DynamicProgrammingPenalization):
+    """ Approximation of the optimal partitioning approach, it has an O(n log(n) / approximation) time complexity.
+
+    For each end only the candidates at a geometric sequence of distances are evaluated, the rounded powers of
+    (1 + approximation) together with the recent_candidates closest ones, so any previous position t is at most
+    approximation * (end - t) positions away from a candidate. The start of the signal and the last changepoint
+    attained for the previous end are evaluated as well, so once a changepoint is found it is kept exactly while
+    it remains the best one, and positions are only lost for ranges that begin away from every other choice.
+    The bound is on the positions rather than on the cost. The gap is opt-in: with measure_gap the solution is
+    also compared with the optimal one (found with PELT, outside of the measured execution time, although it
+    takes at least as long as solving exactly) and the relative excess of its cost is reported in the metrics as
+    the approximation gap, which is otherwise left empty. The approximate partition benchmark measures it for every
+    approximation, and the default one is 0.05, the largest one measured there."""
+
+    name: str = 'optimal_partition_penalization_approximate'
+    approximation: float = 0.05
+    recent_candidates: int = 16
+    measure_gap: bool = False
+
+    def expected_work(self, size: int, max_amount_changepoints: int) -> float:
+        return size * math.log(max(size, 2)) / self.approximation
+
+    def candidate_distances(self) -> np.ndarray:
+        """
+        Distances from the end of the range to the candidates evaluated for it.
+        :return: the sorted array of distances, up to the length of the signal.
+        """
+        amount_powers = int(math.log(self.length) / math.log(1.0 + self.approximation)) + 2
+        powers = np.ceil((1.0 + self.approximation) ** np.arange(amount_powers)).astype(int)
+        return np.union1d(powers[powers < self.length], np.arange(1, min(self.recent_candidates, self.length - 1) + 1))
+
+    def solve(self) -> Solution:
+        start_time = time.perf_counter()
+        self.initialize()
+        distances, penalizations = self.candidate_distances(), self.changepoint_penalizations()
+        evaluated_candidates = 0
+        for end in range(1, self.length):
+            reachable = np.searchsorted(distances, end)
+            candidates = np.concatenate(([0, max(int(self.attained_best[end - 1]), 0)], end - distances[:reachable]))
+            candidates_cost = self.best_prefix[candidates] + self.costs(candidates, end) + penalizations[candidates]
+            best = np.argmin(candidates_cost)
+            self.best_prefix[end], self.attained_best[end] = candidates_cost[best], candidates[best]
+            evaluated_candidates += len(candidates)
+        end_time = time.perf_counter()
+        cost = float(self.best_prefix[self.length - 1])
+        solution = Solution(self.retrieve_changepoints(), Metrics(cost, self.name, end_time - start_time, [], evaluated_candidates=evaluated_candidates))
+        if self.measure_gap:
+            optimal_cost = DynamicProgrammingPenalizationPruned(algorithm_input=self.algorithm_input).solve().metrics.cost
+            solution.metrics.approximation_gap = (cost - optimal_cost) / max(abs(optimal_cost), Constants.epsilon)
+        return solution
@@ -0,0 +1,57 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from metrics.metrics import Metrics
+from solution.functional_pruning import shrink_parameter_bounds
+from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+from solution.solution import Solution
+
+
+@dataclass
+class DynamicProgrammingPenalizationFunctionalPruning(DynamicProgrammingPenalizationPruned):
+    """ Implementation of the functional pruning optimal partitioning approach (FPOP)
+    for the costs with functional_pruning, it has an O(n^2) worst case time complexity, although
+    it is expected to be O(n log(n)) regardless of the amount of changepoints.
+
+    Each candidate t is seen as a function of the parameter of its last range, for the change in mean cost
+    q_t(mu) = F(t) + penalization + sum((x_i - mu)^2), and it is kept along the set of parameters for which
+    it has not been beaten by any later candidate. When a candidate s is added, q_t <= F(s) + penalization
+    holds in a ball around the mean of [t, s) (an interval around the rate for the exponential likelihood cost),
+    so the set is tracked as the bounding box of the intersection of those sets, stored in arrays alongside
+    the candidates, and t is discarded once it becomes empty.
+    Since those sets only shrink as new candidates are added, the results are the same as the ones of the
+    pure approach. Other cost functions, or signals for which the cost does not allow functional pruning,
+    are solved with inequality pruning only."""
+
+    name: str = 'optimal_partition_penalization_functional_pruning'
+
+    def solve(self) -> Solution:
+        cost_function = self.algorithm_input.cost_function
+        if not cost_function.allows_functional_pruning():
+            return super(DynamicProgrammingPenalizationFunctionalPruning, self).solve()
+        start_time = time.perf_counter()
+        candidates, alive = self.initialize(), 1
+        channels = cost_function.prefix_sum.shape[1]
+        lower_bounds, upper_bounds = np.full((self.length, channels), -np.inf), np.full((self.length, channels), np.inf)
+        penalizations = self.changepoint_penalizations()
+        penalization = self.algorithm_input.penalization
+        for end in range(1, self.length):
+            alive_candidates = candidates[:alive]
+            candidates_total_cost = self.best_prefix[alive_candidates] + self.costs(alive_candidates, end) + penalizations[alive_candidates]
+            best = np.argmin(candidates_total_cost)
+            self.best_prefix[end], self.attained_best[end] = candidates_total_cost[best], alive_candidates[best]
+            slacks = self.best_prefix[end] + penalization - candidates_total_cost
+            surviving = shrink_parameter_bounds(cost_function, alive_candidates, end, slacks, lower_bounds[:alive], upper_bounds[:alive])
+            kept = int(surviving.sum())
+            self.evaluated_candidates += alive
+            self.pruned_candidates += alive - kept
+            candidates[:kept], lower_bounds[:kept], upper_bounds[:kept] = \
+                alive_candidates[surviving], lower_bounds[:alive][surviving], upper_bounds[:alive][surviving]
+            candidates[kept], lower_bounds[kept], upper_bounds[kept] = end, -np.inf, np.inf
+            alive = kept + 1
+        end_time = time.perf_counter()
+        return Solution(self.retrieve_changepoints(),
+                        Metrics(float(self.best_prefix[self.length - 1]), self.name, end_time - start_time, [],
+                                evaluated_candidates=self.evaluated_candidates, pruned_candidates=self.pruned_candidates))
@@ -1,7 +1,8 @@
-import math
 import time
 from dataclasses import dataclass
 
+import numpy as np
+
 from metrics.metrics import Metrics
 from solution.solution import Solution
 from solution.optimal_partition_penalization import DynamicProgrammingPenalization
@@ -9,26 +10,48 @@ from solution.optimal_partition_penalization import DynamicProgrammingPenalizati
 
 @dataclass
 class DynamicProgrammingPenalizationPruned(DynamicProgrammingPenalization):
-    """ Implementation of Dynamic programming approach, it has
-    an O(n^2) worst case time complexity, although it checks fewer
-    candidates than the pure approach."""
+    """ Implementation of the pruned exact linear time (PELT) approach, it has
+    an O(n^2) worst case time complexity, although it is expected to be linear
+    when the amount of changepoints grows with the length of the signal.
+
+    A candidate t is discarded at end s once F(t) + C(t, s) + K > F(s), where K is the pruning
+    constant of the cost function, since from then on s is always a strictly better last changepoint,
+    so the results are the same as the ones of the pure approach. The surviving candidates are kept
+    sorted in an index array that is compacted in place at each step.
+
+    The speedup depends on K: the additive costs (gaussian_mean, exponential_likelihood on positive signals and the
+    kernel ones) have K = 0, while for the gaussian and exponential costs, which are normalized by the length of the
+    range, the only valid constant found is a bound on the largest cost of a range (range^2 / 4 and 1 / min(signal)),
+    which is too loose for any candidate to be pruned on the generated cases, so they take quadratic time."""
 
     name: str = 'optimal_partition_penalization_pruned'
     k_term: float = 0.0
+    evaluated_candidates: int = 0
+    pruned_candidates: int = 0
 
-    def initialize(self) -> set[int]:
+    def initialize(self) -> np.ndarray:
         super(DynamicProgrammingPenalizationPruned, self).initialize()
-        if 'gaussian' in self.algorithm_input.cost_function.name:
-            self.k_term = - math.log(self.length)
-        return {0}
+        self.k_term = self.algorithm_input.cost_function.pruning_constant()
+        self.evaluated_candidates, self.pruned_candidates = 0, 0
+        return np.zeros(self.length, dtype=int)
 
     def solve(self) -> Solution:
         start_time = time.perf_counter()
-        candidates = self.initialize()
+        candidates, alive = self.initialize(), 1
+        penalizations = self.changepoint_penalizations()
+        penalization = self.algorithm_input.penalization
         for end in range(1, self.length):
-            self.best_prefix[end], self.attained_best[end] = min(
-                [(self.best_prefix[i] + self.cost(i, end) + (self.algorithm_input.penalization if i > 0 else 0.0), i) for i in candidates])
-            candidates = {i for i in candidates if self.best_prefix[i] + self.cost(i, end) + self.k_term <= self.best_prefix[end]}
-            candidates.add(end)
+            alive_candidates = candidates[:alive]
+            candidates_total_cost = self.best_prefix[alive_candidates] + self.costs(alive_candidates, end) + penalizations[alive_candidates]
+            best = np.argmin(candidates_total_cost)
+            self.best_prefix[end], self.attained_best[end] = candidates_total_cost[best], alive_candidates[best]
+            surviving = alive_candidates[candidates_total_cost + self.k_term <= self.best_prefix[end] + penalization]
+            self.evaluated_candidates += alive
+            self.pruned_candidates += alive - len(surviving)
+            candidates[:len(surviving)] = surviving
+            candidates[len(surviving)] = end
+            alive = len(surviving) + 1
         end_time = time.perf_counter()
-        return Solution(self.retrieve_changepoints(), Metrics(self.best_prefix[self.length - 1], self.name, end_time - start_time, []))
+        return Solution(self.retrieve_changepoints(),
+                        Metrics(float(self.best_prefix[self.length - 1]), self.name, end_time - start_time, [],
+                                evaluated_candidates=self.evaluated_candidates, pruned_candidates=self.pruned_candidates))
@@ -0,0 +1,143 @@
+import dataclasses
+import math
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from multiprocessing.pool import Pool as ProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cost_functions.cost_function import CostFunction
+from utils.constants import Constants
+
+# Name, shape and dtype of a shared memory block holding an array.
+Layout = Tuple[str, Tuple[int, ...], str]
+
+# State of each worker process, set once by attach_worker when the pool starts.
+worker_blocks: List[SharedMemory] = []
+worker_rows: Dict[str, np.ndarray] = {}
+worker_cost_function: Optional[CostFunction] = None
+worker_penalization: float = 0.0
+
+
+def share_array(array: np.ndarray) -> Tuple[SharedMemory, np.ndarray]:
+    """
+    It copies an array to a new shared memory block.
+    :param array: array to be shared.
+    :return: a pair with the block and the array backed by it.
+    """
+    block = SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[...] = array
+    return block, shared
+
+
+def attach_array(layout: Layout) -> np.ndarray:
+    """
+    It attaches to a shared memory block created by another process, kept open while the worker lives.
+    :param layout: name, shape and dtype of the block.
+    :return: the array backed by the block.
+    """
+    block_name, shape, dtype = layout
+    block = SharedMemory(name=block_name)
+    worker_blocks.append(block)
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def attach_worker(cost_function: CostFunction, penalization: float, cost_layouts: Dict[str, Layout], row_layouts: Dict[str, Layout]) -> None:
+    """
+    Initializer of the worker processes, it attaches the pre-computed arrays of the cost function and the rows.
+    :param cost_function: cost function holding no pre-computation.
+    :param penalization: penalization for each changepoint.
+    :param cost_layouts: layout of the block of each pre-computed array, by attribute name.
+    :param row_layouts: layout of the block of the previous row and of the rows to be filled.
+    :return: None.
+    """
+    global worker_cost_function, worker_penalization
+    cost_function.load_precomputed_arrays({name: attach_array(layout) for name, layout in cost_layouts.items()})
+    worker_rows.update({name: attach_array(layout) for name, layout in row_layouts.items()})
+    worker_cost_function, worker_penalization = cost_function, penalization
+
+
+def solve_endpoints(endpoints: Tuple[int, int]) -> None:
+    """
+    It fills the rows in place for a range of endpoints, each of them only depending on the previous row.
+    :param endpoints: begin (inclusive) and end (exclusive) of the range of endpoints.
+    :return: None.
+    """
+    previous_best_prefix, best_prefix, attained_best = worker_rows['previous_best_prefix'], worker_rows['best_prefix'], worker_rows['attained_best']
+    starts = np.arange(endpoints[1])
+    for end in range(max(endpoints[0], 1), endpoints[1]):
+        candidates_cost = previous_best_prefix[:end] + worker_cost_function.range_costs(starts[:end], end) + worker_penalization
+        attained_best[end] = np.argmin(candidates_cost)
+        best_prefix[end] = candidates_cost[attained_best[end]]
+
+
+@dataclass
+class ParallelLayers:
+    """ Evaluation of the layers of the dynamic programming across a pool of processes. Every endpoint of a layer
+    only depends on the previous row, so the endpoints are split in ranges that take about the same work, the one of
+    an endpoint being proportional to its position, and there are a few of them for each worker to balance the load.
+
+    The pre-computed arrays of the cost function, the previous row and the rows being filled live in shared memory
+    blocks, which the workers attach to once when the pool starts, so only the ranges of endpoints are sent to them
+    and they write their results in place. It is meant to be used as a context manager, which releases the blocks."""
+    cost_function: CostFunction
+    penalization: float
+    length: int
+    workers: int
+    ranges_per_worker: int = 4
+    blocks: List[SharedMemory] = field(default_factory=list, compare=False, hash=False, repr=False)
+    rows: Dict[str, np.ndarray] = field(default_factory=dict, compare=False, hash=False, repr=False)
+    pool: Optional[ProcessPool] = field(default=None, compare=False, hash=False, repr=False)
+
+    def share(self, array: np.ndarray) -> Tuple[np.ndarray, Layout]:
+        """
+        It copies an array to a shared memory block released along the engine.
+        :param array: array to be shared.
+        :return: a pair with the array backed by the block and its layout.
+        """
+        block, shared = share_array(array)
+        self.blocks.append(block)
+        return shared, (block.name, shared.shape, shared.dtype.str)
+
+    def endpoint_ranges(self) -> List[Tuple[int, int]]:
+        """
+        It splits the endpoints in ranges with about the same work, the first i of k ranges ending at length * sqrt(i / k).
+        :return: a list with the begin (inclusive) and end (exclusive) of each range.
+        """
+        amount = self.workers * self.ranges_per_worker
+        limits = sorted({int(round(self.length * math.sqrt(index / amount))) for index in range(amount + 1)})
+        return list(zip(limits[:-1], limits[1:]))
+
+    def __enter__(self) -> 'ParallelLayers':
+        cost_layouts, row_layouts = {}, {}
+        for name, array in self.cost_function.precomputed_arrays().items():
+            _, cost_layouts[name] = self.share(np.asarray(array))
+        for name, array in [('previous_best_prefix', np.zeros(self.length)), ('best_prefix', np.full(self.length, Constants.infinity)),
+                            ('attained_best', np.full(self.length, -2, dtype=np.int32))]:
+            self.rows[name], row_layouts[name] = self.share(array)
+        empty_cost_function = dataclasses.replace(self.cost_function, **{name: np.zeros(0) for name in cost_layouts})
+        self.pool = Pool(self.workers, initializer=attach_worker, initargs=(empty_cost_function, self.penalization, cost_layouts, row_layouts))
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+        self.rows.clear()
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+    def layer_row(self, previous_best_prefix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        It calculates the row of the tables for one more changepoint than the previous one.
+        :param previous_best_prefix: row of best_prefix of the previous amount of changepoints.
+        :return: a pair with the rows of best_prefix and attained_best.
+        """
+        self.rows['previous_best_prefix'][:] = previous_best_prefix
+        self.pool.map(solve_endpoints, self.endpoint_ranges(), chunksize=1)
+        return self.rows['best_prefix'].copy(), self.rows['attained_best'].copy()
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import shutil
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cost_functions.cost_function import CostFunction
+from utils.aux import as_channels
+from utils.constants import Constants
+
+
+@dataclass
+class ResultRegistry:
+    """
+    On disk registry of the tables of the dynamic programming over the amount of changepoints, shared by the
+    penalization selector and the solvers of a run, which may live in different processes. The tables are
+    addressed by the content of the signal, the parameters of the cost function and the name of the tables,
+    shared by the exact solvers, while each suboptimal solver fills different ones. Each entry is a folder with one sub-folder for each amount
+    of layers stored, holding best_prefix, attained_best, the penalization they were computed with and the counters
+    of the work done in each layer by the solver as .npy files, which are memory mapped back when loaded.
+    """
+    path: str = Constants.result_registry_path
+
+    def key(self, cost_function: CostFunction, signal: List[float], solver_name: str) -> str:
+        """
+        Content address of the tables of a solver over a signal.
+        :param cost_function: cost function used, its representation holds its parameters.
+        :param signal: problem input signal.
+        :param solver_name: name of the tables, the one of the solver filling them unless it is exact.
+        :return: hexadecimal digest identifying the tables.
+        """
+        values = np.ascontiguousarray(as_channels(signal))
+        digest = hashlib.sha256(repr(cost_function).encode())
+        digest.update(solver_name.encode())
+        digest.update(str(values.shape).encode())
+        digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray, float, Dict[str, np.ndarray]]]:
+        """
+        Memory maps the tables with the most layers stored for the key.
+        :param key: address of the tables.
+        :return: a tuple with best_prefix, attained_best, the penalization and a dictionary from the name of each
+        counter to its values by layer, or None if the key is not stored.
+        """
+        entry = os.path.join(self.path, key)
+        if not os.path.isdir(entry):
+            return None
+        layers = [int(name) for name in os.listdir(entry) if name.isdigit()]
+        if not layers:
+            return None
+        folder = os.path.join(entry, str(max(layers)))
+        tables = ['best_prefix.npy', 'attained_best.npy', 'penalization.npy']
+        counters = {file_name[:-len('.npy')]: np.load(os.path.join(folder, file_name), mmap_mode='r')
+                    for file_name in os.listdir(folder) if file_name.endswith('.npy') and file_name not in tables}
+        return (np.load(os.path.join(folder, 'best_prefix.npy'), mmap_mode='r'), np.load(os.path.join(folder, 'attained_best.npy'), mmap_mode='r'),
+                float(np.load(os.path.join(folder, 'penalization.npy'))), counters)
+
+    def store(self, key: str, best_prefix: np.ndarray, attained_best: np.ndarray, penalization: float,
+              counters: Optional[Dict[str, np.ndarray]] = None) -> None:
+        """
+        Stores the tables, written in a temporary folder that is then renamed so that concurrent readers never see
+        a partial entry. Tables with fewer layers than the ones already stored are kept too, although never loaded.
+        :param key: address of the tables.
+        :param best_prefix: table of the best cost of each prefix, by amount of changepoints.
+        :param attained_best: table of the last changepoint attaining it.
+        :param penalization: penalization for each changepoint included in best_prefix.
+        :param counters: a dictionary from the name of each counter of the solver to its values by layer.
+        :return: None.
+        """
+        entry = os.path.join(self.path, key)
+        folder, temporary_folder = os.path.join(entry, str(len(best_prefix))), os.path.join(entry, str(len(best_prefix)) + '.' + str(os.getpid()) + '.tmp')
+        if os.path.isdir(folder):
+            return
+        os.makedirs(temporary_folder, exist_ok=True)
+        np.save(os.path.join(temporary_folder, 'best_prefix.npy'), best_prefix)
+        np.save(os.path.join(temporary_folder, 'attained_best.npy'), attained_best)
+        np.save(os.path.join(temporary_folder, 'penalization.npy'), np.array(penalization))
+        for name, counter in (counters or {}).items():
+            np.save(os.path.join(temporary_folder, name + '.npy'), counter)
+        try:
+            os.rename(temporary_folder, folder)
+        except OSError:
+            shutil.rmtree(temporary_folder, ignore_errors=True)
+
+    def clear(self) -> None:
+        """
+        Removes every entry of the registry.
+        :return: None.
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,95 @@
+import bisect
+import math
+import time
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from metrics.metrics import Metrics
+from solution.binary_segmentation import BinarySegmentation
+from solution.solution import Solution
+from utils.constants import Constants
+
+
+@dataclass
+class SeededBinarySegmentation(BinarySegmentation):
+    """ Implementation of seeded binary segmentation, it has an O(n log(n)) time complexity.
+
+    Instead of splitting recursively, the best split of a fixed set of intervals is found: at scale k there
+    are 2 * ceil((1 / decay)^(k - 1)) - 1 intervals of length n * decay^(k - 1), evenly spread (or at random starts
+    taken with Constants.seed), so each scale covers the signal about twice and the intervals of a scale are all
+    evaluated at once. Then the splits whose gain exceeds the penalization are taken, either the one of the
+    narrowest interval first (narrowest over threshold) or the one with the largest gain first (greedy),
+    discarding the intervals that contain a changepoint already taken.
+    Unlike the recursive approach, short ranges between long ones are still found by the narrow intervals."""
+    name: str = 'seeded_binary_segmentation'
+    decay: float = 0.5
+    minimum_length: int = 2
+    random_intervals: bool = False
+    selection: str = 'narrowest'
+
+    def intervals(self, length: int) -> List[Tuple[np.ndarray, int]]:
+        """
+        It gives the intervals to be evaluated grouped by scale, all the intervals of a scale having the same length.
+        :param length: length of the signal.
+        :return: a list with the array of starts and the length of the intervals of each scale.
+        """
+        scales, generator = [], np.random.default_rng(Constants.seed)
+        amount_scales = int(math.log(length / self.minimum_length, 1.0 / self.decay)) + 1 if length >= self.minimum_length else 0
+        for scale in range(amount_scales):
+            interval_length = max(int(math.ceil(length * self.decay ** scale)), self.minimum_length)
+            amount = 2 * int(math.ceil((1.0 / self.decay) ** scale)) - 1
+            if self.random_intervals:
+                starts = generator.integers(0, length - interval_length + 1, amount)
+            else:
+                starts = np.round(np.linspace(0, length - interval_length, amount)).astype(int)
+            scales.append((np.unique(starts), interval_length))
+        return scales
+
+    def best_splits(self, starts: np.ndarray, interval_length: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        It scans all the split positions of the intervals of a scale at once.
+        :param starts: begin of the intervals (inclusive).
+        :param interval_length: length of every interval.
+        :return: a pair of arrays with the cost decrease of the best split of every interval and its position.
+        """
+        ends = starts + interval_length
+        positions = starts[:, None] + np.arange(1, interval_length)
+        split_costs = self.costs(starts[:, None], positions) + self.costs(positions, ends[:, None])
+        best = np.argmin(split_costs, axis=1)
+        rows = np.arange(len(starts))
+        return self.costs(starts, ends) - split_costs[rows, best], positions[rows, best]
+
+    def select_changepoints(self, starts: np.ndarray, ends: np.ndarray, gains: np.ndarray, splits: np.ndarray) -> List[int]:
+        """
+        It takes the splits of the intervals in the order given by the selection, skipping the intervals
+        that contain a changepoint already taken.
+        :param starts: begin of the intervals (inclusive).
+        :param ends: end of the intervals (exclusive).
+        :param gains: cost decrease of the best split of each interval.
+        :param splits: position of the best split of each interval.
+        :return: the sorted list of changepoints.
+        """
+        above_threshold = gains > self.algorithm_input.penalization
+        starts, ends, gains, splits = starts[above_threshold], ends[above_threshold], gains[above_threshold], splits[above_threshold]
+        order = np.lexsort((-gains, ends - starts)) if self.selection == 'narrowest' else np.lexsort((ends - starts, -gains))
+        changepoints = []
+        for interval in order:
+            if self.max_changepoints is not None and len(changepoints) >= self.max_changepoints:
+                break
+            following = bisect.bisect_right(changepoints, starts[interval])
+            if following == len(changepoints) or changepoints[following] >= ends[interval]:
+                bisect.insort(changepoints, int(splits[interval]))
+        return changepoints
+
+    def solve(self) -> Solution:
+        start_time = time.perf_counter()
+        length = len(self.algorithm_input.case.signal)
+        evaluated_intervals = [(starts, starts + interval_length) + self.best_splits(starts, interval_length)
+                               for starts, interval_length in self.intervals(length)]
+        changepoints = self.select_changepoints(*map(np.concatenate, zip(*evaluated_intervals))) if evaluated_intervals else []
+        bounds = np.array([0] + changepoints + [length])
+        cost = float(self.costs(bounds[:-1], bounds[1:]).sum()) + self.algorithm_input.penalization * len(changepoints)
+        end_time = time.perf_counter()
+        return Solution(changepoints, Metrics(cost, self.name, end_time - start_time, []))
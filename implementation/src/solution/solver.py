@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
 
 from solution.algorithm_input import AlgorithmInput
 from solution.solution import Solution
@@ -20,5 +23,18 @@ class Solver:
         :return: A tuple with a list with the indices in the signal where the changepoints are predicted, and the associated cost.
         """
 
+    def expected_work(self, size: int, max_amount_changepoints: int) -> float:
+        """
+        Amount of work expected to solve an input, following the time complexity of the solver, used to schedule the
+        longest runs first. Only the order of magnitude is meaningful, the constants of each solver are not accounted.
+        :param size: length of the signal.
+        :param max_amount_changepoints: bound to the amount of changepoints of the input.
+        :return: the expected amount of range cost evaluations.
+        """
+        return float(size) ** 2
+
     def cost(self, start: int, end: int) -> float:
         return self.algorithm_input.cost_function.range_cost(start, end)
+
+    def costs(self, starts: Union[int, np.ndarray], ends: Union[int, np.ndarray]) -> np.ndarray:
+        return self.algorithm_input.cost_function.range_costs(starts, ends)
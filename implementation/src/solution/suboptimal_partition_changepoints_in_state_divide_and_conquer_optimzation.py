@@ -1,9 +1,10 @@
-import time
 from dataclasses import dataclass
+from typing import ClassVar, Tuple
+
+import numpy as np
 
-from metrics.metrics import Metrics
 from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
-from solution.solution import Solution
+from utils.constants import Constants
 
 
 @dataclass
@@ -13,23 +14,24 @@ class DynamicProgrammingDivideAndConquer(DynamicProgrammingChangepointsInState):
     In the worst case in which D = O(n), we have O(n^3) complexity."""
 
     name: str = 'suboptimal_partition_divide_and_conquer'
+    parallel_rows: ClassVar[bool] = False
+
+    def registry_name(self) -> str:
+        return self.name
 
-    def calculate_range(self, changepoints: int, begin_endpoint: int, finish_endpoint: int, begin_search: int, finish_search: int) -> None:
+    def calculate_range(self, previous_best_prefix: np.ndarray, best_prefix: np.ndarray, attained_best: np.ndarray,
+                        begin_endpoint: int, finish_endpoint: int, begin_search: int, finish_search: int) -> None:
         middle_endpoint = (begin_endpoint + finish_endpoint) // 2
-        self.best_prefix[changepoints][middle_endpoint], self.attained_best[changepoints][middle_endpoint] = \
-            min([(self.best_prefix[changepoints - 1][i] + self.cost(i, middle_endpoint) + self.algorithm_input.penalization, i)
-                 for i in range(begin_search, min(middle_endpoint + 1, finish_search))])
+        candidates = np.arange(begin_search, min(middle_endpoint + 1, finish_search))
+        candidates_cost = previous_best_prefix[candidates] + self.costs(candidates, middle_endpoint) + self.algorithm_input.penalization
+        best = np.argmin(candidates_cost)
+        best_prefix[middle_endpoint], attained_best[middle_endpoint] = candidates_cost[best], candidates[best]
         if middle_endpoint > begin_endpoint:
-            self.calculate_range(changepoints, begin_endpoint, middle_endpoint, begin_search, self.attained_best[changepoints][middle_endpoint] + 1)
+            self.calculate_range(previous_best_prefix, best_prefix, attained_best, begin_endpoint, middle_endpoint, begin_search, int(attained_best[middle_endpoint]) + 1)
         if middle_endpoint + 1 < finish_endpoint:
-            self.calculate_range(changepoints, middle_endpoint + 1, finish_endpoint, self.attained_best[changepoints][middle_endpoint], finish_search)
-
-    def solve(self) -> Solution:
-        start_time = time.perf_counter()
-        self.initialize()
-        amount_changepoints = self.algorithm_input.max_amount_changepoints
-        for changepoint_used in range(1, amount_changepoints + 1):
-            self.calculate_range(changepoint_used, 0, self.length, 0, self.length)
-        end_time = time.perf_counter()
-        return Solution(self.retrieve_changepoints(amount_changepoints),
-                        Metrics(self.best_prefix[amount_changepoints][self.length - 1], self.name, end_time - start_time, self.best_prefix))
+            self.calculate_range(previous_best_prefix, best_prefix, attained_best, middle_endpoint + 1, finish_endpoint, int(attained_best[middle_endpoint]), finish_search)
+
+    def layer_row(self, changepoints_used: int, previous_best_prefix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        best_prefix, attained_best = np.full(self.length, Constants.infinity), np.full(self.length, -2, dtype=np.int32)
+        self.calculate_range(previous_best_prefix, best_prefix, attained_best, 0, self.length, 0, self.length)
+        return best_prefix, attained_best
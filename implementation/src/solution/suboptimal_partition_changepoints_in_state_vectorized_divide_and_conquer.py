@@ -0,0 +1,84 @@
+import math
+from dataclasses import dataclass
+from typing import Tuple, Union
+
+import numpy as np
+
+from solution.solution import Solution
+from solution.suboptimal_partition_changepoints_in_state_divide_and_conquer_optimzation import DynamicProgrammingDivideAndConquer
+from utils.constants import Constants
+
+
+@dataclass
+class DynamicProgrammingVectorizedDivideAndConquer(DynamicProgrammingDivideAndConquer):
+    """ Vectorized version of the divide and conquer approach, it has an O(Dn log(n)) time complexity like it,
+    but with only O(D log(n)) vectorized steps instead of O(Dn) recursive calls.
+
+    The layer of k changepoints takes the row minima of the matrix A[end, start] = F_{k-1}(start) + cost(start, end),
+    the entries with start >= end being padded with values growing away from the diagonal. As in SMAWK, the odd rows
+    are solved recursively and then the even ones between the minima of their neighbours, all the entries of a level
+    at once. Like the divide and conquer approach it assumes that the best last changepoint does not decrease with
+    the end, which holds when the costs satisfy the quadrangle (Monge) inequality, and is otherwise suboptimal.
+    The column reduction of SMAWK, which would make each layer O(n), is skipped since it is an inherently sequential
+    scan that is far slower than a vectorized level. None of the cost functions satisfies the inequality for every
+    signal, the squared error of the range around its mean fails it for [0, 10, 0], so with check_monge the
+    inequality is checked first on the signal, in O(n^2) time, and the recursive divide and conquer layers are used
+    when it does not hold."""
+
+    name: str = 'suboptimal_partition_vectorized_divide_and_conquer'
+    check_monge: bool = False
+    monge_layers: bool = True
+
+    def expected_work(self, size: int, max_amount_changepoints: int) -> float:
+        return max(max_amount_changepoints, 1) * size * math.log2(max(size, 2))
+
+    def layer_costs(self, previous_best_prefix: np.ndarray, ends: Union[int, np.ndarray], starts: Union[int, np.ndarray]) -> np.ndarray:
+        """
+        Entries of the matrix of the layer.
+        :param previous_best_prefix: row of best_prefix of the previous amount of changepoints.
+        :param ends: end of the ranges (exclusive), the rows.
+        :param starts: begin of the ranges (inclusive), the columns.
+        :return: array with the cost of each entry.
+        """
+        valid_starts = np.minimum(starts, np.asarray(ends) - 1)
+        candidates_cost = previous_best_prefix[valid_starts] + self.costs(valid_starts, ends) + self.algorithm_input.penalization
+        return np.where(starts < ends, candidates_cost, Constants.infinity * (starts - np.asarray(ends) + 2))
+
+    def row_minima(self, previous_best_prefix: np.ndarray, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """
+        It finds the column of the leftmost minimum of every row, solving the odd rows recursively and then
+        the even ones between the minima of their neighbours, all the entries of a level being evaluated at once.
+        :param previous_best_prefix: row of best_prefix of the previous amount of changepoints.
+        :param rows: the rows, in increasing order.
+        :param columns: the columns, in increasing order.
+        :return: the column of the minimum of each row.
+        """
+        if len(rows) == 0:
+            return np.zeros(0, dtype=int)
+        odd_minima = np.searchsorted(columns, self.row_minima(previous_best_prefix, rows[1::2], columns))
+        even_rows = rows[::2]
+        lower = np.concatenate([[0], odd_minima])[:len(even_rows)]
+        upper = np.maximum(np.concatenate([odd_minima, [len(columns) - 1]])[:len(even_rows)], lower)
+        lengths = upper - lower + 1
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        entries = np.repeat(lower - offsets, lengths) + np.arange(lengths.sum())
+        entries_cost = self.layer_costs(previous_best_prefix, np.repeat(even_rows, lengths), columns[entries])
+        is_minimum = entries_cost == np.repeat(np.minimum.reduceat(entries_cost, offsets), lengths)
+        minima_entries = np.flatnonzero(is_minimum)
+        _, first = np.unique(np.repeat(np.arange(len(even_rows)), lengths)[minima_entries], return_index=True)
+        minima = np.zeros(len(rows), dtype=int)
+        minima[::2], minima[1::2] = columns[entries[minima_entries[first]]], columns[odd_minima]
+        return minima
+
+    def layer_row(self, changepoints_used: int, previous_best_prefix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.monge_layers:
+            return super(DynamicProgrammingVectorizedDivideAndConquer, self).layer_row(changepoints_used, previous_best_prefix)
+        best_prefix, attained_best = np.full(self.length, Constants.infinity), np.full(self.length, -2, dtype=np.int32)
+        ends = np.arange(1, self.length)
+        attained_best[1:] = self.row_minima(previous_best_prefix, ends, np.arange(self.length - 1))
+        best_prefix[1:] = self.layer_costs(previous_best_prefix, ends, attained_best[1:])
+        return best_prefix, attained_best
+
+    def solve(self) -> Solution:
+        self.monge_layers = not self.check_monge or self.algorithm_input.cost_function.is_monge(self.algorithm_input.case.size)
+        return super(DynamicProgrammingVectorizedDivideAndConquer, self).solve()
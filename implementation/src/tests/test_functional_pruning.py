@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from cases.case import Case
+from cost_functions.cost_function import ExponentialLikelihoodCostFunction, GaussianMeanCostFunction
+from solution.algorithm_input import AlgorithmInput
+from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+from solution.optimal_partition_changepoints_in_state_functional_pruning import DynamicProgrammingChangepointsInStateFunctionalPruning
+from solution.optimal_partition_penalization import DynamicProgrammingPenalization
+from solution.optimal_partition_penalization_functional_pruning import DynamicProgrammingPenalizationFunctionalPruning
+from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+from solution.result_registry import ResultRegistry
+from utils.constants import Constants
+
+
+def shifted_signal(offset: float) -> Case:
+    """
+    Signal with a change in mean every 50 samples, shifted by the given offset.
+    :param offset: value added to every sample.
+    :return: a case with the signal.
+    """
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.normal(mean, 1.0, 50) for mean in [1.0, 4.0, 2.0, 6.0]]) + offset
+    return Case(size=len(values), name='shifted', case_type='random', signal=list(values))
+
+
+class FunctionalPruningTest(unittest.TestCase):
+
+    def assert_same_costs(self, case: Case, cost_function) -> None:
+        algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, penalization=10.0, max_amount_changepoints=6, precompute_cache=None)
+        algorithm_input.initialize()
+        exact_penalized = DynamicProgrammingPenalization(algorithm_input=algorithm_input).solve().metrics.cost
+        for solver_type in [DynamicProgrammingPenalizationPruned, DynamicProgrammingPenalizationFunctionalPruning]:
+            self.assertAlmostEqual(solver_type(algorithm_input=algorithm_input).solve().metrics.cost, exact_penalized, places=6)
+        exact_changepoints = DynamicProgrammingChangepointsInState(algorithm_input=algorithm_input).solve()
+        pruned_changepoints = DynamicProgrammingChangepointsInStateFunctionalPruning(algorithm_input=algorithm_input).solve()
+        np.testing.assert_allclose(pruned_changepoints.metrics.best_prefix[:, -1], exact_changepoints.metrics.best_prefix[:, -1])
+
+    def test_exponential_likelihood_with_negative_values(self) -> None:
+        case, cost_function = shifted_signal(-3.0), ExponentialLikelihoodCostFunction()
+        self.assert_same_costs(case, cost_function)
+        self.assertFalse(cost_function.allows_functional_pruning())
+        self.assertEqual(cost_function.pruning_constant(), -Constants.infinity)
+
+    def test_exponential_likelihood_with_positive_values(self) -> None:
+        case, cost_function = shifted_signal(3.0), ExponentialLikelihoodCostFunction()
+        self.assert_same_costs(case, cost_function)
+        self.assertTrue(cost_function.allows_functional_pruning())
+
+    def test_gaussian_mean_with_negative_values(self) -> None:
+        self.assert_same_costs(shifted_signal(-3.0), GaussianMeanCostFunction())
+
+    def test_candidates_restored_from_result_registry(self) -> None:
+        case = shifted_signal(0.0)
+        algorithm_input = AlgorithmInput(case=case, cost_function=GaussianMeanCostFunction(), penalization=10.0, max_amount_changepoints=6, precompute_cache=None)
+        algorithm_input.initialize()
+        expected = DynamicProgrammingChangepointsInStateFunctionalPruning(algorithm_input=algorithm_input).solve()
+        with tempfile.TemporaryDirectory() as path:
+            result_registry = ResultRegistry(path=path + '/')
+            for max_amount_changepoints, penalization in [(3, 5.0), (6, 10.0), (6, 10.0)]:
+                algorithm_input = AlgorithmInput(case=case, cost_function=GaussianMeanCostFunction(), penalization=penalization,
+                                                 max_amount_changepoints=max_amount_changepoints, result_registry=result_registry, precompute_cache=None)
+                algorithm_input.initialize()
+                solution = DynamicProgrammingChangepointsInStateFunctionalPruning(algorithm_input=algorithm_input).solve()
+            self.assertEqual(solution.changepoints, expected.changepoints)
+            self.assertEqual(solution.metrics.evaluated_candidates, expected.metrics.evaluated_candidates)
+            self.assertEqual(solution.metrics.pruned_candidates, expected.metrics.pruned_candidates)
+            self.assertGreater(solution.metrics.pruned_candidates, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import gc
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from cost_functions.cost_function import KernelBasedCostFunction
+from utils.constants import Constants
+
+
+class KernelBasedCostFunctionTest(unittest.TestCase):
+
+    def test_memory_mapped_file_is_removed(self):
+        with tempfile.TemporaryDirectory() as memmap_path, mock.patch.object(Constants, 'memmap_path', memmap_path + '/'):
+            signal = list(np.random.default_rng(0).normal(0.0, 1.0, 100))
+            in_memory, memory_mapped = KernelBasedCostFunction(), KernelBasedCostFunction(memory_mapped=True)
+            in_memory.precompute(signal)
+            memory_mapped.precompute(signal)
+            self.assertEqual(os.listdir(memmap_path), [os.path.basename(memory_mapped.memmap_file)])
+            costs = memory_mapped.range_costs(np.arange(50), 100)
+            np.testing.assert_allclose(costs, in_memory.range_costs(np.arange(50), 100))
+            del memory_mapped
+            gc.collect()
+            self.assertEqual(os.listdir(memmap_path), [])
+            np.testing.assert_allclose(costs, in_memory.range_costs(np.arange(50), 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+
+from cases.case import Case
+from cost_functions.cost_function import GaussianMeanCostFunction, KernelBasedCostFunction
+from solution.algorithm_input import AlgorithmInput
+from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+from solution.optimal_partition_changepoints_in_state_functional_pruning import DynamicProgrammingChangepointsInStateFunctionalPruning
+from solution.suboptimal_partition_changepoints_in_state_vectorized_divide_and_conquer import DynamicProgrammingVectorizedDivideAndConquer
+from solution.optimal_partition_changepoints_in_state_pruned import DynamicProgrammingChangepointsInStatePruned
+from solution.suboptimal_partition_changepoints_in_state_divide_and_conquer_optimzation import DynamicProgrammingDivideAndConquer
+
+solver_types = [DynamicProgrammingChangepointsInState, DynamicProgrammingChangepointsInStatePruned, DynamicProgrammingChangepointsInStateFunctionalPruning,
+                DynamicProgrammingDivideAndConquer, DynamicProgrammingVectorizedDivideAndConquer]
+
+
+class LowMemoryTest(unittest.TestCase):
+
+    def assert_same_changepoints(self, algorithm_input: AlgorithmInput) -> None:
+        for solver_type in solver_types:
+            with self.subTest(solver=solver_type.__name__, cost_function=algorithm_input.cost_function.name):
+                full_solver, low_memory_solver = solver_type(algorithm_input=algorithm_input), solver_type(algorithm_input=algorithm_input, low_memory=True)
+                full, low_memory = full_solver.solve(), low_memory_solver.solve()
+                self.assertEqual(low_memory.changepoints, full.changepoints)
+                self.assertEqual(low_memory.metrics.cost, full.metrics.cost)
+                self.assertEqual(low_memory.metrics.evaluated_candidates, full.metrics.evaluated_candidates)
+                self.assertEqual(low_memory_solver.retrieve_all_changepoints(), full_solver.retrieve_all_changepoints())
+
+    def test_subclasses_keep_their_layer_algorithm(self):
+        rng = np.random.default_rng(0)
+        values = np.concatenate([rng.normal(mean, 1.0, 40) for mean in [1.0, 4.0, 2.0, 6.0, 3.0]])
+        case = Case(size=len(values), name='low_memory', case_type='random', signal=list(values))
+        for cost_function in [GaussianMeanCostFunction(), KernelBasedCostFunction()]:
+            algorithm_input = AlgorithmInput(case=case, cost_function=cost_function, penalization=10.0, max_amount_changepoints=8, precompute_cache=None)
+            algorithm_input.initialize()
+            self.assert_same_changepoints(algorithm_input)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+from cost_functions.cost_function import ExponentialLikelihoodCostFunction, GaussianCostFunction, GaussianMeanCostFunction
+from solution.online_detector import OnlineDetector
+
+
+class OnlineDetectorTest(unittest.TestCase):
+
+    def test_pruning_constant_of_the_cost_function(self):
+        self.assertEqual(OnlineDetector(cost_function=GaussianMeanCostFunction()).pruning_constant, 0.0)
+
+    def test_cost_function_without_finite_pruning_constant(self):
+        for cost_function in [GaussianCostFunction(), ExponentialLikelihoodCostFunction()]:
+            with self.assertRaises(ValueError):
+                OnlineDetector(cost_function=cost_function)
+
+    def test_given_pruning_constant(self):
+        cost_function = GaussianCostFunction()
+        cost_function.precompute([0.0, 2.0])
+        self.assertEqual(OnlineDetector(cost_function=cost_function).pruning_constant, -1.0)
+        self.assertEqual(OnlineDetector(cost_function=ExponentialLikelihoodCostFunction(), pruning_constant=0.0).pruning_constant, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
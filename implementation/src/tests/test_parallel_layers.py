@@ -0,0 +1,38 @@
+import unittest
+
+import numpy as np
+
+from cases.case import Case
+from cost_functions.cost_function import GaussianMeanCostFunction
+from solution.algorithm_input import AlgorithmInput
+from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+from solution.optimal_partition_changepoints_in_state_functional_pruning import DynamicProgrammingChangepointsInStateFunctionalPruning
+from solution.suboptimal_partition_changepoints_in_state_vectorized_divide_and_conquer import DynamicProgrammingVectorizedDivideAndConquer
+from solution.optimal_partition_changepoints_in_state_pruned import DynamicProgrammingChangepointsInStatePruned
+from solution.suboptimal_partition_changepoints_in_state_divide_and_conquer_optimzation import DynamicProgrammingDivideAndConquer
+
+
+class ParallelLayersTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        values = np.concatenate([np.random.default_rng(0).normal(mean, 1.0, 60) for mean in [1.0, 4.0, 2.0]])
+        case = Case(size=len(values), name='parallel', case_type='random', signal=list(values))
+        self.algorithm_input = AlgorithmInput(case=case, cost_function=GaussianMeanCostFunction(), penalization=10.0, max_amount_changepoints=4,
+                                              precompute_cache=None)
+        self.algorithm_input.initialize()
+
+    def test_same_solution_with_workers(self) -> None:
+        serial = DynamicProgrammingChangepointsInState(algorithm_input=self.algorithm_input).solve()
+        parallel = DynamicProgrammingChangepointsInState(algorithm_input=self.algorithm_input, workers=2).solve()
+        self.assertEqual(parallel.changepoints, serial.changepoints)
+        np.testing.assert_allclose(parallel.metrics.best_prefix, serial.metrics.best_prefix)
+
+    def test_serial_layer_algorithms_reject_workers(self) -> None:
+        for solver_type in [DynamicProgrammingChangepointsInStatePruned, DynamicProgrammingChangepointsInStateFunctionalPruning,
+                            DynamicProgrammingDivideAndConquer, DynamicProgrammingVectorizedDivideAndConquer]:
+            with self.subTest(solver=solver_type.__name__), self.assertRaises(ValueError):
+                solver_type(algorithm_input=self.algorithm_input, workers=2).solve()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+import numpy as np
+
+from cases.case import Case
+from cost_functions.cost_function import ExponentialLikelihoodCostFunction
+from process.penalization_selector import obtain_penalization_from_changepoints
+from solution.algorithm_input import AlgorithmInput
+from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+
+
+class PenalizationSelectorTest(unittest.TestCase):
+
+    def test_penalization_with_negative_whole_cost(self) -> None:
+        rng = np.random.default_rng(0)
+        values = np.concatenate([rng.exponential(scale, 100) for scale in [0.05, 0.2, 0.02, 0.1]])
+        case = Case(size=len(values), name='small_means', case_type='random', signal=list(values))
+        algorithm_input = AlgorithmInput(case=case, cost_function=ExponentialLikelihoodCostFunction(), precompute_cache=None)
+        algorithm_input.initialize()
+        self.assertLess(algorithm_input.cost_function.range_cost(0, case.size), 0.0)
+        penalization = obtain_penalization_from_changepoints(case, algorithm_input, 3)
+        self.assertGreater(penalization, 0.0)
+        algorithm_input.penalization = penalization
+        self.assertEqual(len(DynamicProgrammingPenalizationPruned(algorithm_input=algorithm_input).solve().changepoints), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from cases.case import Case
+from cost_functions.cost_function import GaussianMeanCostFunction
+from solution.algorithm_input import AlgorithmInput
+from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+from solution.optimal_partition_changepoints_in_state_functional_pruning import DynamicProgrammingChangepointsInStateFunctionalPruning
+from solution.optimal_partition_changepoints_in_state_pruned import DynamicProgrammingChangepointsInStatePruned
+from solution.result_registry import ResultRegistry
+from solution.suboptimal_partition_changepoints_in_state_divide_and_conquer_optimzation import DynamicProgrammingDivideAndConquer
+from utils.constants import Constants
+
+
+class ResultRegistryTest(unittest.TestCase):
+
+    def test_exact_solvers_share_their_tables(self) -> None:
+        values = np.concatenate([np.random.default_rng(0).normal(mean, 1.0, 50) for mean in [1.0, 4.0, 2.0, 6.0]])
+        case = Case(size=len(values), name='registry', case_type='random', signal=list(values))
+        with tempfile.TemporaryDirectory() as path:
+            result_registry = ResultRegistry(path=path + '/')
+            algorithm_input = AlgorithmInput(case=case, cost_function=GaussianMeanCostFunction(), penalization=10.0, max_amount_changepoints=6,
+                                             result_registry=result_registry, precompute_cache=None)
+            algorithm_input.initialize()
+            exact = DynamicProgrammingChangepointsInState(algorithm_input=algorithm_input).solve()
+            self.assertEqual(len(os.listdir(path)), 1)
+            for solver_type in [DynamicProgrammingChangepointsInStatePruned, DynamicProgrammingChangepointsInStateFunctionalPruning]:
+                solution = solver_type(algorithm_input=algorithm_input).solve()
+                self.assertEqual(solution.changepoints, exact.changepoints)
+                np.testing.assert_array_equal(solution.metrics.best_prefix, exact.metrics.best_prefix)
+            self.assertEqual(len(os.listdir(path)), 1)
+            self.assertEqual(solution.metrics.evaluated_candidates, Constants.no_data)
+            DynamicProgrammingDivideAndConquer(algorithm_input=algorithm_input).solve()
+            self.assertEqual(len(os.listdir(path)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from cases.case import Case
+from cost_functions.cost_function import GaussianCostFunction, KernelBasedCostFunction
+from cost_functions.precompute_cache import PrecomputeCache
+from runner.solver_pool import SolverPool, mapped_layout
+from solution.algorithm_input import AlgorithmInput
+from solution.optimal_partition_penalization import DynamicProgrammingPenalization
+from solution.optimal_partition_penalization_pruned import DynamicProgrammingPenalizationPruned
+from utils.constants import Constants
+
+
+class SolverPoolTest(unittest.TestCase):
+
+    def assert_same_solutions(self, algorithm_input: AlgorithmInput, shared_blocks: int) -> None:
+        solvers = [DynamicProgrammingPenalization(algorithm_input=algorithm_input), DynamicProgrammingPenalizationPruned(algorithm_input=algorithm_input)]
+        expected = {solver.name: solver.solve().changepoints for solver in solvers}
+        with SolverPool(solvers, algorithm_input, workers=1) as solver_pool:
+            self.assertEqual(len(solver_pool.blocks), shared_blocks)
+            for solver, solution in solver_pool.solutions():
+                self.assertEqual(solution.changepoints, expected[solver.name])
+
+    def test_memory_mapped_arrays_are_not_copied(self):
+        with tempfile.TemporaryDirectory() as path, mock.patch.object(Constants, 'memmap_path', path + '/memmap/'):
+            values = np.concatenate([np.random.default_rng(0).normal(mean, 1.0, 50) for mean in [0.0, 3.0, 1.0]])
+            case = Case(size=len(values), name='pool', case_type='random', signal=list(values))
+            cache = PrecomputeCache(path=path + '/cache/')
+            cache.precompute(GaussianCostFunction(), case.signal)
+            cached_input = AlgorithmInput(case=case, cost_function=GaussianCostFunction(), penalization=10.0, precompute_cache=cache)
+            cached_input.initialize()
+            self.assertIsNotNone(mapped_layout(cached_input.cost_function.prefix_sum))
+            self.assert_same_solutions(cached_input, 1)
+            kernel_input = AlgorithmInput(case=case, cost_function=KernelBasedCostFunction(memory_mapped=True), penalization=10.0, precompute_cache=None)
+            kernel_input.initialize()
+            self.assert_same_solutions(kernel_input, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
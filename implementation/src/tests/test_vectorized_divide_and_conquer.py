@@ -0,0 +1,47 @@
+import dataclasses
+import unittest
+
+import numpy as np
+
+from cases.case import Case
+from cost_functions.cost_function import ExponentialLikelihoodCostFunction, GaussianMeanCostFunction
+from runner.run_utils import read_case
+from solution.algorithm_input import AlgorithmInput
+from solution.optimal_partition_changepoints_in_state import DynamicProgrammingChangepointsInState
+from solution.suboptimal_partition_changepoints_in_state_divide_and_conquer_optimzation import DynamicProgrammingDivideAndConquer
+from solution.suboptimal_partition_changepoints_in_state_vectorized_divide_and_conquer import DynamicProgrammingVectorizedDivideAndConquer
+
+
+class VectorizedDivideAndConquerTest(unittest.TestCase):
+
+    def test_squared_error_is_not_monge(self) -> None:
+        cost_function = GaussianMeanCostFunction()
+        cost_function.precompute([0.0, 10.0, 0.0])
+        self.assertFalse(cost_function.is_monge(3))
+
+    def test_exact_when_checked_monge(self) -> None:
+        dependant = read_case('00_dependant')
+        case = dataclasses.replace(dependant, signal=[abs(value) + 0.1 for value in dependant.signal])
+        algorithm_input = AlgorithmInput(case=case, cost_function=ExponentialLikelihoodCostFunction(), penalization=10.0, max_amount_changepoints=5,
+                                         precompute_cache=None)
+        algorithm_input.initialize()
+        solver = DynamicProgrammingVectorizedDivideAndConquer(algorithm_input=algorithm_input, check_monge=True)
+        solution, exact = solver.solve(), DynamicProgrammingChangepointsInState(algorithm_input=algorithm_input).solve()
+        self.assertTrue(solver.monge_layers)
+        self.assertEqual(solution.changepoints, exact.changepoints)
+        self.assertAlmostEqual(solution.metrics.cost, exact.metrics.cost)
+
+    def test_divide_and_conquer_layers_when_checked_not_monge(self) -> None:
+        values = np.concatenate([np.random.default_rng(0).normal(mean, 1.0, 50) for mean in [1.0, 4.0, 2.0]])
+        case = Case(size=len(values), name='not_monge', case_type='random', signal=list(values))
+        algorithm_input = AlgorithmInput(case=case, cost_function=GaussianMeanCostFunction(), penalization=10.0, max_amount_changepoints=5,
+                                         precompute_cache=None)
+        algorithm_input.initialize()
+        solver = DynamicProgrammingVectorizedDivideAndConquer(algorithm_input=algorithm_input, check_monge=True)
+        solution = solver.solve()
+        self.assertFalse(solver.monge_layers)
+        self.assertEqual(solution.changepoints, DynamicProgrammingDivideAndConquer(algorithm_input=algorithm_input).solve().changepoints)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,24 +1,67 @@
-from typing import List, Callable
+import os
+from typing import List, Callable, Tuple, Union
 
 import numpy as np
 
+from utils.constants import Constants
 
-def accumulate(signal: List[float], mapping: Callable = lambda x: x) -> List[float]:
+
+def as_channels(signal: Union[List[float], np.ndarray]) -> np.ndarray:
+    """
+    It views the signal as a matrix with one column for each channel, a
+    plain list of values being a signal with a single channel.
+    :param signal: input signal, either a list of values or an (n, d) array.
+    :return: an (n, d) array with the values of the signal.
     """
-    It accumulates the signal after applying the mapping element-wise.
+    return np.asarray(signal, dtype=float).reshape(len(signal), -1)
+
+
+def remove_file(file_path: str) -> None:
+    """
+    It removes a file, if it still exists. Arrays memory mapped from it remain valid until released.
+    :param file_path: path of the file.
+    :return: None.
+    """
+    if os.path.isfile(file_path):
+        os.remove(file_path)
+
+
+def accumulate(signal: Union[List[float], np.ndarray], mapping: Callable = lambda x: x) -> np.ndarray:
+    """
+    It accumulates the signal after applying the mapping element-wise, if the signal
+    has several channels (one for each column) all of them are accumulated at once.
     :param signal: input signal.
-    :param mapping: function to be applied to each signal value.
+    :param mapping: vectorized function to be applied to each signal value.
     :return: accumulated signal.
     """
-    return [float(x) for x in np.insert(np.cumsum(list(map(mapping, signal))), 0, 0)]
+    values = mapping(np.asarray(signal, dtype=float))
+    return np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
 
 
-def range_sum(accumulated_signal: List[float], start: int, end: int) -> float:
+def range_sum(accumulated_signal: np.ndarray, start: Union[int, np.ndarray], end: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
     """
     It returns the sum in the range by calculating the difference in the accumulated array.
+    If start or end are arrays of indices, the sums of all the ranges are returned at once.
     :param accumulated_signal: input signal that has already been accumulated.
     :param start: beginning of the range (inclusive).
     :param end: final index of the range (exclusive).
     :return: value of the sum in the given range.
     """
     return accumulated_signal[end] - accumulated_signal[start]
+
+
+def log_deviation_roots(deviations: np.ndarray, iterations: int = 12) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    It solves u - 1 - log(u) = deviation for u, which has a root below and a root above 1 for every non
+    negative deviation. The function is convex, so Newton's method started beyond the roots, at log(u) = -d - 1
+    and u = 2d + 2, approaches them monotonically from outside and the interval between the roots is never underestimated.
+    :param deviations: array with non negative deviations.
+    :param iterations: amount of Newton steps.
+    :return: a pair of arrays with the lower and upper roots.
+    """
+    deviations = np.asarray(deviations, dtype=float)
+    lower_logs, upper_roots = -deviations - 1.0, 2.0 * deviations + 2.0
+    for _ in range(iterations):
+        lower_logs = lower_logs - (np.expm1(lower_logs) - lower_logs - deviations) / np.minimum(np.expm1(lower_logs), -Constants.epsilon)
+        upper_roots = upper_roots - (upper_roots - 1.0 - np.log(upper_roots) - deviations) / np.maximum(1.0 - 1.0 / upper_roots, Constants.epsilon)
+    return np.exp(lower_logs), upper_roots
@@ -17,6 +17,11 @@ class Constants:
     min_days: int = 2
     minutes_in_a_day: int = 24 * 60
     kernel_bandwidth: float = 1e3
+    kernel_tile_size: int = 1024
+    kernel_approximation_rank: int = 256
+    online_capacity: int = 2 ** 16
+    chunk_window_size: int = 5000
+    chunk_overlap: int = 500
     window: int = 30
     epsilon: float = 1e-6
     infinity: float = 1e12
@@ -26,8 +31,15 @@ class Constants:
     random_path: str = project_root_path + 'resources/cases/random/'
     real_path: str = project_root_path + 'resources/cases/real/'
     output_path: str = project_root_path + 'output/cases/'
+    memmap_path: str = project_root_path + 'output/memmap/'
+    precompute_cache_path: str = project_root_path + 'output/precompute_cache/'
+    precompute_cache_size_limit: int = 4 * 2 ** 30
+    result_registry_path: str = project_root_path + 'output/result_registry/'
+    batch_output_path: str = project_root_path + 'output/batch/'
     date_format: str = '%Y-%m-%d %H:%M'
     no_date: datetime.datetime = datetime.datetime(year=1970, month=1, day=1)
     no_data: datetime.datetime = -1
     metrics_columns: str = (
-    'name', 'size', 'cost_function', 'solver', 'changepoints', 'cost', 'execution_time', 'right_changepoints', 'wrong_changepoints', 'not_found_changepoints')
+    'name', 'size', 'cost_function', 'solver', 'changepoints', 'cost', 'execution_time', 'right_changepoints', 'wrong_changepoints', 'not_found_changepoints',
+    'cost_function_memory', 'evaluated_candidates', 'pruned_candidates', 'approximation_gap',
+    'moved_changepoints')
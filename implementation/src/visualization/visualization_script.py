@@ -41,7 +41,7 @@ def visualize_elbow(case: Case, solution: Solution, guessed_changepoints: int) -
     :return: None.
     """
     amount_changepoints = len(solution.changepoints)
-    df_rows = [[k + 1, solution.metrics.best_prefix[k][case.size]] for k in range(amount_changepoints)]
+    df_rows = [[k + 1, solution.metrics.best_prefix[k, -1]] for k in range(amount_changepoints)]
     df = pd.DataFrame(df_rows, columns=['changepoints', 'objective value'])
     fig = px.line(df, x='changepoints', y='objective value', title='Elbow - ' + solution.metrics.solver_used + ' - Case: ' + case.name)
     fig.add_vline(guessed_changepoints, line_width=3, line_color='red')